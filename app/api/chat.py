@@ -1,16 +1,28 @@
 import logging
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, Depends, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
 from app.services.ai.chat_manager import ChatManager
-from app.services.firestore import save_chat_message, get_chat_history
+from app.services.chat_persister import get_chat_persister
+from app.services.firestore import (
+    get_chat_history, get_chat_session_summary, CHAT_HISTORY_PAGE_SIZE
+)
 from app.models.chat import ChatMessageRequest as ChatMessage, ChatResponse
+from app.api.streaming import sse_event, SSE_HEADERS
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Largest history page a client may request
+CHAT_HISTORY_MAX_PAGE_SIZE = 200
+
+# Message fields a history request may project
+CHAT_MESSAGE_FIELDS = {"role", "content", "timestamp"}
+
 # Initialize chat manager
 chat_manager = ChatManager()
+chat_persister = get_chat_persister()
 
 @router.post("/message")
 async def send_message(chat_message: ChatMessage) -> ChatResponse:
@@ -27,12 +39,13 @@ async def send_message(chat_message: ChatMessage) -> ChatResponse:
             session_id=chat_message.session_id
         )
         
-        # Save message to Firestore
-        await save_chat_message(
+        # Queue the turn for writing; the reply does not wait for Firestore
+        await chat_persister.submit(
             organization_id=chat_message.organization_id,
             session_id=response.session_id,
             user_message=chat_message.message,
-            ai_response=response.message
+            ai_response=response.message,
+            new_session=response.metadata["new_session"]
         )
         
         return response
@@ -40,25 +53,92 @@ async def send_message(chat_message: ChatMessage) -> ChatResponse:
         logger.error(f"Error processing chat message: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to process chat message")
 
+@router.post("/message/stream")
+async def stream_message(chat_message: ChatMessage):
+    """
+    Send a message to the chat interface and stream the response as Server-Sent Events
+    """
+    logger.info(f"Received streaming chat message for organization: {chat_message.organization_id}")
+    
+    async def event_stream():
+        try:
+            async for event in chat_manager.stream_message(
+                organization_id=chat_message.organization_id,
+                message=chat_message.message,
+                session_id=chat_message.session_id
+            ):
+                yield sse_event(event["type"], event)
+                
+                if event["type"] == "done":
+                    # Queue the assembled reply once the stream has finished
+                    await chat_persister.submit(
+                        organization_id=chat_message.organization_id,
+                        session_id=event["session_id"],
+                        user_message=chat_message.message,
+                        ai_response=event["message"],
+                        new_session=event["metadata"]["new_session"]
+                    )
+        except Exception as e:
+            logger.error(f"Error streaming chat message: {str(e)}", exc_info=True)
+            yield sse_event("error", {"type": "error", "detail": "Failed to process chat message"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.get("/history/{organization_id}/{session_id}")
-async def get_chat_session_history(organization_id: str, session_id: str):
+async def get_chat_session_history(
+    organization_id: str,
+    session_id: str,
+    limit: int = Query(CHAT_HISTORY_PAGE_SIZE, ge=1, le=CHAT_HISTORY_MAX_PAGE_SIZE, description="Messages per page"),
+    before: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma-separated message fields to return")
+):
     """
-    Get chat history for a specific session
+    Get a page of chat history for a specific session, newest messages first
     """
     logger.info(f"Fetching chat history for organization: {organization_id}, session: {session_id}")
     
+    field_list = None
+    if fields:
+        field_list = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = set(field_list) - CHAT_MESSAGE_FIELDS
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown message fields: {', '.join(sorted(unknown))}")
+    
     try:
         # Get chat history from Firestore
-        history = await get_chat_history(organization_id, session_id)
+        history = await get_chat_history(organization_id, session_id, limit=limit, before=before, fields=field_list)
         
         return {
             "status": "success",
             "history": history
         }
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     except Exception as e:
         logger.error(f"Error fetching chat history: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to fetch chat history")
 
+@router.get("/sessions/{organization_id}/{session_id}")
+async def get_chat_session(organization_id: str, session_id: str):
+    """
+    Get a chat session's message count, timestamps and latest message
+    """
+    logger.info(f"Fetching chat session summary for organization: {organization_id}, session: {session_id}")
+    
+    try:
+        session = await get_chat_session_summary(organization_id, session_id)
+    except Exception as e:
+        logger.error(f"Error fetching chat session summary: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to fetch chat session")
+    
+    if not session:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    
+    return {
+        "status": "success",
+        "session": session
+    }
+
 @router.websocket("/ws/{organization_id}")
 async def websocket_endpoint(websocket: WebSocket, organization_id: str):
     """
@@ -79,30 +159,34 @@ async def websocket_endpoint(websocket: WebSocket, organization_id: str):
             if not message:
                 continue
             
-            # Process message and get response
-            response = await chat_manager.process_message(
+            # Forward response deltas as incremental frames
+            async for event in chat_manager.stream_message(
                 organization_id=organization_id,
                 message=message,
                 session_id=session_id
-            )
-            
-            # Save message to Firestore
-            await save_chat_message(
-                organization_id=organization_id,
-                session_id=response.session_id,
-                user_message=message,
-                ai_response=response.message
-            )
-            
-            # Send response back to client
-            await websocket.send_json({
-                "message": response.message,
-                "session_id": response.session_id,
-                "metadata": response.metadata
-            })
-            
-            # Update session_id for future messages
-            session_id = response.session_id
+            ):
+                if event["type"] == "delta":
+                    await websocket.send_json(event)
+                elif event["type"] == "done":
+                    # Final frame carries the assembled response
+                    await websocket.send_json({
+                        "type": "done",
+                        "message": event["message"],
+                        "session_id": event["session_id"],
+                        "metadata": event["metadata"]
+                    })
+                    
+                    # Queue the assembled reply once the stream has finished
+                    await chat_persister.submit(
+                        organization_id=organization_id,
+                        session_id=event["session_id"],
+                        user_message=message,
+                        ai_response=event["message"],
+                        new_session=event["metadata"]["new_session"]
+                    )
+                    
+                    # Update session_id for future messages
+                    session_id = event["session_id"]
             
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for organization: {organization_id}")
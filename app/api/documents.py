@@ -1,10 +1,16 @@
+import json
+import asyncio
 import logging
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Response
+from fastapi import APIRouter, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.models.document import DocumentStatusResponse
 from app.services.firestore import get_organization_data, get_evaluation_results
 from app.services.storage import get_document_download_url
+from app.services.job_state import DOCUMENT_GENERATION_STATE
+from app.services.progress import progress_topic
+from app.api.streaming import sse_event, progress_events, SSE_HEADERS
 
 logger = logging.getLogger(__name__)
 
@@ -20,25 +26,25 @@ class DocumentRequest(BaseModel):
     document_types: List[str] = Field(..., description="List of document types to generate")
 
 @router.post("/generate")
-async def generate_documents(request: DocumentRequest, background_tasks: BackgroundTasks):
+async def generate_documents(request: DocumentRequest):
     """
     Generate compliance documents based on evaluation results
     """
     logger.info(f"Generating documents for organization: {request.organization_id}")
     
     try:
-        # Get organization data
-        organization = await get_organization_data(request.organization_id)
+        # Get organization data and evaluation results concurrently
+        organization, evaluation_results = await asyncio.gather(
+            get_organization_data(request.organization_id),
+            get_evaluation_results(
+                organization_id=request.organization_id,
+                evaluation_id=request.evaluation_id
+            )
+        )
         
         if not organization:
             raise HTTPException(status_code=404, detail="Organization not found")
         
-        # Get evaluation results
-        evaluation_results = await get_evaluation_results(
-            organization_id=request.organization_id,
-            evaluation_id=request.evaluation_id
-        )
-        
         if not evaluation_results:
             raise HTTPException(status_code=404, detail="Evaluation results not found")
         
@@ -49,9 +55,8 @@ async def generate_documents(request: DocumentRequest, background_tasks: Backgro
             document_types=request.document_types
         )
         
-        # Start document generation in background
-        background_tasks.add_task(
-            document_service.generate_documents,
+        # Queue the generation for a worker
+        await document_service.enqueue_generation(
             organization_id=request.organization_id,
             evaluation_id=request.evaluation_id,
             document_id=document_id,
@@ -93,6 +98,51 @@ async def get_document_status(organization_id: str, document_id: str) -> Documen
         logger.error(f"Error checking document status: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to check document status")
 
+@router.get("/events/{organization_id}/{document_id}")
+async def stream_document_generation_progress(organization_id: str, document_id: str):
+    """
+    Stream document generation progress as Server-Sent Events until it completes or fails
+    """
+    logger.info(f"Streaming document generation progress for organization: {organization_id}, document generation: {document_id}")
+    
+    async def event_stream():
+        try:
+            async for event in progress_events(
+                progress_topic(DOCUMENT_GENERATION_STATE, document_id),
+                lambda: document_service.get_progress_event(organization_id, document_id)
+            ):
+                yield sse_event(event["type"], event)
+        except Exception as e:
+            logger.error(f"Error streaming document generation progress: {str(e)}", exc_info=True)
+            yield sse_event("error", {"type": "error", "detail": "Failed to stream document generation progress"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.websocket("/ws/{organization_id}/{document_id}")
+async def document_generation_progress_websocket(websocket: WebSocket, organization_id: str, document_id: str):
+    """
+    WebSocket pushing document generation progress until it completes or fails
+    """
+    await websocket.accept()
+    
+    try:
+        async for event in progress_events(
+            progress_topic(DOCUMENT_GENERATION_STATE, document_id),
+            lambda: document_service.get_progress_event(organization_id, document_id)
+        ):
+            await websocket.send_text(json.dumps(event, default=str))
+        
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Progress WebSocket disconnected for document generation: {document_id}")
+    except Exception as e:
+        logger.error(f"Error in document generation progress WebSocket: {str(e)}", exc_info=True)
+        try:
+            await websocket.send_json({"type": "error", "detail": "Failed to stream document generation progress"})
+            await websocket.close()
+        except Exception:
+            pass
+
 @router.get("/download/{organization_id}/{document_id}/{document_type}")
 async def download_document(organization_id: str, document_id: str, document_type: str):
     """
@@ -1,9 +1,14 @@
+import json
 import logging
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.models.evaluation import EvaluationStatusResponse
 from app.services.firestore import get_organization_data, save_evaluation_result
+from app.services.job_state import EVALUATION_STATE
+from app.services.progress import progress_topic
+from app.api.streaming import sse_event, progress_events, SSE_HEADERS
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +23,7 @@ class EvaluationRequest(BaseModel):
     certification_types: List[str] = Field(..., description="List of certification types to evaluate")
 
 @router.post("/start")
-async def start_evaluation(request: EvaluationRequest, background_tasks: BackgroundTasks):
+async def start_evaluation(request: EvaluationRequest):
     """
     Start a certification readiness evaluation
     """
@@ -37,9 +42,8 @@ async def start_evaluation(request: EvaluationRequest, background_tasks: Backgro
             certification_types=request.certification_types
         )
         
-        # Start evaluation in background
-        background_tasks.add_task(
-            evaluation_service.run_evaluation,
+        # Queue the evaluation for a worker
+        await evaluation_service.enqueue_evaluation(
             organization_id=request.organization_id,
             evaluation_id=evaluation_id,
             certification_types=request.certification_types
@@ -80,6 +84,51 @@ async def get_evaluation_status(organization_id: str, evaluation_id: str) -> Eva
         logger.error(f"Error checking evaluation status: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to check evaluation status")
 
+@router.get("/events/{organization_id}/{evaluation_id}")
+async def stream_evaluation_progress(organization_id: str, evaluation_id: str):
+    """
+    Stream evaluation progress as Server-Sent Events until it completes or fails
+    """
+    logger.info(f"Streaming evaluation progress for organization: {organization_id}, evaluation: {evaluation_id}")
+    
+    async def event_stream():
+        try:
+            async for event in progress_events(
+                progress_topic(EVALUATION_STATE, evaluation_id),
+                lambda: evaluation_service.get_progress_event(organization_id, evaluation_id)
+            ):
+                yield sse_event(event["type"], event)
+        except Exception as e:
+            logger.error(f"Error streaming evaluation progress: {str(e)}", exc_info=True)
+            yield sse_event("error", {"type": "error", "detail": "Failed to stream evaluation progress"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+@router.websocket("/ws/{organization_id}/{evaluation_id}")
+async def evaluation_progress_websocket(websocket: WebSocket, organization_id: str, evaluation_id: str):
+    """
+    WebSocket pushing evaluation progress until it completes or fails
+    """
+    await websocket.accept()
+    
+    try:
+        async for event in progress_events(
+            progress_topic(EVALUATION_STATE, evaluation_id),
+            lambda: evaluation_service.get_progress_event(organization_id, evaluation_id)
+        ):
+            await websocket.send_text(json.dumps(event, default=str))
+        
+        await websocket.close()
+    except WebSocketDisconnect:
+        logger.info(f"Progress WebSocket disconnected for evaluation: {evaluation_id}")
+    except Exception as e:
+        logger.error(f"Error in evaluation progress WebSocket: {str(e)}", exc_info=True)
+        try:
+            await websocket.send_json({"type": "error", "detail": "Failed to stream evaluation progress"})
+            await websocket.close()
+        except Exception:
+            pass
+
 @router.get("/results/{organization_id}/{evaluation_id}")
 async def get_evaluation_results(organization_id: str, evaluation_id: str):
     """
@@ -1,11 +1,14 @@
 import logging
+import hashlib
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from app.models.organization import Organization
 from app.models.certification import Certification, CertificationType
 from app.services.storage import upload_file
-from app.services.firestore import save_organization_data, get_organization_data
+from app.services.firestore import save_organization_data, get_organization_data, save_evidence_document
+from app.services.evidence import hash_content
+from app.services.org_context import get_org_context_store
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +33,9 @@ async def submit_organization_data(organization: OrganizationInput):
         # Save organization data to Firestore
         org_id = await save_organization_data(organization.dict())
         
+        # Refresh the prompt context built from the profile
+        get_org_context_store().schedule_rebuild(org_id)
+        
         return {
             "status": "success",
             "message": "Organization data saved successfully",
@@ -89,33 +95,49 @@ async def upload_document(
     file: UploadFile = File(...),
     organization_id: str = Form(...),
     document_type: str = Form(...),
-    description: Optional[str] = Form(None)
+    description: Optional[str] = Form(None),
+    requirement_ids: Optional[str] = Form(None)
 ):
     """
     Upload a document for compliance evaluation
+    
+    requirement_ids is an optional comma-separated list of the requirements
+    the document is evidence for; documents without it count as evidence for
+    every requirement. Re-uploading a file with the same name and type
+    replaces the earlier version, so only its dependent requirements are
+    re-evaluated.
     """
     logger.info(f"Uploading document: {file.filename} for organization: {organization_id}")
     
     try:
+        # Hash the content so evaluations can tell which evidence changed
+        contents = await file.read()
+        content_hash = hashlib.sha256(contents).hexdigest()
+        await file.seek(0)
+        
         # Upload file to Cloud Storage
         file_url = await upload_file(file, organization_id)
         
         # Save document metadata to Firestore
         document_data = {
+            "id": hash_content([organization_id, document_type, file.filename])[:32],
             "filename": file.filename,
             "organization_id": organization_id,
             "document_type": document_type,
             "description": description,
             "file_url": file_url,
+            "content_hash": content_hash,
+            "requirement_ids": [r.strip() for r in (requirement_ids or "").split(",") if r.strip()],
             "upload_timestamp": None  # Will be set by Firestore
         }
         
-        # Save document metadata
-        # Implementation in services/firestore.py
+        document_id = await save_evidence_document(document_data)
         
         return {
             "status": "success",
             "message": "Document uploaded successfully",
+            "document_id": document_id,
+            "content_hash": content_hash,
             "file_url": file_url
         }
     except Exception as e:
@@ -0,0 +1,66 @@
+import os
+import json
+import asyncio
+from typing import Dict, Any, Optional, Callable, Awaitable, AsyncIterator
+from app.services.progress import get_progress_broker, TERMINAL_EVENTS
+
+# Seconds without a published event before job state is re-read (and a keepalive sent)
+PROGRESS_KEEPALIVE_SECONDS = float(os.getenv("PROGRESS_KEEPALIVE_SECONDS", "15"))
+
+# Headers that keep proxies from buffering Server-Sent Events
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no"
+}
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """
+    Format a Server-Sent Event frame
+    
+    Args:
+        event: Event name
+        data: JSON-serializable event payload
+        
+    Returns:
+        Encoded SSE frame
+    """
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def progress_events(
+    topic: str,
+    snapshot: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield a job's progress events until it completes or fails
+    
+    Starts with the current state, then forwards published events. Jobs run
+    by workers in another process publish nowhere this process can see, so
+    the state is re-read whenever the topic has been quiet for a while.
+    
+    Args:
+        topic: Progress topic of the job
+        snapshot: Coroutine function returning the job's current state as an event, or None if not found
+        
+    Yields:
+        Event dictionaries with a "type" key
+    """
+    async with get_progress_broker().subscribe(topic) as queue:
+        last = await snapshot()
+        if last is None:
+            yield {"type": "error", "detail": "Not found"}
+            return
+        
+        yield last
+        while last["type"] not in TERMINAL_EVENTS:
+            try:
+                event = await asyncio.wait_for(queue.get(), PROGRESS_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                event = await snapshot()
+                if event is None or event == last:
+                    yield {"type": "keepalive"}
+                    continue
+            
+            yield event
+            last = event
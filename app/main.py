@@ -32,6 +32,15 @@ from app.api.static_input import router as static_input_router
 from app.api.chat import router as chat_router
 from app.api.evaluation import router as evaluation_router
 from app.api.documents import router as documents_router
+from app.services.ai.client_registry import get_registry
+from app.services.jobs import get_job_queue, WorkerPool, JOB_IN_PROCESS_WORKERS
+from app.services.job_state import get_job_state_store
+from app.services.progress import get_progress_broker
+from app.worker import get_job_handlers, get_job_sweeper
+from app.services.chat_persister import get_chat_persister
+from app.services.firestore import organization_cache_stats
+from app.services.ai.chat_context import get_chat_context_builder
+from app.services.org_context import get_org_context_store
 
 # Create FastAPI app
 app = FastAPI(
@@ -61,6 +70,10 @@ app.include_router(chat_router, prefix="/api/chat", tags=["Chat"])
 app.include_router(evaluation_router, prefix="/api/evaluation", tags=["Evaluation"])
 app.include_router(documents_router, prefix="/api/documents", tags=["Documents"])
 
+# Background job workers run in this process (see app/worker.py for standalone workers)
+worker_pool = None
+job_sweeper = None
+
 # Root endpoint
 @app.get("/")
 async def root(request: Request):
@@ -94,6 +107,55 @@ async def health_check():
     logger.debug("Health check endpoint accessed")
     return {"status": "healthy"}
 
+# Metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    logger.debug("Metrics endpoint accessed")
+    return {
+        "providers": get_registry().stats(),
+        "workers": worker_pool.stats() if worker_pool else {},
+        "sweeper": job_sweeper.stats() if job_sweeper else {},
+        "job_state": get_job_state_store().stats(),
+        "progress": get_progress_broker().stats(),
+        "chat_persistence": get_chat_persister().stats(),
+        "organization_cache": organization_cache_stats(),
+        "chat_context": get_chat_context_builder().stats(),
+        "org_context": get_org_context_store().stats()
+    }
+
+# Startup hook
+@app.on_event("startup")
+async def startup():
+    logger.info("Warming up AI provider")
+    await get_registry().warm_up()
+    
+    get_chat_persister().start()
+    
+    global worker_pool, job_sweeper
+    if JOB_IN_PROCESS_WORKERS > 0:
+        logger.info(f"Starting {JOB_IN_PROCESS_WORKERS} in-process job workers")
+        worker_pool = WorkerPool(get_job_queue(), get_job_handlers(), JOB_IN_PROCESS_WORKERS)
+        worker_pool.start()
+        job_sweeper = get_job_sweeper()
+        job_sweeper.start()
+
+# Shutdown hook
+@app.on_event("shutdown")
+async def shutdown():
+    logger.info("Writing queued chat turns")
+    await get_chat_persister().stop(timeout=10)
+    
+    if job_sweeper:
+        await job_sweeper.stop()
+    
+    if worker_pool:
+        # Unfinished jobs are picked up again when their lease expires
+        logger.info("Stopping in-process job workers")
+        await worker_pool.stop(timeout=10)
+    
+    logger.info("Closing AI provider connection pools")
+    await get_registry().aclose()
+
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -34,6 +34,9 @@ class RequirementEvaluation(BaseModel):
     compliance_score: float = Field(..., description="Compliance score (0-100)")
     findings: List[str] = Field([], description="Evaluation findings")
     recommendations: List[str] = Field([], description="Recommendations for improvement")
+    control_id: Optional[str] = Field(None, description="Canonical control the result was evaluated as, if shared across frameworks")
+    input_hashes: Dict[str, str] = Field({}, description="Content hashes of the requirement, organization fields and evidence evaluated")
+    reused: bool = Field(False, description="Whether the result was reused from a previous evaluation")
 
 class CertificationEvaluation(BaseModel):
     """
@@ -46,6 +49,8 @@ class CertificationEvaluation(BaseModel):
     strengths: List[str] = Field([], description="Identified strengths")
     weaknesses: List[str] = Field([], description="Identified weaknesses")
     recommendations: List[str] = Field([], description="Overall recommendations")
+    reused_requirements: List[str] = Field([], description="Requirement IDs reused from a previous evaluation")
+    recomputed_requirements: List[str] = Field([], description="Requirement IDs evaluated in this run")
 
 class Evaluation(BaseModel):
     """
@@ -57,6 +62,7 @@ class Evaluation(BaseModel):
     progress: float = Field(0.0, description="Evaluation progress (0-100)")
     certification_types: List[CertificationType] = Field(..., description="Certification types being evaluated")
     certification_evaluations: List[CertificationEvaluation] = Field([], description="Certification evaluations")
+    previous_evaluation_id: Optional[str] = Field(None, description="Evaluation whose unchanged results were reused")
     created_at: Optional[datetime] = Field(None, description="Creation timestamp")
     updated_at: Optional[datetime] = Field(None, description="Last update timestamp")
     completed_at: Optional[datetime] = Field(None, description="Completion timestamp")
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any
+from enum import Enum
+
+class JobStatus(str, Enum):
+    """
+    Enum for background job status
+    """
+    QUEUED = "queued"
+    LEASED = "leased"
+    SUCCEEDED = "succeeded"
+    DEAD = "dead"
+
+class Job(BaseModel):
+    """
+    Model representing a unit of background work in the job queue
+    """
+    id: str = Field(..., description="Job ID")
+    type: str = Field(..., description="Job type, used to pick the handler")
+    payload: Dict[str, Any] = Field({}, description="Handler arguments")
+    status: JobStatus = Field(JobStatus.QUEUED, description="Job status")
+    attempts: int = Field(0, description="Number of times the job has been leased")
+    max_attempts: int = Field(..., description="Attempts before the job is given up on")
+    available_at: float = Field(..., description="Epoch seconds when the job can next be leased (lease expiry while leased)")
+    lease_id: Optional[str] = Field(None, description="Token of the current lease")
+    lease_owner: Optional[str] = Field(None, description="Worker holding the current lease")
+    last_error: Optional[str] = Field(None, description="Error from the last failed attempt")
+    created_at: Optional[float] = Field(None, description="Epoch seconds when the job was enqueued")
+    updated_at: Optional[float] = Field(None, description="Epoch seconds of the last change")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert model to dictionary for storage
+        """
+        data = self.dict(exclude={"id"})
+        data["status"] = self.status.value
+        return data
+
+    @classmethod
+    def from_dict(cls, id: str, data: Dict[str, Any]) -> "Job":
+        """
+        Create model from a stored dictionary
+        """
+        return cls(id=id, **data)
@@ -1,5 +1,6 @@
 # Import AI services for easier access
 from app.services.ai.model_factory import get_ai_model
+from app.services.ai.client_registry import get_registry
 from app.services.ai.chat_manager import ChatManager
 from app.services.ai.evaluation_service import EvaluationService
-from app.services.ai.document_service import DocumentService 
\ No newline at end of file
+from app.services.ai.document_service import DocumentService 
@@ -0,0 +1,269 @@
+import logging
+import math
+import os
+import asyncio
+from typing import Dict, Any, List, Optional, Tuple
+from app.services.cache import TTLCache
+from app.services.firestore import get_chat_history, get_chat_message_count
+
+logger = logging.getLogger(__name__)
+
+# Tokens of history and summary sent with each chat turn, besides the new message
+CHAT_CONTEXT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "3000"))
+
+# Part of that budget the summary of older turns may take
+CHAT_SUMMARY_TOKEN_BUDGET = int(os.getenv("CHAT_SUMMARY_TOKEN_BUDGET", "600"))
+
+# Most recent messages loaded from Firestore for a session not held in memory
+CHAT_CONTEXT_LOAD_MESSAGES = int(os.getenv("CHAT_CONTEXT_LOAD_MESSAGES", "40"))
+
+# Sessions whose context is held in memory, and seconds an idle one is kept
+CHAT_SESSION_CACHE_SIZE = int(os.getenv("CHAT_SESSION_CACHE_SIZE", "1000"))
+CHAT_SESSION_CACHE_TTL = float(os.getenv("CHAT_SESSION_CACHE_TTL", "3600"))
+
+# Rough characters per token for English text, and per-message framing tokens
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Characters of each message kept in a summary line
+SUMMARY_LINE_CHARS = 200
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of a text without a provider tokenizer
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated number of tokens
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+def _message_tokens(message: Dict[str, str]) -> int:
+    return estimate_tokens(message["content"]) + MESSAGE_OVERHEAD_TOKENS
+
+def _summary_line(message: Dict[str, str]) -> str:
+    content = " ".join(message["content"].split())
+    if len(content) > SUMMARY_LINE_CHARS:
+        content = content[:SUMMARY_LINE_CHARS].rsplit(" ", 1)[0] + "..."
+    speaker = "User asked" if message["role"] == "user" else "Assistant answered"
+    return f"- {speaker}: {content}"
+
+class ChatSessionContext:
+    """
+    Recent messages of a chat session plus a running summary of older ones
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty session context
+        """
+        self.messages: List[Dict[str, str]] = []
+        self.message_tokens = 0
+        self.summary_lines: List[str] = []
+        self.summary_tokens = 0
+        self.omitted = False
+        # Messages of the session this context has seen, summarised or not
+        self.message_count = 0
+
+    def add(self, role: str, content: str):
+        """
+        Append a message to the recent window
+
+        Args:
+            role: Message role
+            content: Message content
+        """
+        message = {"role": role, "content": content}
+        self.messages.append(message)
+        self.message_tokens += _message_tokens(message)
+        self.message_count += 1
+
+    def fold_oldest(self, summary_budget: int):
+        """
+        Move the oldest recent message into the summary
+
+        Only the new line is added; when the summary outgrows its budget its
+        oldest lines are dropped.
+
+        Args:
+            summary_budget: Maximum tokens of summary
+        """
+        message = self.messages.pop(0)
+        self.message_tokens -= _message_tokens(message)
+
+        line = _summary_line(message)
+        self.summary_lines.append(line)
+        self.summary_tokens += estimate_tokens(line) + 1
+        while self.summary_tokens > summary_budget and self.summary_lines:
+            dropped = self.summary_lines.pop(0)
+            self.summary_tokens -= estimate_tokens(dropped) + 1
+            self.omitted = True
+
+    def summary(self) -> Optional[str]:
+        """
+        Render the summary of older turns
+
+        Returns:
+            Summary text or None if nothing has been summarised
+        """
+        if not self.summary_lines:
+            return None
+        lines = ["Summary of the earlier conversation:"]
+        if self.omitted:
+            lines.append("- (older turns omitted)")
+        return "\n".join(lines + self.summary_lines)
+
+class ChatContextBuilder:
+    """
+    Fits a chat session's history into a fixed token budget
+
+    The most recent messages are sent verbatim. Messages that no longer fit
+    are folded, one line each, into a running summary that goes into the
+    system prompt, so a turn's prompt stays bounded however long the session
+    runs. Session contexts are kept in memory and updated after each turn;
+    a session not in memory is loaded from its latest Firestore messages.
+    Before a held context is reused, the session header's message count is
+    read, and the context is reloaded if the session has more messages than
+    it has seen (turns answered by another instance or worker).
+    """
+
+    def __init__(
+        self,
+        token_budget: int = CHAT_CONTEXT_TOKEN_BUDGET,
+        summary_budget: int = CHAT_SUMMARY_TOKEN_BUDGET,
+        load_messages: int = CHAT_CONTEXT_LOAD_MESSAGES,
+        cache_size: int = CHAT_SESSION_CACHE_SIZE,
+        cache_ttl: float = CHAT_SESSION_CACHE_TTL
+    ):
+        """
+        Initialize context builder
+
+        Args:
+            token_budget: Tokens of history and summary per turn
+            summary_budget: Tokens of summary per turn
+            load_messages: Messages loaded for a session not in memory
+            cache_size: Sessions held in memory
+            cache_ttl: Seconds an idle session is held
+        """
+        self.token_budget = token_budget
+        self.summary_budget = min(summary_budget, token_budget)
+        self.load_messages = load_messages
+        self.sessions = TTLCache(cache_size, default_ttl=cache_ttl)
+        self.loads = 0
+        self.reloads = 0
+        self.folded = 0
+
+    async def _is_stale(self, organization_id: str, session_id: str, session: ChatSessionContext) -> bool:
+        try:
+            count = await get_chat_message_count(organization_id, session_id)
+        except Exception as e:
+            logger.warning(f"Error checking chat session {session_id} for new messages: {str(e)}")
+            return False
+        # Lower counts are turns of this instance still waiting to be written
+        return count is not None and count > session.message_count
+
+    async def _session(self, organization_id: str, session_id: str, new: bool) -> ChatSessionContext:
+        key: Tuple[str, str] = (organization_id, session_id)
+        session = self.sessions.get(key)
+        if session is not None:
+            if new or not await self._is_stale(organization_id, session_id, session):
+                return session
+            self.reloads += 1
+
+        session = ChatSessionContext()
+        if not new:
+            try:
+                count, history = await asyncio.gather(
+                    get_chat_message_count(organization_id, session_id),
+                    get_chat_history(organization_id, session_id, limit=self.load_messages, fields=["role", "content"])
+                )
+                self.loads += 1
+                for message in reversed((history or {}).get("messages", [])):
+                    session.add(message["role"], message["content"])
+                # Older messages than those loaded count as seen too
+                session.message_count = max(session.message_count, count or 0)
+            except Exception as e:
+                # Answer without history rather than not at all
+                logger.warning(f"Error loading chat history for session {session_id}: {str(e)}")
+
+        self.sessions.set(key, session)
+        return session
+
+    async def build(self, organization_id: str, session_id: str, message: str, new: bool = False) -> Dict[str, Any]:
+        """
+        Build the context for the next turn of a session
+
+        Args:
+            organization_id: Organization ID
+            session_id: Chat session ID
+            message: New user message
+            new: The session has just been created, so there is nothing to load
+
+        Returns:
+            Dictionary with history (recent messages, oldest first), summary
+            (of older turns, or None) and their estimated tokens
+        """
+        session = await self._session(organization_id, session_id, new)
+
+        while session.messages and (
+            session.message_tokens + session.summary_tokens > self.token_budget
+            # Providers expect the history to start with a user message
+            or session.messages[0]["role"] != "user"
+        ):
+            session.fold_oldest(self.summary_budget)
+            self.folded += 1
+
+        return {
+            "history": [dict(m) for m in session.messages],
+            "summary": session.summary(),
+            "tokens": session.message_tokens + session.summary_tokens + estimate_tokens(message)
+        }
+
+    async def record(self, organization_id: str, session_id: str, message: str, response: str):
+        """
+        Add a completed turn to the session's context
+
+        Args:
+            organization_id: Organization ID
+            session_id: Chat session ID
+            message: User message
+            response: Assistant response
+        """
+        session = await self._session(organization_id, session_id, True)
+        session.add("user", message)
+        session.add("assistant", response)
+        # Keep the entry alive while the session is active
+        self.sessions.set((organization_id, session_id), session)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get context builder statistics
+
+        Returns:
+            Session cache counters, sessions loaded from Firestore (and
+            reloaded because they had changed elsewhere) and messages folded
+            into summaries
+        """
+        return {
+            "sessions": self.sessions.stats(),
+            "loads": self.loads,
+            "reloads": self.reloads,
+            "folded": self.folded,
+            "token_budget": self.token_budget
+        }
+
+_builder: Optional[ChatContextBuilder] = None
+
+def get_chat_context_builder() -> ChatContextBuilder:
+    """
+    Get the process-wide chat context builder
+
+    Returns:
+        Chat context builder
+    """
+    global _builder
+    if _builder is None:
+        _builder = ChatContextBuilder()
+    return _builder
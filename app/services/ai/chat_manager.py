@@ -1,8 +1,12 @@
 import logging
 import os
 import uuid
-from typing import List, Dict, Any, Optional
-from app.services.ai.model_factory import get_ai_model
+import asyncio
+import time
+from typing import List, Dict, Any, Optional, AsyncIterator
+from app.services.ai.model_factory import get_ai_model, BaseAIModel
+from app.services.ai.chat_context import get_chat_context_builder, estimate_tokens
+from app.services.org_context import get_org_context_store
 from app.models.chat import ChatResponse
 
 logger = logging.getLogger(__name__)
@@ -16,9 +20,49 @@ class ChatManager:
         """
         Initialize chat manager
         """
-        self.ai_model = get_ai_model()
+        self.context = get_chat_context_builder()
+        self.org_context = get_org_context_store()
         logger.info("Chat manager initialized")
     
+    async def _build_context(self, organization_id: str, session_id: str, message: str, new_session: bool) -> Dict[str, Any]:
+        """
+        Build the context of a chat turn
+        
+        Args:
+            organization_id: Organization ID
+            session_id: Chat session ID
+            message: User message
+            new_session: The session has just been created
+            
+        Returns:
+            Dictionary with history, context (organization context), summary
+            (of older turns) and estimated tokens
+        """
+        async def organization_context() -> Optional[Dict[str, Any]]:
+            try:
+                return await self.org_context.get(organization_id)
+            except Exception as e:
+                # Answer without it rather than not at all
+                logger.warning(f"Error getting organization context for {organization_id}: {str(e)}")
+                return None
+        
+        context, org_context = await asyncio.gather(
+            self.context.build(organization_id, session_id, message, new=new_session),
+            organization_context()
+        )
+        
+        context["context"] = org_context["text"] if org_context else None
+        if org_context:
+            context["tokens"] += estimate_tokens(org_context["text"])
+        return context
+    
+    @property
+    def ai_model(self) -> BaseAIModel:
+        """
+        Shared AI model, resolved lazily from the provider client registry
+        """
+        return get_ai_model()
+    
     async def process_message(
         self,
         organization_id: str,
@@ -40,20 +84,24 @@ class ChatManager:
             logger.info(f"Processing message for organization: {organization_id}")
             
             # Generate or use existing session ID
-            if not session_id:
+            new_session = not session_id
+            if new_session:
                 session_id = str(uuid.uuid4())
                 logger.info(f"Created new chat session: {session_id}")
             
-            # Get chat history if session exists
-            # This would be implemented to retrieve history from Firestore
-            # and format it for the AI model
+            # Organization context, recent turns and a summary of older ones
+            context = await self._build_context(organization_id, session_id, message, new_session)
             
             # Process message with AI model
             response_text = await self.ai_model.generate_chat_response(
                 message=message,
                 organization_id=organization_id,
-                session_id=session_id
+                session_id=session_id,
+                history=context["history"],
+                context=context["context"],
+                summary=context["summary"]
             )
+            await self.context.record(organization_id, session_id, message, response_text)
             
             # Create response
             response = ChatResponse(
@@ -61,6 +109,8 @@ class ChatManager:
                 session_id=session_id,
                 metadata={
                     "organization_id": organization_id,
+                    "new_session": new_session,
+                    "context_tokens": context["tokens"],
                     "timestamp": None  # Will be set by Firestore
                 }
             )
@@ -69,4 +119,77 @@ class ChatManager:
             return response
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}", exc_info=True)
-            raise 
\ No newline at end of file
+            raise 
+    
+    async def stream_message(
+        self,
+        organization_id: str,
+        message: str,
+        session_id: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a user message and stream the response as it is generated
+        
+        Args:
+            organization_id: Organization ID
+            message: User message
+            session_id: Chat session ID (optional)
+            
+        Yields:
+            Stream events: "start" with the session ID, one "delta" per text
+            chunk, then "done" with the assembled response
+        """
+        try:
+            logger.info(f"Streaming message for organization: {organization_id}")
+            
+            # Generate or use existing session ID
+            new_session = not session_id
+            if new_session:
+                session_id = str(uuid.uuid4())
+                logger.info(f"Created new chat session: {session_id}")
+            
+            yield {"type": "start", "session_id": session_id}
+            
+            # Organization context, recent turns and a summary of older ones
+            context = await self._build_context(organization_id, session_id, message, new_session)
+            
+            started_at = time.perf_counter()
+            time_to_first_token = None
+            chunks = []
+            
+            async for delta in self.ai_model.stream_chat_response(
+                message=message,
+                organization_id=organization_id,
+                session_id=session_id,
+                history=context["history"],
+                context=context["context"],
+                summary=context["summary"]
+            ):
+                if time_to_first_token is None:
+                    time_to_first_token = (time.perf_counter() - started_at) * 1000
+                    logger.info(f"Time to first token for session {session_id}: {time_to_first_token:.0f}ms")
+                
+                chunks.append(delta)
+                yield {"type": "delta", "session_id": session_id, "delta": delta}
+            
+            response_text = "".join(chunks)
+            await self.context.record(organization_id, session_id, message, response_text)
+            
+            yield {
+                "type": "done",
+                "session_id": session_id,
+                "message": response_text,
+                "metadata": {
+                    "organization_id": organization_id,
+                    "new_session": new_session,
+                    "context_tokens": context["tokens"],
+                    "time_to_first_token_ms": time_to_first_token,
+                    "duration_ms": (time.perf_counter() - started_at) * 1000,
+                    "timestamp": None  # Will be set by Firestore
+                }
+            }
+            
+            logger.info(f"Streamed response for session: {session_id}")
+        except Exception as e:
+            logger.error(f"Error streaming message: {str(e)}", exc_info=True)
+            raise
@@ -0,0 +1,482 @@
+import logging
+import os
+import threading
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple, Callable
+import httpx
+from app.services.ai.model_factory import BaseAIModel, PROVIDER_MODELS, MODEL_PROVIDER, VERTEX_AI_MAX_WORKERS
+from app.services.ai.response_cache import ResponseCache, CachedAIModel, AI_CACHE_ENABLED
+from app.services.ai.single_flight import SingleFlight, SingleFlightAIModel, AI_SINGLE_FLIGHT_ENABLED
+from app.services.ai.router import RoutingAIModel, AI_ROUTER_PROVIDERS
+from app.services.ai.prompts import prompt_cache_stats
+from app.services.ai.rate_limiter import (
+    AdaptiveRateLimiter, GovernedAIModel, AI_RATE_LIMIT_ENABLED, AI_RATE_LIMIT_RPS, AI_RATE_LIMIT_MAX_RPS,
+    AI_RATE_LIMIT_BURST, AI_MAX_CONCURRENCY, AI_MIN_CONCURRENCY, AI_TARGET_LATENCY
+)
+
+logger = logging.getLogger(__name__)
+
+# Connection pool settings (override per provider with e.g. AI_HTTP_MAX_CONNECTIONS_OPENAI)
+AI_HTTP_MAX_CONNECTIONS = int(os.getenv("AI_HTTP_MAX_CONNECTIONS", "100"))
+AI_HTTP_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("AI_HTTP_MAX_KEEPALIVE_CONNECTIONS", "20"))
+AI_HTTP_KEEPALIVE_EXPIRY = float(os.getenv("AI_HTTP_KEEPALIVE_EXPIRY", "30"))
+AI_HTTP_TIMEOUT = float(os.getenv("AI_HTTP_TIMEOUT", "120"))
+AI_HTTP2_ENABLED = os.getenv("AI_HTTP2_ENABLED", "true").lower() == "true"
+
+# Providers whose SDKs accept a shared httpx client
+HTTP_PROVIDERS = {"openai", "anthropic"}
+
+def _provider_setting(provider: str, name: str, default: Any) -> Any:
+    """
+    Read a per-provider override of a pool setting
+
+    Args:
+        provider: Provider name
+        name: Setting name (e.g. AI_HTTP_MAX_CONNECTIONS)
+        default: Value used when no override is set
+
+    Returns:
+        Setting value converted to the type of the default
+    """
+    value = os.getenv(f"{name}_{provider.upper()}")
+    if value is None:
+        return default
+    return type(default)(value)
+
+class PoolStats:
+    """
+    Utilisation counters for one provider connection pool
+    """
+
+    def __init__(self, provider: str, max_connections: int):
+        """
+        Initialize pool statistics
+
+        Args:
+            provider: Provider name
+            max_connections: Configured connection limit
+        """
+        self.provider = provider
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.failed_requests = 0
+        self._lock = threading.Lock()
+
+    def request_started(self):
+        """
+        Record a request entering the pool
+        """
+        with self._lock:
+            self.in_flight += 1
+            self.total_requests += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def request_finished(self, failed: bool = False):
+        """
+        Record a request leaving the pool
+        """
+        with self._lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            if failed:
+                self.failed_requests += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert statistics to a dictionary
+        """
+        with self._lock:
+            return {
+                "provider": self.provider,
+                "max_connections": self.max_connections,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "utilisation": (self.in_flight / self.max_connections) if self.max_connections else 0.0,
+                "total_requests": self.total_requests,
+                "failed_requests": self.failed_requests
+            }
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """
+    Response stream that reports back to the pool once the body is closed
+    """
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close: Callable[[], None]):
+        self._stream = stream
+        self._on_close = on_close
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._closed:
+                self._closed = True
+                self._on_close()
+
+class _InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """
+    HTTP transport that counts in-flight requests, including streamed bodies
+    """
+
+    def __init__(self, stats: PoolStats, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.stats.request_started()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self.stats.request_finished(failed=True)
+            raise
+
+        response.stream = _TrackedStream(response.stream, self.stats.request_finished)
+        return response
+
+    def connection_stats(self) -> Dict[str, int]:
+        """
+        Count open and idle connections in the underlying pool
+        """
+        try:
+            connections = list(self._pool.connections)
+            idle = sum(1 for connection in connections if connection.is_idle())
+            return {"open_connections": len(connections), "idle_connections": idle}
+        except Exception:
+            return {}
+
+class ProviderPool:
+    """
+    Shared connection resources for one provider
+    """
+
+    def __init__(self, provider: str):
+        """
+        Initialize the pool for a provider
+
+        Args:
+            provider: Provider name
+        """
+        self.provider = provider
+        self.http_client: Optional[httpx.AsyncClient] = None
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.transport: Optional[_InstrumentedTransport] = None
+
+        if provider in HTTP_PROVIDERS:
+            max_connections = _provider_setting(provider, "AI_HTTP_MAX_CONNECTIONS", AI_HTTP_MAX_CONNECTIONS)
+            http2 = _provider_setting(provider, "AI_HTTP2_ENABLED", str(AI_HTTP2_ENABLED)).lower() == "true"
+
+            # HTTP/2 needs the optional h2 package
+            if http2 and importlib.util.find_spec("h2") is None:
+                logger.warning(f"HTTP/2 requested for {provider} but h2 is not installed, using HTTP/1.1")
+                http2 = False
+
+            self.stats = PoolStats(provider, max_connections)
+            self.transport = _InstrumentedTransport(
+                self.stats,
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=_provider_setting(
+                        provider, "AI_HTTP_MAX_KEEPALIVE_CONNECTIONS", AI_HTTP_MAX_KEEPALIVE_CONNECTIONS
+                    ),
+                    keepalive_expiry=_provider_setting(provider, "AI_HTTP_KEEPALIVE_EXPIRY", AI_HTTP_KEEPALIVE_EXPIRY)
+                )
+            )
+            self.http_client = httpx.AsyncClient(
+                transport=self.transport,
+                timeout=httpx.Timeout(AI_HTTP_TIMEOUT, connect=10.0)
+            )
+            self.http2 = http2
+        else:
+            # SDKs without an async HTTP layer get a bounded executor instead
+            max_workers = _provider_setting(provider, "AI_HTTP_MAX_CONNECTIONS", VERTEX_AI_MAX_WORKERS)
+            self.stats = PoolStats(provider, max_workers)
+            self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=provider)
+            self.http2 = False
+
+        logger.info(f"Created connection pool for provider: {provider} (max={self.stats.max_connections}, http2={self.http2})")
+
+    def model_kwargs(self) -> Dict[str, Any]:
+        """
+        Keyword arguments that bind a model instance to this pool
+        """
+        if self.http_client is not None:
+            return {"http_client": self.http_client}
+        return {"executor": self.executor, "pool_stats": self.stats}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Utilisation statistics for this pool
+        """
+        data = self.stats.to_dict()
+        data["http2"] = self.http2
+        if self.transport is not None:
+            data.update(self.transport.connection_stats())
+        return data
+
+    async def aclose(self):
+        """
+        Close pooled connections and executor threads
+        """
+        if self.http_client is not None:
+            await self.http_client.aclose()
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+class ProviderClientRegistry:
+    """
+    Process-wide, lazily initialised registry of AI models and provider pools
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty registry
+        """
+        self._pools: Dict[str, ProviderPool] = {}
+        self._models: Dict[Tuple[str, str], BaseAIModel] = {}
+        self._response_cache: Optional[ResponseCache] = None
+        self.single_flight = SingleFlight()
+        self.router: Optional[RoutingAIModel] = None
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._lock = threading.RLock()
+
+    def _resolve_provider(self, provider: Optional[str]) -> str:
+        """
+        Normalise a provider name, falling back to OpenAI for unknown names
+
+        Without an explicit provider, calls go to the router when
+        AI_ROUTER_PROVIDERS is configured and to AI_MODEL_PROVIDER otherwise.
+        """
+        if provider is None and AI_ROUTER_PROVIDERS:
+            return "router"
+        provider = (provider or MODEL_PROVIDER).lower()
+        if provider == "router":
+            return provider
+        if provider not in PROVIDER_MODELS:
+            logger.warning(f"Unknown model provider: {provider}, defaulting to OpenAI")
+            provider = "openai"
+        return provider
+
+    def get_pool(self, provider: str) -> ProviderPool:
+        """
+        Get or create the shared pool for a provider
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            Provider pool
+        """
+        provider = self._resolve_provider(provider)
+        with self._lock:
+            if provider not in self._pools:
+                self._pools[provider] = ProviderPool(provider)
+            return self._pools[provider]
+
+    def get_response_cache(self) -> ResponseCache:
+        """
+        Get or create the shared LLM response cache
+
+        Returns:
+            Response cache
+        """
+        with self._lock:
+            if self._response_cache is None:
+                self._response_cache = ResponseCache()
+            return self._response_cache
+
+    def get_limiter(self, provider: str) -> AdaptiveRateLimiter:
+        """
+        Get or create the rate limiter for a provider
+
+        Args:
+            provider: Provider name
+
+        Returns:
+            Adaptive rate limiter
+        """
+        with self._lock:
+            if provider not in self._limiters:
+                self._limiters[provider] = AdaptiveRateLimiter(
+                    provider,
+                    rate=_provider_setting(provider, "AI_RATE_LIMIT_RPS", AI_RATE_LIMIT_RPS),
+                    max_rate=_provider_setting(provider, "AI_RATE_LIMIT_MAX_RPS", AI_RATE_LIMIT_MAX_RPS),
+                    burst=_provider_setting(provider, "AI_RATE_LIMIT_BURST", AI_RATE_LIMIT_BURST),
+                    max_concurrency=_provider_setting(provider, "AI_MAX_CONCURRENCY", AI_MAX_CONCURRENCY),
+                    min_concurrency=_provider_setting(provider, "AI_MIN_CONCURRENCY", AI_MIN_CONCURRENCY),
+                    target_latency=_provider_setting(provider, "AI_TARGET_LATENCY", AI_TARGET_LATENCY)
+                )
+            return self._limiters[provider]
+
+    def _build_provider_model(self, provider: str, model: Optional[str] = None) -> BaseAIModel:
+        """
+        Create a provider model bound to its pool and rate limiter
+
+        Args:
+            provider: Provider name
+            model: Model name
+
+        Returns:
+            AI model instance
+        """
+        pool = self.get_pool(provider)
+        instance = PROVIDER_MODELS[provider](model=model, **pool.model_kwargs())
+
+        if AI_RATE_LIMIT_ENABLED:
+            instance = GovernedAIModel(instance, self.get_limiter(provider))
+
+        return instance
+
+    def _build_model(self, provider: str, model: Optional[str]) -> BaseAIModel:
+        """
+        Create a provider model bound to its pool, wrapped with shared layers
+
+        Args:
+            provider: Provider name
+            model: Model name
+
+        Returns:
+            AI model instance
+        """
+        if provider == "router":
+            instance = self._build_router()
+        else:
+            instance = self._build_provider_model(provider, model)
+
+        if AI_CACHE_ENABLED:
+            instance = CachedAIModel(instance, self.get_response_cache())
+
+        # Outermost, so callers joining an in-flight call also share its cache write
+        if AI_SINGLE_FLIGHT_ENABLED:
+            instance = SingleFlightAIModel(instance, self.single_flight)
+
+        return instance
+
+    def _build_router(self) -> RoutingAIModel:
+        """
+        Create a routing model over every configured provider that initialises
+
+        Returns:
+            Routing model
+        """
+        backends = []
+        for provider in AI_ROUTER_PROVIDERS:
+            if provider not in PROVIDER_MODELS:
+                logger.warning(f"Unknown router provider: {provider}, skipping")
+                continue
+            try:
+                backends.append(self._build_provider_model(provider))
+            except Exception as e:
+                logger.warning(f"Error initializing router backend {provider}: {str(e)}")
+
+        self.router = RoutingAIModel(backends)
+        return self.router
+
+    def get_model(self, provider: Optional[str] = None, model: Optional[str] = None) -> BaseAIModel:
+        """
+        Get or create the shared model instance for a provider and model
+
+        Args:
+            provider: Provider name (defaults to AI_MODEL_PROVIDER)
+            model: Model name (defaults to the provider's configured model)
+
+        Returns:
+            AI model instance
+        """
+        provider = self._resolve_provider(provider)
+        key = (provider, model or "")
+
+        instance = self._models.get(key)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if key not in self._models:
+                logger.info(f"Getting AI model for provider: {provider}")
+                self._models[key] = self._build_model(provider, model)
+            return self._models[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Pool utilisation statistics for every initialised provider
+
+        Returns:
+            Statistics keyed by provider name
+        """
+        with self._lock:
+            pools = dict(self._pools)
+            models = list(self._models.keys())
+
+        return {
+            "pools": {provider: pool.to_dict() for provider, pool in pools.items()},
+            "models": [{"provider": provider, "model": model or "default"} for provider, model in models],
+            "response_cache": self._response_cache.stats() if self._response_cache is not None else None,
+            "single_flight": self.single_flight.stats(),
+            "router": self.router.stats() if self.router is not None else None,
+            "rate_limiters": {provider: limiter.stats() for provider, limiter in self._limiters.items()},
+            "prompt_cache": prompt_cache_stats.stats()
+        }
+
+    async def warm_up(self):
+        """
+        Create the default model and load its provider resources
+
+        Failures are logged rather than raised so a provider outage does not
+        prevent the application from starting.
+        """
+        try:
+            await self.get_model().warm_up()
+        except Exception as e:
+            logger.warning(f"Error warming up AI model: {str(e)}")
+
+    async def aclose(self):
+        """
+        Close every model and provider pool
+        """
+        with self._lock:
+            pools = list(self._pools.values())
+            models = list(self._models.values())
+            response_cache = self._response_cache
+            self._pools.clear()
+            self._models.clear()
+            self._response_cache = None
+            self.router = None
+
+        if response_cache is not None:
+            response_cache.close()
+
+        for model in models:
+            try:
+                await model.close()
+            except Exception as e:
+                logger.error(f"Error closing AI model: {str(e)}", exc_info=True)
+
+        for pool in pools:
+            try:
+                await pool.aclose()
+            except Exception as e:
+                logger.error(f"Error closing pool for provider {pool.provider}: {str(e)}", exc_info=True)
+
+_registry: Optional[ProviderClientRegistry] = None
+_registry_lock = threading.Lock()
+
+def get_registry() -> ProviderClientRegistry:
+    """
+    Get the process-wide provider client registry
+
+    Returns:
+        Provider client registry
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ProviderClientRegistry()
+    return _registry
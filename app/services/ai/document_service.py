@@ -1,10 +1,23 @@
 import logging
 import os
 import uuid
+import time
 import asyncio
 from typing import List, Dict, Any, Optional
-from app.services.ai.model_factory import get_ai_model
-from app.services.firestore import save_document_generation, get_evaluation_results
+from app.services.ai.model_factory import get_ai_model, BaseAIModel
+from app.services.firestore import (
+    save_document_generation,
+    get_document_generation,
+    get_evaluation_results,
+    list_in_progress_records,
+    update_record,
+    COLLECTION_DOCUMENTS
+)
+from app.services.progress_writer import ProgressWriter
+from app.services.job_state import get_job_state_store, DOCUMENT_GENERATION_STATE
+from app.services.progress import get_progress_broker, progress_topic, progress_event_type
+from app.services.org_context import get_org_context_store
+from app.services.jobs import get_job_queue, send_heartbeats, DOCUMENT_GENERATION_JOB
 from app.services.storage import upload_file
 from app.models.document import DocumentStatus, DocumentType, DocumentFormat, DocumentStatusResponse
 from fastapi import UploadFile
@@ -21,10 +34,37 @@ class DocumentService:
         """
         Initialize document service
         """
-        self.ai_model = get_ai_model()
-        self.active_generations = {}  # Track active document generations
+        self.job_state = get_job_state_store()  # Progress of running document generations
+        self.progress = get_progress_broker()  # Progress events for streaming clients
+        self.org_context = get_org_context_store()  # Organization profile and evaluation summary for prompts
         logger.info("Document service initialized")
     
+    @property
+    def ai_model(self) -> BaseAIModel:
+        """
+        Shared AI model, resolved lazily from the provider client registry
+        """
+        return get_ai_model()
+    
+    async def _track(self, document_id: str, organization_id: str, status: str, progress: float, **details: Any):
+        """
+        Record the progress of a running document generation in the shared job state store
+        and publish it to streaming clients
+        """
+        self.progress.publish(
+            progress_topic(DOCUMENT_GENERATION_STATE, document_id),
+            dict(details, type=progress_event_type(status), status=status, progress=progress)
+        )
+        try:
+            await self.job_state.set(DOCUMENT_GENERATION_STATE, document_id, {
+                "organization_id": organization_id,
+                "status": status,
+                "progress": progress
+            })
+        except Exception as e:
+            # Status polls fall back to the document generation record
+            logger.warning(f"Error tracking document generation {document_id}: {str(e)}")
+    
     async def create_document_generation(
         self,
         organization_id: str,
@@ -73,51 +113,71 @@ class DocumentService:
         organization_id: str,
         evaluation_id: str,
         document_id: str,
-        document_types: List[str]
+        document_types: List[str],
+        final_attempt: bool = True
     ):
         """
         Generate compliance documents
         
+        Each generated document is checkpointed in the generation record, so
+        a retried or re-queued run skips the documents already uploaded.
+        Progress is written as coalesced field-level updates. A failed attempt
+        that will be retried leaves the generation in progress; only the
+        final one marks it failed.
+        
         Args:
             organization_id: Organization ID
             evaluation_id: Evaluation ID
             document_id: Document generation ID
             document_types: List of document types to generate
+            final_attempt: No retry follows if this attempt fails
         """
+        writer = ProgressWriter(COLLECTION_DOCUMENTS, document_id)
+        progress = 0.0
+        heartbeat = None
+        
         try:
             logger.info(f"Starting document generation for: {document_id}")
             
-            # Update status to in progress
-            document_data = {
-                "id": document_id,
-                "organization_id": organization_id,
-                "evaluation_id": evaluation_id,
-                "status": DocumentStatus.IN_PROGRESS.value,
-                "progress": 0.0,
-                "document_types": document_types,
-                "generated_documents": []
-            }
+            # Resume from the documents an interrupted attempt already generated
+            existing = await get_document_generation(organization_id, document_id)
+            generated_documents = [
+                d for d in (existing or {}).get("generated_documents", [])
+                if d.get("document_type") in document_types
+            ]
+            done_types = {d["document_type"] for d in generated_documents}
+            if done_types:
+                logger.info(f"Resuming document generation {document_id} with {len(done_types)} documents checkpointed")
             
-            await save_document_generation(document_data)
+            # Update status to in progress
+            total_documents = len(document_types)
+            progress = (len(done_types) / total_documents) * 100 if total_documents else 0.0
+            writer.set(
+                status=DocumentStatus.IN_PROGRESS.value,
+                progress=progress,
+                generated_documents=generated_documents
+            )
+            await writer.flush()
             
             # Track active generation
-            self.active_generations[document_id] = {
-                "organization_id": organization_id,
-                "progress": 0.0,
-                "status": DocumentStatus.IN_PROGRESS.value
-            }
+            await self._track(document_id, organization_id, DocumentStatus.IN_PROGRESS.value, progress)
             
-            # Get evaluation results
-            evaluation = await get_evaluation_results(organization_id, evaluation_id)
+            heartbeat = asyncio.ensure_future(send_heartbeats(writer.heartbeat))
+            
+            # Get evaluation results and the organization's prompt context
+            evaluation, organization_context = await asyncio.gather(
+                get_evaluation_results(organization_id, evaluation_id),
+                self.org_context.get(organization_id)
+            )
             
             if not evaluation:
                 raise ValueError(f"Evaluation not found: {evaluation_id}")
             
             # Process each document type
-            total_documents = len(document_types)
-            generated_documents = []
-            
             for i, doc_type in enumerate(document_types):
+                if doc_type in done_types:
+                    continue
+                
                 try:
                     logger.info(f"Generating document: {doc_type} for document generation: {document_id}")
                     
@@ -126,7 +186,8 @@ class DocumentService:
                         organization_id=organization_id,
                         evaluation_id=evaluation_id,
                         document_type=doc_type,
-                        evaluation_data=evaluation
+                        evaluation_data=evaluation,
+                        organization_context=organization_context
                     )
                     
                     # Convert content to file-like object
@@ -156,69 +217,157 @@ class DocumentService:
                     }
                     
                     generated_documents.append(generated_document)
+                    done_types.add(doc_type)
                     
                     # Update progress
-                    progress = ((i + 1) / total_documents) * 100
-                    self.active_generations[document_id]["progress"] = progress
+                    progress = (len(done_types) / total_documents) * 100
+                    self.progress.publish(progress_topic(DOCUMENT_GENERATION_STATE, document_id), {
+                        "type": "document",
+                        "document": generated_document,
+                        "progress": progress
+                    })
+                    await self._track(document_id, organization_id, DocumentStatus.IN_PROGRESS.value, progress)
                     
-                    # Update document data
-                    document_data = {
-                        "id": document_id,
-                        "organization_id": organization_id,
-                        "evaluation_id": evaluation_id,
-                        "status": DocumentStatus.IN_PROGRESS.value,
-                        "progress": progress,
-                        "document_types": document_types,
-                        "generated_documents": generated_documents
-                    }
-                    
-                    await save_document_generation(document_data)
+                    # Checkpoint the generated document
+                    writer.set(progress=progress)
+                    writer.append("generated_documents", generated_document)
                     
                 except Exception as e:
                     logger.error(f"Error generating document {doc_type}: {str(e)}", exc_info=True)
                     # Continue with next document type
             
-            # Update status to completed
-            document_data = {
-                "id": document_id,
-                "organization_id": organization_id,
-                "evaluation_id": evaluation_id,
-                "status": DocumentStatus.COMPLETED.value,
-                "progress": 100.0,
-                "document_types": document_types,
-                "generated_documents": generated_documents,
-                "completed_at": None  # Will be set by Firestore
-            }
+            heartbeat.cancel()
             
-            await save_document_generation(document_data)
+            # Update status to completed
+            await writer.finish(
+                status=DocumentStatus.COMPLETED.value,
+                progress=100.0,
+                completed_at=None  # Will be set by Firestore
+            )
             
             # Update tracking
-            self.active_generations[document_id]["status"] = DocumentStatus.COMPLETED.value
-            self.active_generations[document_id]["progress"] = 100.0
+            await self._track(
+                document_id,
+                organization_id,
+                DocumentStatus.COMPLETED.value,
+                100.0,
+                result={"generated_documents": generated_documents}
+            )
             
             logger.info(f"Completed document generation: {document_id}")
             
         except Exception as e:
             logger.error(f"Error generating documents: {str(e)}", exc_info=True)
             
-            # Update status to failed
+            if heartbeat is not None:
+                heartbeat.cancel()
+            
+            # Keep the generated documents for a retry; only a final failure is terminal
             try:
-                document_data = {
-                    "id": document_id,
-                    "organization_id": organization_id,
-                    "evaluation_id": evaluation_id,
-                    "status": DocumentStatus.FAILED.value,
-                    "progress": self.active_generations.get(document_id, {}).get("progress", 0.0),
-                    "document_types": document_types,
-                    "generated_documents": []
-                }
-                
-                await save_document_generation(document_data)
-                
-                if document_id in self.active_generations:
-                    self.active_generations[document_id]["status"] = DocumentStatus.FAILED.value
+                if final_attempt:
+                    await writer.finish(status=DocumentStatus.FAILED.value)
+                    
+                    await self._track(
+                        document_id,
+                        organization_id,
+                        DocumentStatus.FAILED.value,
+                        progress,
+                        detail="Document generation failed"
+                    )
+                else:
+                    await writer.finish()
+                    
+                    await self._track(
+                        document_id,
+                        organization_id,
+                        DocumentStatus.IN_PROGRESS.value,
+                        progress,
+                        retrying=True,
+                        detail="Document generation attempt failed, retrying"
+                    )
             except Exception as inner_e:
                 logger.error(f"Error updating failed document generation: {str(inner_e)}", exc_info=True)
+            
+            # Re-raise so the job queue retries the attempt
+            raise
+    
+    async def enqueue_generation(
+        self,
+        organization_id: str,
+        evaluation_id: str,
+        document_id: str,
+        document_types: List[str]
+    ) -> str:
+        """
+        Queue a document generation for a worker
+        
+        Args:
+            organization_id: Organization ID
+            evaluation_id: Evaluation ID
+            document_id: Document generation ID
+            document_types: List of document types to generate
+            
+        Returns:
+            Job ID
+        """
+        return await get_job_queue().enqueue(
+            DOCUMENT_GENERATION_JOB,
+            {
+                "organization_id": organization_id,
+                "evaluation_id": evaluation_id,
+                "document_id": document_id,
+                "document_types": document_types
+            },
+            job_id=f"{DOCUMENT_GENERATION_JOB}-{document_id}"
+        )
+    
+    async def find_stalled_jobs(self, stall_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Find document generation jobs whose in-progress record stopped sending heartbeats
+        
+        Args:
+            stall_seconds: Heartbeat age after which a job counts as stalled
+            
+        Returns:
+            Stalled jobs (job_id, job_type, payload)
+        """
+        cutoff = time.time() - stall_seconds
+        return [
+            {
+                "job_id": f"{DOCUMENT_GENERATION_JOB}-{generation['id']}",
+                "job_type": DOCUMENT_GENERATION_JOB,
+                "payload": {
+                    "organization_id": generation["organization_id"],
+                    "evaluation_id": generation["evaluation_id"],
+                    "document_id": generation["id"],
+                    "document_types": generation.get("document_types", [])
+                }
+            }
+            for generation in await list_in_progress_records(COLLECTION_DOCUMENTS)
+            if (generation.get("heartbeat_at") or 0) < cutoff
+        ]
+    
+    async def fail_stalled_job(self, payload: Dict[str, Any], error: str):
+        """
+        Mark the document generation of a job that was given up on as failed
+        
+        Args:
+            payload: Job payload
+            error: Why the job was given up on
+        """
+        generation = await get_document_generation(payload["organization_id"], payload["document_id"])
+        if not generation or generation.get("status") != DocumentStatus.IN_PROGRESS.value:
+            return
+        
+        logger.warning(f"Marking stalled document generation {payload['document_id']} as failed: {error}")
+        await update_record(COLLECTION_DOCUMENTS, payload["document_id"], {"status": DocumentStatus.FAILED.value})
+        await self._track(
+            payload["document_id"],
+            payload["organization_id"],
+            DocumentStatus.FAILED.value,
+            generation.get("progress", 0.0),
+            detail="Document generation failed"
+        )
     
     async def get_document_status(
         self,
@@ -239,9 +388,8 @@ class DocumentService:
             logger.info(f"Getting status for document generation: {document_id}")
             
             # Check active generations first
-            if document_id in self.active_generations:
-                active_gen = self.active_generations[document_id]
-                
+            active_gen = await self.job_state.get(DOCUMENT_GENERATION_STATE, document_id)
+            if active_gen is not None:
                 if active_gen["organization_id"] != organization_id:
                     logger.warning(f"Organization ID mismatch for document generation: {document_id}")
                     return None
@@ -254,13 +402,53 @@ class DocumentService:
                 )
             
             # Otherwise, get from Firestore
-            # This would be implemented to retrieve from Firestore
+            generation = await get_document_generation(organization_id, document_id)
             
-            return None
+            if not generation:
+                return None
+            
+            return DocumentStatusResponse(
+                organization_id=organization_id,
+                document_id=document_id,
+                status=generation["status"],
+                progress=generation["progress"]
+            )
         except Exception as e:
             logger.error(f"Error getting document status: {str(e)}", exc_info=True)
             raise
     
+    async def get_progress_event(
+        self,
+        organization_id: str,
+        document_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the current state of a document generation as a progress event
+        
+        Args:
+            organization_id: Organization ID
+            document_id: Document generation ID
+            
+        Returns:
+            Progress, completed (with the generated documents) or failed event, or None if not found
+        """
+        status = await self.get_document_status(organization_id, document_id)
+        
+        if not status:
+            return None
+        
+        event = {
+            "type": progress_event_type(status.status),
+            "status": status.status,
+            "progress": status.progress
+        }
+        if status.status == DocumentStatus.COMPLETED.value:
+            generation = await get_document_generation(organization_id, document_id)
+            event["result"] = {"generated_documents": (generation or {}).get("generated_documents", [])}
+        elif status.status == DocumentStatus.FAILED.value:
+            event["detail"] = "Document generation failed"
+        return event
+    
     async def list_documents(
         self,
         organization_id: str
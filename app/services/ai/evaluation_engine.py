@@ -0,0 +1,415 @@
+import logging
+import os
+import asyncio
+from typing import Dict, Any, Optional, List, Set, Callable, Awaitable
+from app.services.ai.model_factory import BaseAIModel
+from app.services.catalog import get_certification_requirements
+from app.services.control_index import get_canonical_control_id, get_canonical_control, get_mapped_requirement_ids
+from app.services.evidence import hash_content, requirement_input_hashes
+
+logger = logging.getLogger(__name__)
+
+# Requirements sent to the provider per call (larger chunks mean fewer, longer prompts)
+EVALUATION_CHUNK_SIZE = int(os.getenv("EVALUATION_CHUNK_SIZE", "10"))
+
+# Maximum number of chunks of one certification evaluated at the same time
+EVALUATION_CHUNK_CONCURRENCY = int(os.getenv("EVALUATION_CHUNK_CONCURRENCY", "4"))
+
+# Requirement scores at or above this are strengths, below WEAKNESS_THRESHOLD weaknesses
+STRENGTH_THRESHOLD = 80.0
+WEAKNESS_THRESHOLD = 60.0
+
+# Certification type sent to the provider for chunks of controls shared by several frameworks
+SHARED_CONTROLS = "shared_controls"
+
+# Upper bound on strengths, weaknesses and recommendations in a certification summary
+MAX_SUMMARY_ITEMS = 5
+
+def chunk_requirements(requirements: List[Dict[str, Any]], chunk_size: int) -> List[List[Dict[str, Any]]]:
+    """
+    Split requirements into chunks of at most chunk_size
+
+    Args:
+        requirements: Requirements to split
+        chunk_size: Maximum requirements per chunk
+
+    Returns:
+        List of chunks in catalog order
+    """
+    chunk_size = max(1, chunk_size)
+    return [requirements[i:i + chunk_size] for i in range(0, len(requirements), chunk_size)]
+
+def reduce_requirement_evaluations(
+    certification_type: str,
+    requirement_evaluations: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Combine requirement evaluations into a certification evaluation
+
+    Args:
+        certification_type: Certification type
+        requirement_evaluations: Evaluations of every requirement
+
+    Returns:
+        Certification evaluation data
+    """
+    total = len(requirement_evaluations)
+    overall_score = (
+        sum(r["compliance_score"] for r in requirement_evaluations) / total
+    ) if total else 0.0
+
+    ranked = sorted(requirement_evaluations, key=lambda r: r["compliance_score"])
+    strengths = [
+        r["name"] for r in reversed(ranked) if r["compliance_score"] >= STRENGTH_THRESHOLD
+    ][:MAX_SUMMARY_ITEMS]
+    weaknesses = [
+        r["name"] for r in ranked if r["compliance_score"] < WEAKNESS_THRESHOLD
+    ][:MAX_SUMMARY_ITEMS]
+
+    # Lowest scoring requirements first, without repeats
+    recommendations = []
+    for requirement in ranked:
+        for recommendation in requirement.get("recommendations", []):
+            if recommendation not in recommendations:
+                recommendations.append(recommendation)
+    recommendations = recommendations[:MAX_SUMMARY_ITEMS]
+
+    met = sum(1 for r in requirement_evaluations if r["compliance_score"] >= STRENGTH_THRESHOLD)
+    gaps = sum(1 for r in requirement_evaluations if r["compliance_score"] < WEAKNESS_THRESHOLD)
+    summary = (
+        f"Overall compliance score is {overall_score:.1f} across {total} requirements: "
+        f"{met} largely met and {gaps} with significant gaps"
+    )
+
+    return {
+        "certification_type": certification_type,
+        "overall_score": round(overall_score, 1),
+        "requirement_evaluations": requirement_evaluations,
+        "summary": summary,
+        "strengths": strengths,
+        "weaknesses": weaknesses,
+        "recommendations": recommendations
+    }
+
+class EvaluationRun:
+    """
+    Certifications of one evaluation, sharing canonical control results
+    """
+
+    def __init__(self, certifications: Dict[str, asyncio.Future], tasks: List[asyncio.Future], stats: Dict[str, int]):
+        """
+        Initialize evaluation run
+
+        Args:
+            certifications: Future of each certification evaluation by type
+            tasks: Provider call tasks of the run
+            stats: Requirement, control and provider call counts
+        """
+        self.certifications = certifications
+        self.tasks = tasks
+        self.stats = stats
+
+    async def result(self, certification_type: str) -> Dict[str, Any]:
+        """
+        Wait for one certification evaluation
+
+        Args:
+            certification_type: Certification type
+
+        Returns:
+            Certification evaluation data
+        """
+        return await asyncio.shield(self.certifications[certification_type])
+
+    def cancel(self):
+        """
+        Stop provider calls that are still running
+        """
+        for task in self.tasks:
+            task.cancel()
+        for future in self.certifications.values():
+            future.cancel()
+
+class EvaluationEngine:
+    """
+    Evaluates certifications requirement by requirement
+
+    Requirements are first mapped to evaluation units: requirements that
+    are equivalent across frameworks share one canonical control unit, the
+    rest are evaluated on their own. Units are split into chunks evaluated
+    in parallel (map); each certification then projects the unit results
+    onto its own requirements and combines them locally into the score,
+    strengths, weaknesses and summary (reduce). Units whose inputs are
+    unchanged since a previous evaluation reuse its results.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = EVALUATION_CHUNK_SIZE,
+        max_concurrency: int = EVALUATION_CHUNK_CONCURRENCY
+    ):
+        """
+        Initialize evaluation engine
+
+        Args:
+            chunk_size: Requirements per provider call
+            max_concurrency: Chunks evaluated at the same time per certification
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.max_concurrency = max(1, max_concurrency)
+
+    async def evaluate(
+        self,
+        ai_model: BaseAIModel,
+        organization_id: str,
+        certification_type: str,
+        evidence_fingerprint: Optional[str] = None,
+        organization_data: Optional[Dict[str, Any]] = None,
+        evidence_documents: Optional[List[Dict[str, Any]]] = None,
+        previous: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate one certification
+
+        Args:
+            ai_model: Model used for the provider calls
+            organization_id: Organization ID
+            certification_type: Certification type
+            evidence_fingerprint: Hash of the organization data and evidence evaluated
+            organization_data: Organization data the requirements depend on
+            evidence_documents: Uploaded evidence metadata, including content hashes
+            previous: Certification evaluation from a previous run to reuse results from
+
+        Returns:
+            Certification evaluation data
+        """
+        run = self.start(
+            ai_model,
+            organization_id=organization_id,
+            certification_types=[certification_type],
+            evidence_fingerprint=evidence_fingerprint,
+            organization_data=organization_data,
+            evidence_documents=evidence_documents,
+            previous={certification_type: previous} if previous else None
+        )
+        try:
+            return await run.result(certification_type)
+        finally:
+            run.cancel()
+
+    def start(
+        self,
+        ai_model: BaseAIModel,
+        organization_id: str,
+        certification_types: List[str],
+        evidence_fingerprint: Optional[str] = None,
+        organization_data: Optional[Dict[str, Any]] = None,
+        evidence_documents: Optional[List[Dict[str, Any]]] = None,
+        previous: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_concurrency: Optional[int] = None,
+        completed_units: Optional[Dict[str, Dict[str, Any]]] = None,
+        on_chunk_complete: Optional[Callable[[Dict[str, Dict[str, Any]]], Awaitable[None]]] = None
+    ) -> EvaluationRun:
+        """
+        Start evaluating several certifications together
+
+        Each canonical control is evaluated once and projected into every
+        framework that maps to it. Certification types without a requirement
+        catalog are evaluated in a single provider call. A failed chunk fails
+        only the certifications that depend on its units. Units already
+        evaluated by an interrupted attempt of the same run are passed back
+        in completed_units and skipped if their input hashes still match.
+
+        Args:
+            ai_model: Model used for the provider calls
+            organization_id: Organization ID
+            certification_types: Certification types to evaluate
+            evidence_fingerprint: Hash of the organization data and evidence evaluated
+            organization_data: Organization data the requirements depend on
+            evidence_documents: Uploaded evidence metadata, including content hashes
+            previous: Certification evaluations from a previous run by type
+            max_concurrency: Chunks in flight for the whole run (defaults to the per-certification limit)
+            completed_units: Unit results checkpointed by an earlier attempt of this run, by unit ID
+            on_chunk_complete: Coroutine called with the unit results of each finished chunk,
+                including their input hashes
+
+        Returns:
+            Running evaluation
+        """
+        previous = previous or {}
+        completed_units = completed_units or {}
+        units: Dict[str, Dict[str, Any]] = {}
+        unit_users: Dict[str, Set[str]] = {}
+        unit_hashes: Dict[str, Dict[str, str]] = {}
+        unit_results: Dict[str, Any] = {}
+        checkpointed: Dict[str, Any] = {}
+        plans: Dict[str, List[Dict[str, Any]]] = {}
+        certifications: Dict[str, asyncio.Future] = {}
+        tasks: List[asyncio.Future] = []
+
+        for certification_type in dict.fromkeys(certification_types):
+            requirements = [r.dict() for r in get_certification_requirements(certification_type)]
+            if not requirements:
+                certifications[certification_type] = asyncio.ensure_future(ai_model.evaluate_certification(
+                    organization_id=organization_id,
+                    certification_type=certification_type,
+                    evidence_fingerprint=evidence_fingerprint
+                ))
+                continue
+
+            plans[certification_type] = []
+            for requirement in requirements:
+                control_id = get_canonical_control_id(certification_type, requirement["id"])
+                if control_id is not None:
+                    unit_id = control_id
+                    if unit_id not in units:
+                        units[unit_id] = get_canonical_control(control_id)
+                        unit_hashes[unit_id] = requirement_input_hashes(
+                            units[unit_id],
+                            organization_data,
+                            evidence_documents,
+                            requirement_ids=[control_id] + get_mapped_requirement_ids(control_id)
+                        )
+                else:
+                    unit_id = f"{certification_type}:{requirement['id']}"
+                    units[unit_id] = requirement
+                    unit_hashes[unit_id] = requirement_input_hashes(requirement, organization_data, evidence_documents)
+                unit_users.setdefault(unit_id, set()).add(certification_type)
+                plans[certification_type].append({"unit_id": unit_id, "control_id": control_id, "requirement": requirement})
+
+        # Reuse earlier results of any framework the unit was projected into
+        for certification_type, plan in plans.items():
+            prior_results = {
+                r["requirement_id"]: r
+                for r in (previous.get(certification_type) or {}).get("requirement_evaluations", [])
+            }
+            for step in plan:
+                prior = prior_results.get(step["requirement"]["id"])
+                unit_id = step["unit_id"]
+                if unit_id not in unit_results and prior is not None and prior.get("input_hashes") == unit_hashes[unit_id]:
+                    unit_results[unit_id] = prior
+
+        # Checkpoints of evidence that has changed since are evaluated again
+        for unit_id in units:
+            checkpoint = completed_units.get(unit_id)
+            if unit_id not in unit_results and checkpoint is not None and checkpoint.get("input_hashes") == unit_hashes[unit_id]:
+                checkpointed[unit_id] = checkpoint
+
+        # Shared units get their own chunks so a framework-specific failure stays local
+        groups: Dict[str, List[str]] = {}
+        for unit_id in units:
+            if unit_id in unit_results or unit_id in checkpointed:
+                continue
+            users = unit_users[unit_id]
+            group = SHARED_CONTROLS if len(users) > 1 else next(iter(users))
+            groups.setdefault(group, []).append(unit_id)
+
+        loop = asyncio.get_event_loop()
+        futures: Dict[str, asyncio.Future] = {}
+        semaphore = asyncio.Semaphore(max(1, max_concurrency or self.max_concurrency))
+
+        async def evaluate_chunk(group: str, chunk: List[str]):
+            try:
+                async with semaphore:
+                    results = await ai_model.evaluate_requirements(
+                        organization_id=organization_id,
+                        certification_type=group,
+                        requirements=[dict(units[unit_id], id=unit_id) for unit_id in chunk],
+                        # Keyed on the chunk's own inputs so unrelated changes keep it cacheable
+                        evidence_fingerprint=hash_content([unit_hashes[unit_id] for unit_id in chunk])
+                    )
+            except Exception as e:
+                for unit_id in chunk:
+                    futures[unit_id].set_exception(e)
+                raise
+            except BaseException:
+                for unit_id in chunk:
+                    futures[unit_id].cancel()
+                raise
+
+            by_id = {r["requirement_id"]: r for r in results}
+            for unit_id in chunk:
+                if unit_id in by_id:
+                    futures[unit_id].set_result(by_id[unit_id])
+                else:
+                    futures[unit_id].set_exception(ValueError(f"No evaluation returned for requirement {unit_id}"))
+
+            if on_chunk_complete is not None:
+                try:
+                    await on_chunk_complete({
+                        unit_id: dict(by_id[unit_id], input_hashes=unit_hashes[unit_id])
+                        for unit_id in chunk if unit_id in by_id
+                    })
+                except Exception as e:
+                    # A lost checkpoint only costs re-evaluating the chunk on resume
+                    logger.warning(f"Error checkpointing chunk of {group}: {str(e)}")
+
+        chunk_count = 0
+        for group, unit_ids in groups.items():
+            for chunk in chunk_requirements(unit_ids, self.chunk_size):
+                for unit_id in chunk:
+                    futures[unit_id] = loop.create_future()
+                task = asyncio.ensure_future(evaluate_chunk(group, chunk))
+                # Failures surface through the unit futures
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+                tasks.append(task)
+                chunk_count += 1
+
+        async def finish(certification_type: str) -> Dict[str, Any]:
+            plan = plans[certification_type]
+            pending = [step["unit_id"] for step in plan if step["unit_id"] in futures]
+            outcomes = await asyncio.gather(*(futures[unit_id] for unit_id in pending), return_exceptions=True)
+            for unit_id, outcome in zip(pending, outcomes):
+                if isinstance(outcome, BaseException):
+                    raise outcome
+
+            requirement_evaluations = []
+            for step in plan:
+                unit_id = step["unit_id"]
+                reused = unit_id in unit_results
+                if reused:
+                    result = unit_results[unit_id]
+                elif unit_id in checkpointed:
+                    result = checkpointed[unit_id]
+                else:
+                    result = futures[unit_id].result()
+                requirement = step["requirement"]
+                # Project the unit result onto this framework's requirement
+                requirement_evaluations.append(dict(
+                    result,
+                    requirement_id=requirement["id"],
+                    name=requirement["name"],
+                    description=requirement["description"],
+                    category=requirement["category"],
+                    certification_type=certification_type,
+                    control_id=step["control_id"],
+                    input_hashes=unit_hashes[unit_id],
+                    reused=reused
+                ))
+
+            certification_evaluation = reduce_requirement_evaluations(certification_type, requirement_evaluations)
+            certification_evaluation["reused_requirements"] = [
+                r["requirement_id"] for r in requirement_evaluations if r["reused"]
+            ]
+            certification_evaluation["recomputed_requirements"] = [
+                r["requirement_id"] for r in requirement_evaluations if not r["reused"]
+            ]
+            return certification_evaluation
+
+        for certification_type in plans:
+            certifications[certification_type] = asyncio.ensure_future(finish(certification_type))
+
+        stats = {
+            "requirements": sum(len(plan) for plan in plans.values()),
+            "units": len(units),
+            "shared_units": sum(1 for users in unit_users.values() if len(users) > 1),
+            "reused_units": len(unit_results),
+            "checkpointed_units": len(checkpointed),
+            "evaluated_units": len(futures),
+            "chunks": chunk_count
+        }
+        logger.info(
+            f"Evaluating {stats['evaluated_units']} of {stats['units']} units for {stats['requirements']} "
+            f"requirements in {chunk_count} chunks for organization: {organization_id}"
+        )
+        return EvaluationRun(certifications, tasks, stats)
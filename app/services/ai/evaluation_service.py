@@ -1,14 +1,35 @@
 import logging
 import os
 import uuid
+import time
 import asyncio
+from google.cloud import firestore
 from typing import List, Dict, Any, Optional
-from app.services.ai.model_factory import get_ai_model
-from app.services.firestore import save_evaluation_result, get_evaluation_results
+from app.services.ai.model_factory import get_ai_model, BaseAIModel
+from app.services.ai.evaluation_engine import EvaluationEngine
+from app.services.firestore import (
+    save_evaluation_result,
+    get_evaluation_results,
+    get_organization_data,
+    get_latest_evaluation,
+    list_evidence_documents,
+    list_in_progress_records,
+    update_record,
+    COLLECTION_EVALUATIONS
+)
+from app.services.progress_writer import ProgressWriter
+from app.services.evidence import compute_evidence_fingerprint
+from app.services.job_state import get_job_state_store, EVALUATION_STATE
+from app.services.progress import get_progress_broker, progress_topic, progress_event_type
+from app.services.org_context import get_org_context_store
+from app.services.jobs import get_job_queue, send_heartbeats, EVALUATION_JOB
 from app.models.evaluation import EvaluationStatus, EvaluationStatusResponse
 
 logger = logging.getLogger(__name__)
 
+# Certifications' worth of chunks evaluated at the same time (times EVALUATION_CHUNK_CONCURRENCY)
+EVALUATION_MAX_CONCURRENCY = int(os.getenv("EVALUATION_MAX_CONCURRENCY", "3"))
+
 class EvaluationService:
     """
     Service for evaluating certification readiness
@@ -18,10 +39,38 @@ class EvaluationService:
         """
         Initialize evaluation service
         """
-        self.ai_model = get_ai_model()
-        self.active_evaluations = {}  # Track active evaluations
+        self.job_state = get_job_state_store()  # Progress of running evaluations
+        self.progress = get_progress_broker()  # Progress events for streaming clients
+        self.org_context = get_org_context_store()  # Organization profile and evaluation summary for prompts
+        self.engine = EvaluationEngine()
         logger.info("Evaluation service initialized")
     
+    @property
+    def ai_model(self) -> BaseAIModel:
+        """
+        Shared AI model, resolved lazily from the provider client registry
+        """
+        return get_ai_model()
+    
+    async def _track(self, evaluation_id: str, organization_id: str, status: str, progress: float, **details: Any):
+        """
+        Record the progress of a running evaluation in the shared job state store
+        and publish it to streaming clients
+        """
+        self.progress.publish(
+            progress_topic(EVALUATION_STATE, evaluation_id),
+            dict(details, type=progress_event_type(status), status=status, progress=progress)
+        )
+        try:
+            await self.job_state.set(EVALUATION_STATE, evaluation_id, {
+                "organization_id": organization_id,
+                "status": status,
+                "progress": progress
+            })
+        except Exception as e:
+            # Status polls fall back to the evaluation record
+            logger.warning(f"Error tracking evaluation {evaluation_id}: {str(e)}")
+    
     async def create_evaluation(
         self,
         organization_id: str,
@@ -66,113 +115,292 @@ class EvaluationService:
         self,
         organization_id: str,
         evaluation_id: str,
-        certification_types: List[str]
+        certification_types: List[str],
+        final_attempt: bool = True
     ):
         """
         Run the evaluation process
         
+        Finished certifications and requirement chunks are checkpointed in the
+        evaluation record, so a retried or re-queued run continues from the
+        last checkpoint instead of starting over. Progress is written as
+        coalesced field-level updates. A failed attempt that will be retried
+        leaves the evaluation in progress; only the final one marks it failed.
+        
         Args:
             organization_id: Organization ID
             evaluation_id: Evaluation ID
             certification_types: List of certification types to evaluate
+            final_attempt: No retry follows if this attempt fails
         """
+        writer = ProgressWriter(COLLECTION_EVALUATIONS, evaluation_id)
+        progress = 0.0
+        heartbeat = None
+        
         try:
             logger.info(f"Starting evaluation process for: {evaluation_id}")
             
-            # Update status to in progress
-            evaluation_data = {
-                "id": evaluation_id,
-                "organization_id": organization_id,
-                "status": EvaluationStatus.IN_PROGRESS.value,
-                "progress": 0.0,
-                "certification_types": certification_types,
-                "certification_evaluations": []
+            # Resume from the checkpoints of an interrupted attempt
+            existing = await get_evaluation_results(organization_id, evaluation_id)
+            completed_certifications = {
+                e.get("certification_type"): e
+                for e in (existing or {}).get("certification_evaluations", [])
+                if e.get("certification_type") in certification_types
             }
+            completed_units = dict(((existing or {}).get("checkpoints") or {}).get("units") or {})
+            if completed_certifications or completed_units:
+                logger.info(
+                    f"Resuming evaluation {evaluation_id} with {len(completed_certifications)} certifications "
+                    f"and {len(completed_units)} requirement units checkpointed"
+                )
             
-            await save_evaluation_result(evaluation_data)
+            results: Dict[int, Dict[str, Any]] = {
+                index: completed_certifications[cert_type]
+                for index, cert_type in enumerate(certification_types)
+                if cert_type in completed_certifications
+            }
+            total_certifications = len(certification_types)
+            completed = len(results)
+            progress = (completed / total_certifications) * 100 if total_certifications else 0.0
+            
+            # Update status to in progress
+            writer.set(
+                status=EvaluationStatus.IN_PROGRESS.value,
+                progress=progress,
+                certification_evaluations=[results[i] for i in sorted(results)]
+            )
+            await writer.flush()
             
             # Track active evaluation
-            self.active_evaluations[evaluation_id] = {
-                "organization_id": organization_id,
-                "progress": 0.0,
-                "status": EvaluationStatus.IN_PROGRESS.value
+            await self._track(evaluation_id, organization_id, EvaluationStatus.IN_PROGRESS.value, progress)
+            
+            heartbeat = asyncio.ensure_future(send_heartbeats(writer.heartbeat))
+            
+            # Fingerprint the evaluated inputs so identical concurrent evaluations coalesce
+            organization, evidence_documents, previous_evaluation = await asyncio.gather(
+                get_organization_data(organization_id),
+                list_evidence_documents(organization_id),
+                get_latest_evaluation(organization_id)
+            )
+            evidence_fingerprint = compute_evidence_fingerprint(organization, evidence_documents)
+            
+            # Requirement results of the last completed evaluation are reused when their inputs match
+            previous_evaluations = {
+                e.get("certification_type"): e
+                for e in (previous_evaluation or {}).get("certification_evaluations", [])
             }
+            previous_evaluation_id = previous_evaluation.get("id") if previous_evaluation else None
             
-            # Process each certification type
-            total_certifications = len(certification_types)
-            certification_evaluations = []
+            async def checkpoint_units(unit_results: Dict[str, Dict[str, Any]]):
+                writer.set(checkpoints={"units": unit_results})
+            
+            # Evaluate the certifications together so shared controls are assessed once
+            remaining = [
+                (index, cert_type)
+                for index, cert_type in enumerate(certification_types)
+                if cert_type not in completed_certifications
+            ]
+            run = self.engine.start(
+                self.ai_model,
+                organization_id=organization_id,
+                certification_types=[cert_type for _, cert_type in remaining],
+                evidence_fingerprint=evidence_fingerprint,
+                organization_data=organization,
+                evidence_documents=evidence_documents,
+                previous=previous_evaluations,
+                max_concurrency=EVALUATION_MAX_CONCURRENCY * self.engine.max_concurrency,
+                completed_units=completed_units,
+                on_chunk_complete=checkpoint_units
+            )
             
-            for i, cert_type in enumerate(certification_types):
+            async def evaluate(index: int, cert_type: str):
                 try:
                     logger.info(f"Evaluating certification: {cert_type} for evaluation: {evaluation_id}")
+                    return index, await run.result(cert_type)
+                except Exception as e:
+                    logger.error(f"Error evaluating certification {cert_type}: {str(e)}", exc_info=True)
+                    # Failures stay isolated to this certification type
+                    return index, None
+            
+            tasks = [
+                asyncio.ensure_future(evaluate(index, cert_type))
+                for index, cert_type in remaining
+            ]
+            
+            try:
+                # Collect results as they complete
+                for next_completed in asyncio.as_completed(tasks):
+                    index, cert_evaluation = await next_completed
+                    completed += 1
                     
-                    # Generate evaluation for this certification type
-                    cert_evaluation = await self.ai_model.evaluate_certification(
-                        organization_id=organization_id,
-                        certification_type=cert_type
-                    )
-                    
-                    certification_evaluations.append(cert_evaluation)
-                    
-                    # Update progress
-                    progress = ((i + 1) / total_certifications) * 100
-                    self.active_evaluations[evaluation_id]["progress"] = progress
-                    
-                    # Update evaluation data
-                    evaluation_data = {
-                        "id": evaluation_id,
-                        "organization_id": organization_id,
-                        "status": EvaluationStatus.IN_PROGRESS.value,
-                        "progress": progress,
-                        "certification_types": certification_types,
-                        "certification_evaluations": certification_evaluations
-                    }
+                    if cert_evaluation is not None:
+                        results[index] = cert_evaluation
+                        writer.append("certification_evaluations", cert_evaluation)
                     
-                    await save_evaluation_result(evaluation_data)
+                    # Progress counts completions, whatever order they arrive in
+                    progress = (completed / total_certifications) * 100
+                    if cert_evaluation is not None:
+                        self.progress.publish(progress_topic(EVALUATION_STATE, evaluation_id), {
+                            "type": "certification",
+                            "certification_type": certification_types[index],
+                            "certification_evaluation": cert_evaluation,
+                            "progress": progress
+                        })
+                    await self._track(evaluation_id, organization_id, EvaluationStatus.IN_PROGRESS.value, progress)
                     
-                except Exception as e:
-                    logger.error(f"Error evaluating certification {cert_type}: {str(e)}", exc_info=True)
-                    # Continue with next certification type
+                    writer.set(progress=progress)
+            finally:
+                for task in tasks:
+                    task.cancel()
+                run.cancel()
             
-            # Update status to completed
+            heartbeat.cancel()
+            certification_evaluations = [results[i] for i in sorted(results)]
+            
+            # Update status to completed, with the results in the requested order;
+            # checkpoints are only needed until then
             evaluation_data = {
-                "id": evaluation_id,
-                "organization_id": organization_id,
                 "status": EvaluationStatus.COMPLETED.value,
                 "progress": 100.0,
-                "certification_types": certification_types,
                 "certification_evaluations": certification_evaluations,
+                "previous_evaluation_id": previous_evaluation_id,
                 "completed_at": None  # Will be set by Firestore
             }
             
-            await save_evaluation_result(evaluation_data)
+            await writer.finish(checkpoints=firestore.DELETE_FIELD, **evaluation_data)
+            
+            result = dict(
+                evaluation_data,
+                id=evaluation_id,
+                organization_id=organization_id,
+                certification_types=certification_types
+            )
             
             # Update tracking
-            self.active_evaluations[evaluation_id]["status"] = EvaluationStatus.COMPLETED.value
-            self.active_evaluations[evaluation_id]["progress"] = 100.0
+            await self._track(evaluation_id, organization_id, EvaluationStatus.COMPLETED.value, 100.0, result=result)
+            
+            # Prompts should see the new scores and weaknesses
+            try:
+                await self.org_context.rebuild(organization_id, evaluation=result)
+            except Exception as e:
+                logger.warning(f"Error rebuilding organization context for {organization_id}: {str(e)}")
             
-            logger.info(f"Completed evaluation: {evaluation_id}")
+            reused = sum(len(e.get("reused_requirements", [])) for e in certification_evaluations)
+            recomputed = sum(len(e.get("recomputed_requirements", [])) for e in certification_evaluations)
+            logger.info(
+                f"Completed evaluation: {evaluation_id} ({reused} requirements reused, {recomputed} recomputed, "
+                f"{run.stats['evaluated_units']} controls evaluated for {run.stats['requirements']} requirements, "
+                f"{run.stats['checkpointed_units']} resumed from checkpoints)"
+            )
             
         except Exception as e:
             logger.error(f"Error running evaluation: {str(e)}", exc_info=True)
             
-            # Update status to failed
+            if heartbeat is not None:
+                heartbeat.cancel()
+            
+            # Keep the checkpoints for a retry; only a final failure is terminal
             try:
-                evaluation_data = {
-                    "id": evaluation_id,
-                    "organization_id": organization_id,
-                    "status": EvaluationStatus.FAILED.value,
-                    "progress": self.active_evaluations.get(evaluation_id, {}).get("progress", 0.0),
-                    "certification_types": certification_types,
-                    "certification_evaluations": []
-                }
-                
-                await save_evaluation_result(evaluation_data)
-                
-                if evaluation_id in self.active_evaluations:
-                    self.active_evaluations[evaluation_id]["status"] = EvaluationStatus.FAILED.value
+                if final_attempt:
+                    await writer.finish(status=EvaluationStatus.FAILED.value)
+                    
+                    await self._track(
+                        evaluation_id,
+                        organization_id,
+                        EvaluationStatus.FAILED.value,
+                        progress,
+                        detail="Evaluation failed"
+                    )
+                else:
+                    await writer.finish()
+                    
+                    await self._track(
+                        evaluation_id,
+                        organization_id,
+                        EvaluationStatus.IN_PROGRESS.value,
+                        progress,
+                        retrying=True,
+                        detail="Evaluation attempt failed, retrying"
+                    )
             except Exception as inner_e:
                 logger.error(f"Error updating failed evaluation: {str(inner_e)}", exc_info=True)
+            
+            # Re-raise so the job queue retries the attempt
+            raise
+    
+    async def enqueue_evaluation(
+        self,
+        organization_id: str,
+        evaluation_id: str,
+        certification_types: List[str]
+    ) -> str:
+        """
+        Queue an evaluation for a worker
+        
+        Args:
+            organization_id: Organization ID
+            evaluation_id: Evaluation ID
+            certification_types: List of certification types to evaluate
+            
+        Returns:
+            Job ID
+        """
+        return await get_job_queue().enqueue(
+            EVALUATION_JOB,
+            {
+                "organization_id": organization_id,
+                "evaluation_id": evaluation_id,
+                "certification_types": certification_types
+            },
+            job_id=f"{EVALUATION_JOB}-{evaluation_id}"
+        )
+    
+    async def find_stalled_jobs(self, stall_seconds: float) -> List[Dict[str, Any]]:
+        """
+        Find evaluation jobs whose in-progress record stopped sending heartbeats
+        
+        Args:
+            stall_seconds: Heartbeat age after which a job counts as stalled
+            
+        Returns:
+            Stalled jobs (job_id, job_type, payload)
+        """
+        cutoff = time.time() - stall_seconds
+        return [
+            {
+                "job_id": f"{EVALUATION_JOB}-{evaluation['id']}",
+                "job_type": EVALUATION_JOB,
+                "payload": {
+                    "organization_id": evaluation["organization_id"],
+                    "evaluation_id": evaluation["id"],
+                    "certification_types": evaluation.get("certification_types", [])
+                }
+            }
+            for evaluation in await list_in_progress_records(COLLECTION_EVALUATIONS)
+            if (evaluation.get("heartbeat_at") or 0) < cutoff
+        ]
+    
+    async def fail_stalled_job(self, payload: Dict[str, Any], error: str):
+        """
+        Mark the evaluation of a job that was given up on as failed
+        
+        Args:
+            payload: Job payload
+            error: Why the job was given up on
+        """
+        evaluation = await get_evaluation_results(payload["organization_id"], payload["evaluation_id"])
+        if not evaluation or evaluation.get("status") != EvaluationStatus.IN_PROGRESS.value:
+            return
+        
+        logger.warning(f"Marking stalled evaluation {payload['evaluation_id']} as failed: {error}")
+        await update_record(COLLECTION_EVALUATIONS, payload["evaluation_id"], {"status": EvaluationStatus.FAILED.value})
+        await self._track(
+            payload["evaluation_id"],
+            payload["organization_id"],
+            EvaluationStatus.FAILED.value,
+            evaluation.get("progress", 0.0),
+            detail="Evaluation failed"
+        )
     
     async def get_evaluation_status(
         self,
@@ -193,9 +421,8 @@ class EvaluationService:
             logger.info(f"Getting status for evaluation: {evaluation_id}")
             
             # Check active evaluations first
-            if evaluation_id in self.active_evaluations:
-                active_eval = self.active_evaluations[evaluation_id]
-                
+            active_eval = await self.job_state.get(EVALUATION_STATE, evaluation_id)
+            if active_eval is not None:
                 if active_eval["organization_id"] != organization_id:
                     logger.warning(f"Organization ID mismatch for evaluation: {evaluation_id}")
                     return None
@@ -223,6 +450,37 @@ class EvaluationService:
             logger.error(f"Error getting evaluation status: {str(e)}", exc_info=True)
             raise
     
+    async def get_progress_event(
+        self,
+        organization_id: str,
+        evaluation_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the current state of an evaluation as a progress event
+        
+        Args:
+            organization_id: Organization ID
+            evaluation_id: Evaluation ID
+            
+        Returns:
+            Progress, completed (with the results) or failed event, or None if not found
+        """
+        status = await self.get_evaluation_status(organization_id, evaluation_id)
+        
+        if not status:
+            return None
+        
+        event = {
+            "type": progress_event_type(status.status),
+            "status": status.status,
+            "progress": status.progress
+        }
+        if status.status == EvaluationStatus.COMPLETED.value:
+            event["result"] = await self.get_evaluation_results(organization_id, evaluation_id)
+        elif status.status == EvaluationStatus.FAILED.value:
+            event["detail"] = "Evaluation failed"
+        return event
+    
     async def get_evaluation_results(
         self,
         organization_id: str,
@@ -0,0 +1,212 @@
+import logging
+import os
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Mark the stable prompt prefix as cacheable where the provider needs it marked
+AI_PROMPT_CACHE_ENABLED = os.getenv("AI_PROMPT_CACHE_ENABLED", "true").lower() == "true"
+
+# Models without provider-side prompt caching
+PROMPT_CACHE_UNSUPPORTED_MODELS = ("claude-2", "claude-instant")
+
+# System prompt of chat responses
+CHAT_SYSTEM_PROMPT = "You are a helpful assistant for evaluating certification readiness."
+
+def chat_prompt_layout(context: Optional[str] = None, summary: Optional[str] = None) -> Dict[str, Optional[str]]:
+    """
+    Split the chat system prompt into a stable prefix and a variable suffix
+
+    Providers cache prompts by prefix, so everything that stays the same
+    across turns (instructions, organization context) comes first and what
+    changes every few turns (the summary) after it.
+
+    Args:
+        context: Background that rarely changes
+        summary: Summary of older turns
+
+    Returns:
+        Dictionary with prefix and suffix (None if there is no summary)
+    """
+    prefix = f"{CHAT_SYSTEM_PROMPT}\n\n{context}" if context else CHAT_SYSTEM_PROMPT
+    return {"prefix": prefix, "suffix": summary or None}
+
+def chat_messages(message: str, history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+    """
+    Build the chat message list sent to providers
+
+    Args:
+        message: User message
+        history: Earlier messages, oldest first
+
+    Returns:
+        Messages with role and content, ending with the user message
+    """
+    return [{"role": m["role"], "content": m["content"]} for m in history or []] + [
+        {"role": "user", "content": message}
+    ]
+
+def openai_chat_messages(
+    message: str,
+    history: Optional[List[Dict[str, str]]] = None,
+    context: Optional[str] = None,
+    summary: Optional[str] = None
+) -> List[Dict[str, str]]:
+    """
+    Build OpenAI chat messages, stable prefix first
+
+    OpenAI caches long prompt prefixes automatically; the layout only has
+    to keep the prefix identical between calls.
+
+    Args:
+        message: User message
+        history: Earlier messages, oldest first
+        context: Background that rarely changes
+        summary: Summary of older turns
+
+    Returns:
+        Messages with role and content
+    """
+    layout = chat_prompt_layout(context, summary)
+    messages = [{"role": "system", "content": layout["prefix"]}]
+    if layout["suffix"]:
+        messages.append({"role": "system", "content": layout["suffix"]})
+    return messages + chat_messages(message, history)
+
+def anthropic_system_blocks(model: str, context: Optional[str] = None, summary: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Build Anthropic system content blocks with the stable prefix marked cacheable
+
+    Args:
+        model: Anthropic model name
+        context: Background that rarely changes
+        summary: Summary of older turns
+
+    Returns:
+        System content blocks
+    """
+    layout = chat_prompt_layout(context, summary)
+    prefix: Dict[str, Any] = {"type": "text", "text": layout["prefix"]}
+    if AI_PROMPT_CACHE_ENABLED and not model.startswith(PROMPT_CACHE_UNSUPPORTED_MODELS):
+        prefix["cache_control"] = {"type": "ephemeral"}
+
+    blocks = [prefix]
+    if layout["suffix"]:
+        blocks.append({"type": "text", "text": layout["suffix"]})
+    return blocks
+
+def chat_transcript(
+    message: str,
+    history: Optional[List[Dict[str, str]]] = None,
+    context: Optional[str] = None,
+    summary: Optional[str] = None
+) -> str:
+    """
+    Render a chat as a single prompt for completion-style models
+
+    Args:
+        message: User message
+        history: Earlier messages, oldest first
+        context: Background that rarely changes
+        summary: Summary of older turns
+
+    Returns:
+        Prompt text ending with the assistant's turn
+    """
+    layout = chat_prompt_layout(context, summary)
+    lines = [layout["prefix"], ""]
+    if layout["suffix"]:
+        lines += [layout["suffix"], ""]
+    for m in chat_messages(message, history):
+        lines.append(f"{'User' if m['role'] == 'user' else 'Assistant'}: {m['content']}")
+    lines.append("Assistant:")
+    return "\n".join(lines)
+
+def _field(obj: Any, name: str) -> Any:
+    # SDK versions differ in whether usage details are models or plain dictionaries
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
+
+class PromptCacheStats:
+    """
+    Input tokens per provider and method, split by whether the provider
+    served them from its prompt cache
+    """
+
+    def __init__(self):
+        """
+        Initialize counters
+        """
+        self._counters: Dict[str, Dict[str, Dict[str, int]]] = {}
+
+    def record(self, provider: str, method: str, uncached_tokens: int, cached_tokens: int, cache_write_tokens: int = 0):
+        """
+        Record the input tokens of one call
+
+        Args:
+            provider: Provider name
+            method: Logical method name (chat, evaluation, document)
+            uncached_tokens: Input tokens processed in full
+            cached_tokens: Input tokens read from the prompt cache
+            cache_write_tokens: Input tokens written to the prompt cache
+        """
+        counters = self._counters.setdefault(provider, {}).setdefault(
+            method, {"calls": 0, "uncached_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0}
+        )
+        counters["calls"] += 1
+        counters["uncached_tokens"] += uncached_tokens
+        counters["cached_tokens"] += cached_tokens
+        counters["cache_write_tokens"] += cache_write_tokens
+        logger.info(
+            f"{provider} {method} input tokens: {cached_tokens} cached, "
+            f"{uncached_tokens + cache_write_tokens} uncached"
+        )
+
+    def record_openai(self, method: str, usage: Any):
+        """
+        Record OpenAI usage (prompt_tokens includes the cached ones)
+
+        Args:
+            method: Logical method name
+            usage: Usage of the response
+        """
+        if usage is None:
+            return
+        cached = _field(_field(usage, "prompt_tokens_details") or {}, "cached_tokens") or 0
+        self.record("openai", method, (_field(usage, "prompt_tokens") or 0) - cached, cached)
+
+    def record_anthropic(self, method: str, usage: Any):
+        """
+        Record Anthropic usage (input_tokens excludes cache reads and writes)
+
+        Args:
+            method: Logical method name
+            usage: Usage of the message
+        """
+        if usage is None:
+            return
+        self.record(
+            "anthropic",
+            method,
+            _field(usage, "input_tokens") or 0,
+            _field(usage, "cache_read_input_tokens") or 0,
+            _field(usage, "cache_creation_input_tokens") or 0
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Prompt cache statistics
+
+        Returns:
+            Counters and cached share of input tokens per provider and method
+        """
+        result: Dict[str, Any] = {}
+        for provider, methods in self._counters.items():
+            result[provider] = {}
+            for method, counters in methods.items():
+                total = counters["uncached_tokens"] + counters["cached_tokens"] + counters["cache_write_tokens"]
+                result[provider][method] = dict(counters, cached_ratio=(counters["cached_tokens"] / total) if total else 0.0)
+        return result
+
+prompt_cache_stats = PromptCacheStats()
@@ -0,0 +1,362 @@
+import logging
+import os
+import time
+import random
+import asyncio
+from typing import Dict, Any, Optional, List, Callable, Awaitable, AsyncIterator
+from app.services.ai.model_factory import BaseAIModel, DelegatingAIModel
+
+logger = logging.getLogger(__name__)
+
+# Governor defaults (override per provider with e.g. AI_RATE_LIMIT_RPS_OPENAI)
+AI_RATE_LIMIT_ENABLED = os.getenv("AI_RATE_LIMIT_ENABLED", "true").lower() == "true"
+AI_RATE_LIMIT_RPS = float(os.getenv("AI_RATE_LIMIT_RPS", "5"))
+AI_RATE_LIMIT_MAX_RPS = float(os.getenv("AI_RATE_LIMIT_MAX_RPS", "50"))
+AI_RATE_LIMIT_BURST = float(os.getenv("AI_RATE_LIMIT_BURST", "10"))
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", "16"))
+AI_MIN_CONCURRENCY = int(os.getenv("AI_MIN_CONCURRENCY", "1"))
+AI_TARGET_LATENCY = float(os.getenv("AI_TARGET_LATENCY", "30"))
+AI_RATE_LIMIT_MAX_RETRIES = int(os.getenv("AI_RATE_LIMIT_MAX_RETRIES", "6"))
+
+def is_rate_limited(error: Exception) -> bool:
+    """
+    Check whether a provider error is a rate limit (HTTP 429) response
+
+    Args:
+        error: Exception raised by a provider SDK
+
+    Returns:
+        True for rate limit errors from any supported provider
+    """
+    if getattr(error, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    name = type(error).__name__
+    return "RateLimit" in name or name == "ResourceExhausted"
+
+def retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the Retry-After hint from a provider error, if any
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket plus concurrency limit for one provider, tuned with AIMD
+
+    Successful calls within the target latency additively raise the request
+    rate and concurrency limit; rate limit responses halve both. Callers
+    over the limits wait in line instead of failing.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        rate: float = AI_RATE_LIMIT_RPS,
+        max_rate: float = AI_RATE_LIMIT_MAX_RPS,
+        burst: float = AI_RATE_LIMIT_BURST,
+        max_concurrency: int = AI_MAX_CONCURRENCY,
+        min_concurrency: int = AI_MIN_CONCURRENCY,
+        target_latency: float = AI_TARGET_LATENCY
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            provider: Provider name
+            rate: Initial requests per second
+            max_rate: Upper bound for the request rate
+            burst: Token bucket capacity
+            max_concurrency: Upper bound for concurrent calls
+            min_concurrency: Lower bound for concurrent calls
+            target_latency: Latency in seconds above which limits stop growing
+        """
+        self.provider = provider
+        self.rate = rate
+        self.min_rate = min(rate, 0.1)
+        self.max_rate = max(max_rate, rate)
+        self.burst = burst
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency_limit = float(max_concurrency)
+        self.target_latency = target_latency
+
+        self._tokens = burst
+        self._refilled_at = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased_at = 0.0
+        self._condition: Optional[asyncio.Condition] = None
+
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.acquired = 0
+        self.throttled = 0
+        self.retries = 0
+
+    def _get_condition(self) -> asyncio.Condition:
+        # Created lazily so the limiter can be built outside the event loop
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    async def acquire(self):
+        """
+        Wait for a concurrency slot and a rate token
+        """
+        started_at = time.monotonic()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        condition = self._get_condition()
+
+        try:
+            async with condition:
+                await condition.wait_for(lambda: self.in_flight < max(1, int(self.concurrency_limit)))
+                self.in_flight += 1
+
+            try:
+                while True:
+                    pause = self._paused_until - time.monotonic()
+                    if pause > 0:
+                        await asyncio.sleep(pause)
+                        continue
+
+                    self._refill()
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    await asyncio.sleep((1 - self._tokens) / self.rate)
+            except BaseException:
+                await self._release_slot()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        waited = time.monotonic() - started_at
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    async def _release_slot(self):
+        condition = self._get_condition()
+        async with condition:
+            self.in_flight -= 1
+            condition.notify_all()
+
+    async def release(self, latency: Optional[float] = None, throttled: bool = False, hint: Optional[float] = None):
+        """
+        Return a slot and adapt the limits to the call outcome
+
+        Args:
+            latency: Call duration in seconds (None if the call failed otherwise)
+            throttled: Whether the provider answered with a rate limit error
+            hint: Provider Retry-After hint in seconds
+        """
+        if throttled:
+            self.throttled += 1
+            now = time.monotonic()
+            # Concurrent calls rejected together count as one decrease
+            if now - self._decreased_at >= 1.0:
+                self._decreased_at = now
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+            self._tokens = 0
+            if hint:
+                self._paused_until = max(self._paused_until, time.monotonic() + hint)
+            logger.warning(
+                f"Rate limited by {self.provider}: rate={self.rate:.2f}/s, "
+                f"concurrency={int(self.concurrency_limit)}"
+            )
+        elif latency is not None and latency <= self.target_latency:
+            self.rate = min(self.max_rate, self.rate + 0.1)
+            self.concurrency_limit = min(
+                self.max_concurrency, self.concurrency_limit + 1 / max(1.0, self.concurrency_limit)
+            )
+
+        await self._release_slot()
+
+    async def run(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a provider call under the limits, retrying rate limited calls
+
+        Args:
+            func: Coroutine function performing the call
+
+        Returns:
+            Result of the call
+        """
+        for attempt in range(AI_RATE_LIMIT_MAX_RETRIES + 1):
+            await self.acquire()
+            started_at = time.monotonic()
+            try:
+                result = await func()
+            except Exception as e:
+                if not is_rate_limited(e) or attempt == AI_RATE_LIMIT_MAX_RETRIES:
+                    await self.release()
+                    raise
+                hint = retry_after(e)
+                await self.release(throttled=True, hint=hint)
+                self.retries += 1
+                # Back off with jitter before queueing again
+                await asyncio.sleep(hint or min(30.0, (2 ** attempt) * 0.5 * (1 + random.random())))
+                continue
+            except BaseException:
+                await self.release()
+                raise
+
+            await self.release(latency=time.monotonic() - started_at)
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Limiter statistics
+
+        Returns:
+            Current limits, queue depth and wait times
+        """
+        return {
+            "provider": self.provider,
+            "rate": self.rate,
+            "concurrency_limit": int(self.concurrency_limit),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_wait": (self.total_wait / self.acquired) if self.acquired else 0.0,
+            "max_wait": self.max_wait,
+            "throttled": self.throttled,
+            "retries": self.retries
+        }
+
+class GovernedAIModel(DelegatingAIModel):
+    """
+    Model wrapper that sends every provider call through a rate limiter
+    """
+
+    def __init__(self, inner: BaseAIModel, limiter: AdaptiveRateLimiter):
+        """
+        Initialize governed model
+
+        Args:
+            inner: Wrapped provider model
+            limiter: Limiter for the provider
+        """
+        super().__init__(inner)
+        self.limiter = limiter
+
+    async def generate_chat_response(
+        self,
+        message: str,
+        organization_id: str,
+        session_id: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        context: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> str:
+        return await self.limiter.run(lambda: self.inner.generate_chat_response(
+            message=message,
+            organization_id=organization_id,
+            session_id=session_id,
+            history=history,
+            context=context,
+            summary=summary
+        ))
+
+    async def stream_chat_response(
+        self,
+        message: str,
+        organization_id: str,
+        session_id: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        context: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream under the limits, holding the slot until the stream ends
+
+        Rate limited streams are retried only while nothing has been sent.
+        """
+        for attempt in range(AI_RATE_LIMIT_MAX_RETRIES + 1):
+            await self.limiter.acquire()
+            started_at = time.monotonic()
+            sent = False
+            try:
+                async for delta in self.inner.stream_chat_response(
+                    message=message,
+                    organization_id=organization_id,
+                    session_id=session_id,
+                    history=history,
+                    context=context,
+                    summary=summary
+                ):
+                    sent = True
+                    yield delta
+            except Exception as e:
+                if sent or not is_rate_limited(e) or attempt == AI_RATE_LIMIT_MAX_RETRIES:
+                    await self.limiter.release()
+                    raise
+                hint = retry_after(e)
+                await self.limiter.release(throttled=True, hint=hint)
+                self.limiter.retries += 1
+                await asyncio.sleep(hint or min(30.0, (2 ** attempt) * 0.5 * (1 + random.random())))
+                continue
+            except BaseException:
+                await self.limiter.release()
+                raise
+
+            await self.limiter.release(latency=time.monotonic() - started_at)
+            return
+
+    async def evaluate_certification(
+        self,
+        organization_id: str,
+        certification_type: str,
+        evidence_fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self.limiter.run(lambda: self.inner.evaluate_certification(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            evidence_fingerprint=evidence_fingerprint
+        ))
+
+    async def evaluate_requirements(
+        self,
+        organization_id: str,
+        certification_type: str,
+        requirements: List[Dict[str, Any]],
+        evidence_fingerprint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await self.limiter.run(lambda: self.inner.evaluate_requirements(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            requirements=requirements,
+            evidence_fingerprint=evidence_fingerprint
+        ))
+
+    async def generate_document(
+        self,
+        organization_id: str,
+        evaluation_id: str,
+        document_type: str,
+        evaluation_data: Dict[str, Any],
+        organization_context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        return await self.limiter.run(lambda: self.inner.generate_document(
+            organization_id=organization_id,
+            evaluation_id=evaluation_id,
+            document_type=document_type,
+            evaluation_data=evaluation_data,
+            organization_context=organization_context
+        ))
@@ -0,0 +1,448 @@
+import logging
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, List, Tuple, AsyncIterator
+from app.services.cache import TTLCache
+from app.services.ai.model_factory import BaseAIModel, DelegatingAIModel
+
+logger = logging.getLogger(__name__)
+
+# Cache configuration
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+AI_CACHE_MAX_ENTRIES = int(os.getenv("AI_CACHE_MAX_ENTRIES", "1000"))
+AI_CACHE_SQLITE_PATH = os.getenv("AI_CACHE_SQLITE_PATH", "")
+AI_CACHE_DISK_MAX_ENTRIES = int(os.getenv("AI_CACHE_DISK_MAX_ENTRIES", "50000"))
+
+# Time to live in seconds per cached method
+AI_CACHE_TTLS = {
+    "chat": float(os.getenv("AI_CACHE_TTL_CHAT", "3600")),
+    "evaluation": float(os.getenv("AI_CACHE_TTL_EVALUATION", "86400")),
+    "document": float(os.getenv("AI_CACHE_TTL_DOCUMENT", "86400"))
+}
+
+# Evaluation fields that change between runs without changing the content
+VOLATILE_EVALUATION_FIELDS = {"id", "status", "progress", "created_at", "updated_at", "completed_at"}
+
+def _normalise(value: Any) -> Any:
+    """
+    Normalise a value so equivalent requests produce the same key
+
+    Strings are stripped at the ends only, since whitespace inside a prompt
+    (code blocks, indented lists, line breaks) can change the answer;
+    dictionaries are key-sorted by the JSON encoder.
+    """
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {str(k): _normalise(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalise(v) for v in value]
+    return value
+
+def make_cache_key(provider: str, model: str, method: str, params: Dict[str, Any]) -> str:
+    """
+    Build a content-addressed key for a model call
+
+    Args:
+        provider: Provider name
+        model: Model name
+        method: Logical method name (chat, evaluation, document)
+        params: Parameters that determine the response
+
+    Returns:
+        SHA-256 hex digest of the normalised request
+    """
+    payload = json.dumps(
+        {"provider": provider, "model": model, "method": method, "params": _normalise(params)},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SQLiteCacheTier:
+    """
+    On-disk cache tier that survives restarts
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        """
+        Initialize the disk tier
+
+        Args:
+            path: SQLite database path
+            max_entries: Maximum number of rows kept
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, method TEXT, value TEXT, expires_at REAL, accessed_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Tuple[bool, Any, float]:
+        """
+        Read an entry
+
+        Returns:
+            Tuple of (found, value, remaining TTL in seconds)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None, 0.0
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                return False, None, 0.0
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+        return True, json.loads(row[0]), row[1] - now
+
+    def set(self, key: str, method: str, value: Any, ttl: float):
+        """
+        Write an entry, pruning expired and least recently used rows periodically
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, method, value, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, method, json.dumps(value), now + ttl, now)
+            )
+            self._writes += 1
+            if self._writes % 100 == 0:
+                self._conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+            self._conn.commit()
+
+    def close(self):
+        """
+        Close the database connection
+        """
+        with self._lock:
+            self._conn.close()
+
+class ResponseCache:
+    """
+    Two-tier LLM response cache with per-method TTLs and hit/miss metrics
+    """
+
+    def __init__(
+        self,
+        max_entries: int = AI_CACHE_MAX_ENTRIES,
+        sqlite_path: Optional[str] = AI_CACHE_SQLITE_PATH,
+        ttls: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the response cache
+
+        Args:
+            max_entries: Size bound of the in-memory tier
+            sqlite_path: Path of the on-disk tier (empty to disable)
+            ttls: Time to live in seconds per method
+        """
+        self.memory = TTLCache(max_entries)
+        self.disk = SQLiteCacheTier(sqlite_path, AI_CACHE_DISK_MAX_ENTRIES) if sqlite_path else None
+        self.ttls = ttls or AI_CACHE_TTLS
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, method: str, counter: str):
+        counters = self.metrics.setdefault(
+            method, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        )
+        counters[counter] += 1
+
+    async def get(self, method: str, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a response in memory, then on disk
+
+        Args:
+            method: Logical method name
+            key: Cache key
+
+        Returns:
+            Tuple of (found, value)
+        """
+        found, value = self.memory.lookup(key)
+        if found:
+            self._count(method, "memory_hits")
+            return True, value
+
+        if self.disk is not None:
+            try:
+                found, value, remaining = await asyncio.to_thread(self.disk.get, key)
+                if found:
+                    # Promote to memory for the rest of its lifetime
+                    self.memory.set(key, value, ttl=remaining)
+                    self._count(method, "disk_hits")
+                    return True, value
+            except Exception as e:
+                logger.warning(f"Error reading response cache from disk: {str(e)}")
+
+        self._count(method, "misses")
+        return False, None
+
+    async def set(self, method: str, key: str, value: Any):
+        """
+        Store a response in both tiers
+
+        Args:
+            method: Logical method name
+            key: Cache key
+            value: JSON-serializable response
+        """
+        ttl = self.ttls.get(method, 0)
+        if ttl <= 0:
+            return
+
+        self.memory.set(key, value, ttl=ttl)
+        self._count(method, "stores")
+
+        if self.disk is not None:
+            try:
+                await asyncio.to_thread(self.disk.set, key, method, value, ttl)
+            except Exception as e:
+                logger.warning(f"Error writing response cache to disk: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Cache statistics
+
+        Returns:
+            Memory tier statistics and per-method hit/miss counters
+        """
+        methods = {}
+        for method, counters in self.metrics.items():
+            hits = counters["memory_hits"] + counters["disk_hits"]
+            lookups = hits + counters["misses"]
+            methods[method] = dict(counters, hit_rate=(hits / lookups) if lookups else 0.0)
+
+        return {
+            "memory": self.memory.stats(),
+            "disk_enabled": self.disk is not None,
+            "methods": methods
+        }
+
+    def close(self):
+        """
+        Close the disk tier
+        """
+        if self.disk is not None:
+            self.disk.close()
+
+class CachedAIModel(DelegatingAIModel):
+    """
+    Model wrapper that serves repeated requests from the response cache
+    """
+
+    def __init__(self, inner: BaseAIModel, cache: ResponseCache):
+        """
+        Initialize cached model
+
+        Args:
+            inner: Wrapped model
+            cache: Shared response cache
+        """
+        super().__init__(inner)
+        self.cache = cache
+
+    def _key(self, method: str, params: Dict[str, Any]) -> str:
+        return make_cache_key(self.provider, self.model_name, method, params)
+
+    async def generate_chat_response(
+        self,
+        message: str,
+        organization_id: str,
+        session_id: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        context: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> str:
+        """
+        Generate a chat response, reusing a cached answer to the same question
+
+        Organization and session IDs are not part of the key: the prompt
+        (message, history, context and summary) is the only input the provider sees,
+        so identical conversations share answers.
+        """
+        key = self._key("chat", {"message": message, "history": history or [], "context": context, "summary": summary})
+        found, value = await self.cache.get("chat", key)
+        if found:
+            return value
+
+        response_text = await self.inner.generate_chat_response(
+            message=message,
+            organization_id=organization_id,
+            session_id=session_id,
+            history=history,
+            context=context,
+            summary=summary
+        )
+        await self.cache.set("chat", key, response_text)
+        return response_text
+
+    async def stream_chat_response(
+        self,
+        message: str,
+        organization_id: str,
+        session_id: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        context: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat response, replaying a cached answer as a single delta
+        """
+        key = self._key("chat", {"message": message, "history": history or [], "context": context, "summary": summary})
+        found, value = await self.cache.get("chat", key)
+        if found:
+            yield value
+            return
+
+        chunks = []
+        async for delta in self.inner.stream_chat_response(
+            message=message,
+            organization_id=organization_id,
+            session_id=session_id,
+            history=history,
+            context=context,
+            summary=summary
+        ):
+            chunks.append(delta)
+            yield delta
+
+        await self.cache.set("chat", key, "".join(chunks))
+
+    async def evaluate_certification(
+        self,
+        organization_id: str,
+        certification_type: str,
+        evidence_fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate certification readiness, reusing a cached evaluation
+
+        Only evaluations keyed by the fingerprint of the organization profile
+        and evidence are cached; without one an edit could not invalidate them.
+        """
+        if evidence_fingerprint is None:
+            return await self.inner.evaluate_certification(
+                organization_id=organization_id,
+                certification_type=certification_type
+            )
+
+        key = self._key("evaluation", {
+            "organization_id": organization_id,
+            "certification_type": certification_type,
+            "evidence_fingerprint": evidence_fingerprint
+        })
+        found, value = await self.cache.get("evaluation", key)
+        if found:
+            return value
+
+        evaluation = await self.inner.evaluate_certification(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            evidence_fingerprint=evidence_fingerprint
+        )
+        await self.cache.set("evaluation", key, evaluation)
+        return evaluation
+
+    async def evaluate_requirements(
+        self,
+        organization_id: str,
+        certification_type: str,
+        requirements: List[Dict[str, Any]],
+        evidence_fingerprint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate a batch of requirements, reusing cached chunk results
+
+        Chunks share the evaluation TTL and metrics, and like evaluations are
+        only cached with an evidence fingerprint.
+        """
+        if evidence_fingerprint is None:
+            return await self.inner.evaluate_requirements(
+                organization_id=organization_id,
+                certification_type=certification_type,
+                requirements=requirements
+            )
+
+        key = self._key("requirements", {
+            "organization_id": organization_id,
+            "certification_type": certification_type,
+            "requirement_ids": [requirement["id"] for requirement in requirements],
+            "evidence_fingerprint": evidence_fingerprint
+        })
+        found, value = await self.cache.get("evaluation", key)
+        if found:
+            return value
+
+        evaluations = await self.inner.evaluate_requirements(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            requirements=requirements,
+            evidence_fingerprint=evidence_fingerprint
+        )
+        await self.cache.set("evaluation", key, evaluations)
+        return evaluations
+
+    async def generate_document(
+        self,
+        organization_id: str,
+        evaluation_id: str,
+        document_type: str,
+        evaluation_data: Dict[str, Any],
+        organization_context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Generate a compliance document, reusing a cached document
+
+        The key covers the evaluation content rather than its ID, so the same
+        document type for unchanged results is generated once.
+        """
+        evaluation_content = {
+            k: v for k, v in (evaluation_data or {}).items()
+            if k not in VOLATILE_EVALUATION_FIELDS
+        }
+        key = self._key("document", {
+            "organization_id": organization_id,
+            "document_type": document_type,
+            "evaluation": evaluation_content,
+            "organization_context": (organization_context or {}).get("text")
+        })
+        found, value = await self.cache.get("document", key)
+        if found:
+            return value
+
+        document_content = await self.inner.generate_document(
+            organization_id=organization_id,
+            evaluation_id=evaluation_id,
+            document_type=document_type,
+            evaluation_data=evaluation_data,
+            organization_context=organization_context
+        )
+        await self.cache.set("document", key, document_content)
+        return document_content
@@ -0,0 +1,408 @@
+import logging
+import os
+import time
+import asyncio
+from collections import deque
+from typing import Dict, Any, Optional, List, Tuple, Callable, Awaitable, AsyncIterator
+from app.services.ai.model_factory import BaseAIModel
+
+logger = logging.getLogger(__name__)
+
+# Providers the router spreads calls across (empty disables routing)
+AI_ROUTER_PROVIDERS = [p.strip().lower() for p in os.getenv("AI_ROUTER_PROVIDERS", "").split(",") if p.strip()]
+
+# Rolling window of calls used for latency percentiles and error rates
+AI_ROUTER_WINDOW = int(os.getenv("AI_ROUTER_WINDOW", "100"))
+
+# Consecutive failures after which a backend is skipped for AI_ROUTER_COOLDOWN seconds
+AI_ROUTER_FAILURE_THRESHOLD = int(os.getenv("AI_ROUTER_FAILURE_THRESHOLD", "3"))
+AI_ROUTER_COOLDOWN = float(os.getenv("AI_ROUTER_COOLDOWN", "30"))
+
+# Hedge delay used until a backend has enough samples for a p95
+AI_ROUTER_HEDGE_DEFAULT_DELAY = float(os.getenv("AI_ROUTER_HEDGE_DEFAULT_DELAY", "2.0"))
+AI_ROUTER_HEDGE_MIN_SAMPLES = int(os.getenv("AI_ROUTER_HEDGE_MIN_SAMPLES", "20"))
+
+# Routed methods and their default policies (hedging pays for duplicate
+# requests, so it is opt-in per method)
+ROUTED_METHODS = {
+    "chat": {"strategy": "latency", "hedge": "false"},
+    "evaluation": {"strategy": "latency", "hedge": "false"},
+    "document": {"strategy": "latency", "hedge": "false"}
+}
+
+# Health window of streamed chat, which measures time to first token rather
+# than full completions and so is kept apart from non-streamed chat
+CHAT_STREAM_WINDOW = "chat_stream"
+
+class RoutePolicy:
+    """
+    Routing policy for one method
+    """
+
+    def __init__(self, method: str):
+        """
+        Load the policy for a method from the environment
+
+        Args:
+            method: Logical method name (chat, evaluation, document)
+        """
+        defaults = ROUTED_METHODS[method]
+        suffix = method.upper()
+        self.method = method
+        # "latency" ranks backends by health; "priority" keeps the configured order
+        self.strategy = os.getenv(f"AI_ROUTER_STRATEGY_{suffix}", defaults["strategy"]).lower()
+        self.hedge = os.getenv(f"AI_ROUTER_HEDGE_{suffix}", defaults["hedge"]).lower() == "true"
+        providers = os.getenv(f"AI_ROUTER_PROVIDERS_{suffix}", "")
+        self.providers = [p.strip().lower() for p in providers.split(",") if p.strip()] or None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"strategy": self.strategy, "hedge": self.hedge, "providers": self.providers}
+
+class BackendHealth:
+    """
+    Rolling latency and error statistics for one backend and method
+    """
+
+    def __init__(self, window: int = AI_ROUTER_WINDOW):
+        self.latencies: deque = deque(maxlen=window)
+        self.outcomes: deque = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.cooldown_until = 0.0
+        self.calls = 0
+        self.failures = 0
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        self.outcomes.append(True)
+        self.consecutive_failures = 0
+        self.calls += 1
+
+    def record_failure(self):
+        self.outcomes.append(False)
+        self.consecutive_failures += 1
+        self.calls += 1
+        self.failures += 1
+        if self.consecutive_failures >= AI_ROUTER_FAILURE_THRESHOLD:
+            self.cooldown_until = time.monotonic() + AI_ROUTER_COOLDOWN
+
+    def percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    def score(self) -> Tuple[float, float]:
+        """
+        Lower is healthier: error rate (to the nearest 10%), then median latency
+
+        Backends without calls score lowest so they get tried; backends that
+        have only failed have no latency and rank behind every backend that
+        has succeeded at the same error rate.
+        """
+        if not self.outcomes:
+            return (0.0, 0.0)
+        median = self.percentile(50)
+        return (round(self.error_rate, 1), median if median is not None else float("inf"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "error_rate": self.error_rate,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "available": self.available
+        }
+
+class RoutingAIModel(BaseAIModel):
+    """
+    Model that routes each call to the healthiest of several provider backends
+
+    Calls fall back to the next backend on errors; methods with hedging
+    enabled send a duplicate request to the runner-up when the first backend
+    has not answered within its p95 latency.
+    """
+
+    provider = "router"
+
+    def __init__(self, backends: List[BaseAIModel]):
+        """
+        Initialize routing model
+
+        Args:
+            backends: Provider models to route across, in priority order
+        """
+        if not backends:
+            raise ValueError("Routing model needs at least one backend")
+
+        self.backends = backends
+        self.policies = {method: RoutePolicy(method) for method in ROUTED_METHODS}
+        self.health: Dict[str, Dict[str, BackendHealth]] = {
+            window: {backend.provider: BackendHealth() for backend in backends}
+            for window in list(ROUTED_METHODS) + [CHAT_STREAM_WINDOW]
+        }
+        self.metrics: Dict[str, Dict[str, int]] = {
+            method: {"hedges": 0, "hedge_wins": 0, "fallbacks": 0} for method in ROUTED_METHODS
+        }
+        logger.info(f"Initialized routing model over: {', '.join(b.provider for b in backends)}")
+
+    @property
+    def model_name(self) -> str:
+        return "+".join(f"{b.provider}:{b.model_name}" for b in self.backends)
+
+    def _rank(self, method: str, window: Optional[str] = None) -> List[BaseAIModel]:
+        """
+        Order backends for a call according to the method's policy
+
+        Backends in cooldown go last rather than being dropped, so a call
+        still has somewhere to go if every backend is unhealthy.
+
+        Args:
+            method: Logical method name, selecting the policy
+            window: Health window to rank by (defaults to the method's)
+        """
+        policy = self.policies[method]
+        backends = self.backends
+        if policy.providers:
+            order = {provider: index for index, provider in enumerate(policy.providers)}
+            backends = [b for b in backends if b.provider in order] or self.backends
+            backends = sorted(backends, key=lambda b: order.get(b.provider, len(order)))
+
+        health = self.health[window or method]
+        if policy.strategy == "latency":
+            backends = sorted(backends, key=lambda b: health[b.provider].score())
+
+        return sorted(backends, key=lambda b: not health[b.provider].available)
+
+    def _hedge_delay(self, method: str, backend: BaseAIModel) -> float:
+        health = self.health[method][backend.provider]
+        if len(health.latencies) < AI_ROUTER_HEDGE_MIN_SAMPLES:
+            return AI_ROUTER_HEDGE_DEFAULT_DELAY
+        return health.percentile(95)
+
+    async def _timed(self, method: str, backend: BaseAIModel, func: Callable[[BaseAIModel], Awaitable[Any]]) -> Any:
+        """
+        Run a call on one backend and record its outcome
+        """
+        started_at = time.monotonic()
+        try:
+            result = await func(backend)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.health[method][backend.provider].record_failure()
+            logger.warning(f"Backend {backend.provider} failed {method} call: {str(e)}")
+            raise
+        self.health[method][backend.provider].record_success(time.monotonic() - started_at)
+        return result
+
+    async def _call(self, method: str, func: Callable[[BaseAIModel], Awaitable[Any]]) -> Any:
+        """
+        Route a call with fallback and, if enabled, hedging
+
+        Args:
+            method: Logical method name
+            func: Coroutine function that performs the call on a backend
+
+        Returns:
+            Result from the first backend to succeed
+        """
+        remaining = self._rank(method)
+        hedge = self.policies[method].hedge and len(remaining) > 1
+        pending: Dict[asyncio.Future, BaseAIModel] = {}
+        primary: Optional[asyncio.Future] = None
+        hedged = False
+        last_error: Optional[Exception] = None
+
+        def launch() -> asyncio.Future:
+            backend = remaining.pop(0)
+            task = asyncio.ensure_future(self._timed(method, backend, func))
+            pending[task] = backend
+            return task
+
+        primary = launch()
+        try:
+            while pending:
+                timeout = None
+                if hedge and not hedged and remaining:
+                    timeout = self._hedge_delay(method, next(iter(pending.values())))
+
+                done, _ = await asyncio.wait(list(pending), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # The first backend is slower than usual: race a duplicate
+                    hedged = True
+                    self.metrics[method]["hedges"] += 1
+                    launch()
+                    continue
+
+                for task in done:
+                    pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        last_error = e
+                        continue
+                    if hedged and task is not primary:
+                        self.metrics[method]["hedge_wins"] += 1
+                    return result
+
+                # Every finished call failed: fall back to the next backend
+                if not pending and remaining:
+                    self.metrics[method]["fallbacks"] += 1
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error or RuntimeError(f"No backend available for {method}")
+
+    async def generate_chat_response(
+        self,
+        message: str,
+        organization_id: str,
+        session_id: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        context: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> str:
+        return await self._call("chat", lambda backend: backend.generate_chat_response(
+            message=message,
+            organization_id=organization_id,
+            session_id=session_id,
+            history=history,
+            context=context,
+            summary=summary
+        ))
+
+    async def stream_chat_response(
+        self,
+        message: str,
+        organization_id: str,
+        session_id: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        context: Optional[str] = None,
+        summary: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream from the healthiest backend
+
+        Streams are not hedged. A failing backend is replaced by the next one
+        only while no delta has been sent, so the caller never sees a mix of
+        two responses.
+        """
+        last_error: Optional[Exception] = None
+        for index, backend in enumerate(self._rank("chat", CHAT_STREAM_WINDOW)):
+            if index > 0:
+                self.metrics["chat"]["fallbacks"] += 1
+
+            started_at = time.monotonic()
+            sent = False
+            try:
+                async for delta in backend.stream_chat_response(
+                    message=message,
+                    organization_id=organization_id,
+                    session_id=session_id,
+                    history=history,
+                    context=context,
+                    summary=summary
+                ):
+                    if not sent:
+                        # Time to first token is the latency that matters for streams
+                        self.health[CHAT_STREAM_WINDOW][backend.provider].record_success(time.monotonic() - started_at)
+                        sent = True
+                    yield delta
+                return
+            except Exception as e:
+                if sent:
+                    raise
+                self.health[CHAT_STREAM_WINDOW][backend.provider].record_failure()
+                logger.warning(f"Backend {backend.provider} failed chat stream: {str(e)}")
+                last_error = e
+
+        raise last_error or RuntimeError("No backend available for chat")
+
+    async def evaluate_certification(
+        self,
+        organization_id: str,
+        certification_type: str,
+        evidence_fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        return await self._call("evaluation", lambda backend: backend.evaluate_certification(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            evidence_fingerprint=evidence_fingerprint
+        ))
+
+    async def evaluate_requirements(
+        self,
+        organization_id: str,
+        certification_type: str,
+        requirements: List[Dict[str, Any]],
+        evidence_fingerprint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        return await self._call("evaluation", lambda backend: backend.evaluate_requirements(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            requirements=requirements,
+            evidence_fingerprint=evidence_fingerprint
+        ))
+
+    async def generate_document(
+        self,
+        organization_id: str,
+        evaluation_id: str,
+        document_type: str,
+        evaluation_data: Dict[str, Any],
+        organization_context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        return await self._call("document", lambda backend: backend.generate_document(
+            organization_id=organization_id,
+            evaluation_id=evaluation_id,
+            document_type=document_type,
+            evaluation_data=evaluation_data,
+            organization_context=organization_context
+        ))
+
+    async def warm_up(self):
+        for backend in self.backends:
+            try:
+                await backend.warm_up()
+            except Exception as e:
+                logger.warning(f"Error warming up backend {backend.provider}: {str(e)}")
+
+    async def close(self):
+        for backend in self.backends:
+            await backend.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Routing statistics
+
+        Returns:
+            Per-method policy, counters and backend health, with streamed
+            chat health (time to first token) under chat.stream_backends
+        """
+        stats = {
+            method: {
+                "policy": self.policies[method].to_dict(),
+                "counters": dict(self.metrics[method]),
+                "backends": {provider: health.to_dict() for provider, health in self.health[method].items()}
+            }
+            for method in ROUTED_METHODS
+        }
+        stats["chat"]["stream_backends"] = {
+            provider: health.to_dict() for provider, health in self.health[CHAT_STREAM_WINDOW].items()
+        }
+        return stats
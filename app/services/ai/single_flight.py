@@ -0,0 +1,178 @@
+import logging
+import os
+import asyncio
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from app.services.ai.model_factory import BaseAIModel, DelegatingAIModel
+from app.services.ai.response_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+AI_SINGLE_FLIGHT_ENABLED = os.getenv("AI_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
+class SingleFlight:
+    """
+    Shares one in-flight call between concurrent callers with the same key
+    """
+
+    def __init__(self):
+        """
+        Initialize single-flight group
+        """
+        self._calls: Dict[str, asyncio.Task] = {}
+        self.metrics: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, method: str, counter: str):
+        counters = self.metrics.setdefault(method, {"executed": 0, "coalesced": 0})
+        counters[counter] += 1
+
+    async def do(self, method: str, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run a call, or join the identical call already in flight
+
+        The call runs as its own task, so a caller that is cancelled does
+        not cancel the result for the others waiting on it.
+
+        Args:
+            method: Logical method name used for metrics
+            key: Call key
+            func: Coroutine function performing the call
+
+        Returns:
+            Result of the shared call
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self._count(method, "coalesced")
+            logger.info(f"Coalesced {method} call onto in-flight request")
+            return await asyncio.shield(task)
+
+        task = asyncio.ensure_future(func())
+        self._calls[key] = task
+        self._count(method, "executed")
+
+        def _done(finished: asyncio.Task):
+            self._calls.pop(key, None)
+            # Mark the exception as retrieved when every caller went away
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(_done)
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Single-flight statistics
+
+        Returns:
+            In-flight count and per-method executed/coalesced counters
+        """
+        return {
+            "in_flight": len(self._calls),
+            "methods": {method: dict(counters) for method, counters in self.metrics.items()}
+        }
+
+class SingleFlightAIModel(DelegatingAIModel):
+    """
+    Model wrapper that coalesces identical concurrent evaluation and document calls
+    """
+
+    def __init__(self, inner: BaseAIModel, group: SingleFlight):
+        """
+        Initialize single-flight model
+
+        Args:
+            inner: Wrapped model
+            group: Shared single-flight group
+        """
+        super().__init__(inner)
+        self.group = group
+
+    def _key(self, method: str, params: Dict[str, Any]) -> str:
+        return make_cache_key(self.provider, self.model_name, method, params)
+
+    async def evaluate_certification(
+        self,
+        organization_id: str,
+        certification_type: str,
+        evidence_fingerprint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Evaluate certification readiness, sharing identical in-flight evaluations
+
+        Calls coalesce when organization, certification type and evidence
+        fingerprint all match; calls without a fingerprint are not coalesced,
+        since their evidence may differ.
+        """
+        if evidence_fingerprint is None:
+            return await self.inner.evaluate_certification(
+                organization_id=organization_id,
+                certification_type=certification_type
+            )
+
+        key = self._key("evaluation", {
+            "organization_id": organization_id,
+            "certification_type": certification_type,
+            "evidence_fingerprint": evidence_fingerprint
+        })
+        return await self.group.do("evaluation", key, lambda: self.inner.evaluate_certification(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            evidence_fingerprint=evidence_fingerprint
+        ))
+
+    async def evaluate_requirements(
+        self,
+        organization_id: str,
+        certification_type: str,
+        requirements: List[Dict[str, Any]],
+        evidence_fingerprint: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate a batch of requirements, sharing identical in-flight chunks
+
+        Like evaluations, chunks are only coalesced with an evidence fingerprint.
+        """
+        if evidence_fingerprint is None:
+            return await self.inner.evaluate_requirements(
+                organization_id=organization_id,
+                certification_type=certification_type,
+                requirements=requirements
+            )
+
+        key = self._key("requirements", {
+            "organization_id": organization_id,
+            "certification_type": certification_type,
+            "requirement_ids": [requirement["id"] for requirement in requirements],
+            "evidence_fingerprint": evidence_fingerprint
+        })
+        return await self.group.do("evaluation", key, lambda: self.inner.evaluate_requirements(
+            organization_id=organization_id,
+            certification_type=certification_type,
+            requirements=requirements,
+            evidence_fingerprint=evidence_fingerprint
+        ))
+
+    async def generate_document(
+        self,
+        organization_id: str,
+        evaluation_id: str,
+        document_type: str,
+        evaluation_data: Dict[str, Any],
+        organization_context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Generate a compliance document, sharing identical in-flight generations
+        """
+        key = self._key("document", {
+            "organization_id": organization_id,
+            "evaluation_id": evaluation_id,
+            "document_type": document_type,
+            "organization_context": (organization_context or {}).get("version")
+        })
+        return await self.group.do("document", key, lambda: self.inner.generate_document(
+            organization_id=organization_id,
+            evaluation_id=evaluation_id,
+            document_type=document_type,
+            evaluation_data=evaluation_data,
+            organization_context=organization_context
+        ))
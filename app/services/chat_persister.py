@@ -0,0 +1,183 @@
+import logging
+import os
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+from app.services.firestore import save_chat_turns
+
+logger = logging.getLogger(__name__)
+
+# Turns waiting to be written before submitters are made to wait
+CHAT_PERSIST_QUEUE_SIZE = int(os.getenv("CHAT_PERSIST_QUEUE_SIZE", "1000"))
+
+# Turns per Firestore batch
+CHAT_PERSIST_BATCH_SIZE = int(os.getenv("CHAT_PERSIST_BATCH_SIZE", "100"))
+
+# Firestore allows 500 writes per batch and a turn takes up to three: its two
+# messages and, if it is the only turn of its session, the session header
+FIRESTORE_BATCH_LIMIT = 500
+CHAT_PERSIST_MAX_BATCH_SIZE = FIRESTORE_BATCH_LIMIT // 3
+
+# Attempts per batch before its turns are dropped
+CHAT_PERSIST_MAX_ATTEMPTS = int(os.getenv("CHAT_PERSIST_MAX_ATTEMPTS", "5"))
+
+class ChatPersister:
+    """
+    Writes chat turns to Firestore behind the conversation
+
+    Turns are queued in process and a background task writes whatever has
+    accumulated as one batch, so replies do not wait for Firestore. When
+    the queue is full, submit() waits for room rather than dropping turns.
+    stop() writes everything still queued.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = CHAT_PERSIST_QUEUE_SIZE,
+        batch_size: int = CHAT_PERSIST_BATCH_SIZE,
+        max_attempts: int = CHAT_PERSIST_MAX_ATTEMPTS
+    ):
+        """
+        Initialize chat persister
+
+        Args:
+            queue_size: Turns queued before submit() blocks
+            batch_size: Maximum turns per write (at most CHAT_PERSIST_MAX_BATCH_SIZE)
+            max_attempts: Attempts per batch before giving up on it
+        """
+        self.queue_size = queue_size
+        if batch_size > CHAT_PERSIST_MAX_BATCH_SIZE:
+            logger.warning(f"Chat persistence batch size {batch_size} exceeds the Firestore batch limit, using {CHAT_PERSIST_MAX_BATCH_SIZE}")
+        self.batch_size = max(1, min(batch_size, CHAT_PERSIST_MAX_BATCH_SIZE))
+        self.max_attempts = max_attempts
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.blocked = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def submit(
+        self,
+        organization_id: str,
+        session_id: str,
+        user_message: str,
+        ai_response: str,
+        new_session: bool = False
+    ):
+        """
+        Queue a chat turn for writing
+
+        Writes directly when the persister is not running.
+
+        Args:
+            organization_id: Organization ID
+            session_id: Chat session ID
+            user_message: User message
+            ai_response: AI response
+            new_session: The turn is the first of its session
+        """
+        turn = {
+            "organization_id": organization_id,
+            "session_id": session_id,
+            "user_message": user_message,
+            "ai_response": ai_response,
+            "new_session": new_session,
+            # Names the turn's messages, so a retried write does not duplicate them
+            "id": uuid.uuid4().hex,
+            # Keeps the turn's place in the session however late it is written
+            "timestamp": datetime.now(timezone.utc)
+        }
+
+        if self._task is None or self._task.done():
+            await save_chat_turns([turn])
+            self.written += 1
+            return
+
+        if self._queue.full():
+            self.blocked += 1
+            logger.warning("Chat persistence queue is full; waiting for room")
+        await self._queue.put(turn)
+
+    async def _loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            try:
+                await self._write(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await save_chat_turns(batch)
+                self.written += len(batch)
+                self.batches += 1
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self.dropped += len(batch)
+                    logger.error(f"Dropping {len(batch)} chat turns after {attempt} attempts: {str(e)}")
+                    return
+                logger.warning(f"Error writing {len(batch)} chat turns (attempt {attempt}): {str(e)}")
+                await asyncio.sleep(min(2 ** attempt * 0.5, 10))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get persister counters
+
+        Returns:
+            Queued, written and dropped turns, batches written and
+            submissions that had to wait for room
+        """
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "written": self.written,
+            "batches": self.batches,
+            "dropped": self.dropped,
+            "blocked": self.blocked
+        }
+
+    def start(self):
+        """
+        Start writing queued turns on the running loop
+        """
+        self._queue = asyncio.Queue(self.queue_size)
+        self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Write the queued turns and stop
+
+        Args:
+            timeout: Seconds to wait for the queue to drain
+        """
+        if self._task is None:
+            return
+
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Stopping chat persistence with {self._queue.qsize()} turns unwritten")
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+_persister: Optional[ChatPersister] = None
+
+def get_chat_persister() -> ChatPersister:
+    """
+    Get the process-wide chat persister
+
+    Returns:
+        Chat persister
+    """
+    global _persister
+    if _persister is None:
+        _persister = ChatPersister()
+    return _persister
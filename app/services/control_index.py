@@ -0,0 +1,318 @@
+from typing import Dict, Any, List, Optional, Tuple
+from app.models.certification import CertificationType
+
+# Canonical controls and the equivalent requirement IDs in each framework.
+# A requirement maps to at most one canonical control.
+CANONICAL_CONTROLS: Dict[str, Dict[str, Any]] = {
+    "CTL-POLICY": {
+        "name": "Information security policy",
+        "category": "Governance",
+        "description": "A documented information security policy is approved by management, communicated and reviewed.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.1"],
+            CertificationType.SOC_2: ["CC5.3"],
+            CertificationType.PCI_DSS: ["Req.12"]
+        }
+    },
+    "CTL-ROLES": {
+        "name": "Security roles and responsibilities",
+        "category": "Governance",
+        "description": "Responsibility for information security is assigned to named roles, including an accountable security officer.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.2"],
+            CertificationType.SOC_2: ["CC1.3"],
+            CertificationType.HIPAA: ["164.308(a)(2)"]
+        }
+    },
+    "CTL-RISK-ASSESSMENT": {
+        "name": "Risk assessment",
+        "category": "Risk Management",
+        "description": "Security risks are identified, analysed and treated through a repeatable risk management process.",
+        "requirements": {
+            CertificationType.SOC_2: ["CC3.2"],
+            CertificationType.HIPAA: ["164.308(a)(1)"]
+        }
+    },
+    "CTL-INDEPENDENT-REVIEW": {
+        "name": "Independent review of controls",
+        "category": "Governance",
+        "description": "The effectiveness of security controls is evaluated periodically and independently.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.35"],
+            CertificationType.SOC_2: ["CC4.1"],
+            CertificationType.HIPAA: ["164.308(a)(8)"]
+        }
+    },
+    "CTL-ACCESS-CONTROL": {
+        "name": "Access control",
+        "category": "Access Control",
+        "description": "Access to systems and data is restricted according to a documented access control policy and least privilege.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.15", "A.8.3"],
+            CertificationType.SOC_2: ["CC6.1"],
+            CertificationType.HIPAA: ["164.312(a)(1)"],
+            CertificationType.PCI_DSS: ["Req.7"]
+        }
+    },
+    "CTL-ACCESS-PROVISIONING": {
+        "name": "Access provisioning and review",
+        "category": "Access Control",
+        "description": "User access is authorized before it is granted, reviewed periodically and removed when no longer needed.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.18"],
+            CertificationType.SOC_2: ["CC6.2", "CC6.3"],
+            CertificationType.HIPAA: ["164.308(a)(3)", "164.308(a)(4)"]
+        }
+    },
+    "CTL-AUTHENTICATION": {
+        "name": "User authentication",
+        "category": "Access Control",
+        "description": "Users are uniquely identified and authenticated with securely managed credentials.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.17", "A.8.5"],
+            CertificationType.HIPAA: ["164.312(d)"],
+            CertificationType.PCI_DSS: ["Req.8"]
+        }
+    },
+    "CTL-AWARENESS": {
+        "name": "Security awareness and training",
+        "category": "People",
+        "description": "Personnel receive security awareness training appropriate to their role.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.6.3"],
+            CertificationType.HIPAA: ["164.308(a)(5)"]
+        }
+    },
+    "CTL-INCIDENT-RESPONSE": {
+        "name": "Incident response",
+        "category": "Incident Management",
+        "description": "Security incidents are handled through a documented and tested incident response process.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.24", "A.5.26"],
+            CertificationType.SOC_2: ["CC7.4"],
+            CertificationType.HIPAA: ["164.308(a)(6)"]
+        }
+    },
+    "CTL-INCIDENT-TRIAGE": {
+        "name": "Security event triage",
+        "category": "Incident Management",
+        "description": "Security events are assessed to decide whether they are incidents.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.25"],
+            CertificationType.SOC_2: ["CC7.3"]
+        }
+    },
+    "CTL-INCIDENT-RECOVERY": {
+        "name": "Incident recovery and lessons learned",
+        "category": "Incident Management",
+        "description": "Operations are restored after incidents and lessons learned feed back into controls.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.27"],
+            CertificationType.SOC_2: ["CC7.5"]
+        }
+    },
+    "CTL-LOGGING": {
+        "name": "Logging and monitoring",
+        "category": "Operations",
+        "description": "Security-relevant activity is logged, protected and monitored for anomalies.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.15", "A.8.16"],
+            CertificationType.SOC_2: ["CC7.2"],
+            CertificationType.HIPAA: ["164.312(b)"],
+            CertificationType.PCI_DSS: ["Req.10"]
+        }
+    },
+    "CTL-MALWARE": {
+        "name": "Malware protection",
+        "category": "Operations",
+        "description": "Systems are protected against malicious software.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.7"],
+            CertificationType.SOC_2: ["CC6.8"],
+            CertificationType.PCI_DSS: ["Req.5"]
+        }
+    },
+    "CTL-VULNERABILITY": {
+        "name": "Vulnerability management",
+        "category": "Operations",
+        "description": "Technical vulnerabilities are identified through scanning and testing and remediated in time.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.8"],
+            CertificationType.SOC_2: ["CC7.1"],
+            CertificationType.PCI_DSS: ["Req.11"]
+        }
+    },
+    "CTL-SECURE-DEVELOPMENT": {
+        "name": "Secure development",
+        "category": "Development",
+        "description": "Software is developed and maintained following secure development and coding practices.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.25", "A.8.28"],
+            CertificationType.PCI_DSS: ["Req.6"]
+        }
+    },
+    "CTL-CHANGE-MANAGEMENT": {
+        "name": "Change management",
+        "category": "Development",
+        "description": "Changes to systems are authorized, tested and approved before release.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.32"],
+            CertificationType.SOC_2: ["CC8.1"]
+        }
+    },
+    "CTL-NETWORK-SECURITY": {
+        "name": "Network security",
+        "category": "Network",
+        "description": "Networks are protected by security controls and segmented to limit exposure.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.20", "A.8.22"],
+            CertificationType.SOC_2: ["CC6.6"],
+            CertificationType.PCI_DSS: ["Req.1"]
+        }
+    },
+    "CTL-SECURE-CONFIGURATION": {
+        "name": "Secure configuration",
+        "category": "Operations",
+        "description": "Systems are hardened and run from managed, secure baseline configurations.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.9"],
+            CertificationType.PCI_DSS: ["Req.2"]
+        }
+    },
+    "CTL-DATA-IN-TRANSIT": {
+        "name": "Protection of data in transit",
+        "category": "Data Protection",
+        "description": "Data transmitted over networks is protected against interception and tampering.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.14"],
+            CertificationType.SOC_2: ["CC6.7"],
+            CertificationType.HIPAA: ["164.312(e)(1)"],
+            CertificationType.PCI_DSS: ["Req.4"]
+        }
+    },
+    "CTL-DATA-AT-REST": {
+        "name": "Protection of stored data",
+        "category": "Data Protection",
+        "description": "Stored sensitive data is minimized and protected with cryptography and key management.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.24"],
+            CertificationType.PCI_DSS: ["Req.3"]
+        }
+    },
+    "CTL-PHYSICAL-ACCESS": {
+        "name": "Physical access control",
+        "category": "Physical",
+        "description": "Physical access to facilities and equipment holding sensitive data is restricted.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.7.2"],
+            CertificationType.SOC_2: ["CC6.4"],
+            CertificationType.HIPAA: ["164.310(a)(1)"],
+            CertificationType.PCI_DSS: ["Req.9"]
+        }
+    },
+    "CTL-MEDIA-DISPOSAL": {
+        "name": "Media handling and disposal",
+        "category": "Physical",
+        "description": "Storage media and equipment are tracked and sanitized before disposal or re-use.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.7.10", "A.7.14"],
+            CertificationType.SOC_2: ["CC6.5"],
+            CertificationType.HIPAA: ["164.310(d)(1)"]
+        }
+    },
+    "CTL-ENDPOINT": {
+        "name": "Endpoint security",
+        "category": "Physical",
+        "description": "User workstations and endpoint devices are secured.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.8.1"],
+            CertificationType.HIPAA: ["164.310(c)"]
+        }
+    },
+    "CTL-CONTINUITY": {
+        "name": "Business continuity and disaster recovery",
+        "category": "Resilience",
+        "description": "Continuity and recovery plans keep critical services and security running through disruptions.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.29", "A.5.30"],
+            CertificationType.SOC_2: ["CC9.1"],
+            CertificationType.HIPAA: ["164.308(a)(7)"]
+        }
+    },
+    "CTL-SUPPLIER-RISK": {
+        "name": "Supplier and processor management",
+        "category": "Third Parties",
+        "description": "Suppliers handling sensitive data are assessed and bound by security and data protection agreements.",
+        "requirements": {
+            CertificationType.ISO_27001: ["A.5.19", "A.5.20"],
+            CertificationType.SOC_2: ["CC9.2"],
+            CertificationType.HIPAA: ["164.308(b)(1)"],
+            CertificationType.GDPR: ["Art.28"]
+        }
+    }
+}
+
+def _build_reverse_index() -> Dict[Tuple[CertificationType, str], str]:
+    index = {}
+    for control_id, control in CANONICAL_CONTROLS.items():
+        for certification_type, requirement_ids in control["requirements"].items():
+            for requirement_id in requirement_ids:
+                key = (certification_type, requirement_id)
+                if key in index:
+                    raise ValueError(f"Requirement {requirement_id} of {certification_type.value} maps to two controls")
+                index[key] = control_id
+    return index
+
+# (certification type, requirement ID) -> canonical control ID
+REQUIREMENT_CONTROLS = _build_reverse_index()
+
+def get_canonical_control_id(certification_type: str, requirement_id: str) -> Optional[str]:
+    """
+    Get the canonical control a requirement is equivalent to
+
+    Args:
+        certification_type: Certification type
+        requirement_id: Requirement ID within the framework
+
+    Returns:
+        Canonical control ID or None if the requirement is framework-specific
+    """
+    try:
+        certification_type = CertificationType(certification_type)
+    except ValueError:
+        return None
+    return REQUIREMENT_CONTROLS.get((certification_type, requirement_id))
+
+def get_canonical_control(control_id: str) -> Dict[str, Any]:
+    """
+    Get a canonical control as requirement data
+
+    Args:
+        control_id: Canonical control ID
+
+    Returns:
+        Requirement-shaped dictionary (id, name, description, category)
+    """
+    control = CANONICAL_CONTROLS[control_id]
+    return {
+        "id": control_id,
+        "name": control["name"],
+        "description": control["description"],
+        "category": control["category"]
+    }
+
+def get_mapped_requirement_ids(control_id: str) -> List[str]:
+    """
+    Get every framework requirement ID mapped to a canonical control
+
+    Args:
+        control_id: Canonical control ID
+
+    Returns:
+        Requirement IDs across all frameworks
+    """
+    return [
+        requirement_id
+        for requirement_ids in CANONICAL_CONTROLS[control_id]["requirements"].values()
+        for requirement_id in requirement_ids
+    ]
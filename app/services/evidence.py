@@ -0,0 +1,102 @@
+import hashlib
+import json
+from typing import Dict, Any, Optional, List
+
+# Organization fields that change on every save without changing the content
+VOLATILE_ORGANIZATION_FIELDS = {"id", "created_at", "updated_at"}
+
+def hash_content(value: Any) -> str:
+    """
+    Compute a stable SHA-256 hash of a JSON-serializable value
+    
+    Args:
+        value: Value to hash
+        
+    Returns:
+        Hex digest
+    """
+    payload = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def organization_content(organization_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Organization fields that evaluations depend on
+    
+    Args:
+        organization_data: Organization data dictionary
+        
+    Returns:
+        Organization data without volatile fields
+    """
+    return {
+        k: v for k, v in (organization_data or {}).items()
+        if k not in VOLATILE_ORGANIZATION_FIELDS
+    }
+
+def evidence_applies_to(evidence: Dict[str, Any], requirement_ids: List[str]) -> bool:
+    """
+    Check whether an evidence document is an input to a requirement
+    
+    Evidence uploaded without requirement IDs applies to every requirement.
+    
+    Args:
+        evidence: Evidence metadata dictionary
+        requirement_ids: IDs the requirement is known by (including equivalent requirements)
+        
+    Returns:
+        True if the requirement depends on the evidence
+    """
+    evidence_requirement_ids = evidence.get("requirement_ids") or []
+    return not evidence_requirement_ids or any(r in evidence_requirement_ids for r in requirement_ids)
+
+def compute_evidence_fingerprint(
+    organization_data: Optional[Dict[str, Any]],
+    evidence_documents: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """
+    Fingerprint the inputs an evaluation is based on
+    
+    Args:
+        organization_data: Organization data dictionary
+        evidence_documents: Uploaded evidence metadata, including content hashes
+        
+    Returns:
+        Hex digest that changes whenever the evaluated content changes
+    """
+    return hash_content({
+        "organization": organization_content(organization_data),
+        "evidence": sorted(
+            (e.get("id"), e.get("content_hash")) for e in (evidence_documents or [])
+        )
+    })
+
+def requirement_input_hashes(
+    requirement: Dict[str, Any],
+    organization_data: Optional[Dict[str, Any]],
+    evidence_documents: Optional[List[Dict[str, Any]]] = None,
+    requirement_ids: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """
+    Hash every input a requirement evaluation depends on
+    
+    A requirement evaluation can be reused when all of its input hashes
+    match those recorded by an earlier evaluation.
+    
+    Args:
+        requirement: Requirement data
+        organization_data: Organization data dictionary
+        evidence_documents: Uploaded evidence metadata, including content hashes
+        requirement_ids: IDs evidence may be tagged with (defaults to the requirement ID)
+        
+    Returns:
+        Mapping of input name to content hash
+    """
+    input_hashes = {
+        "requirement": hash_content(requirement),
+        "organization": hash_content(organization_content(organization_data))
+    }
+    requirement_ids = requirement_ids or [requirement["id"]]
+    for evidence in evidence_documents or []:
+        if evidence_applies_to(evidence, requirement_ids):
+            input_hashes[f"evidence:{evidence.get('id')}"] = evidence.get("content_hash", "")
+    return input_hashes
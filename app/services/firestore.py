@@ -2,15 +2,18 @@ import logging
 import os
 from typing import Dict, List, Any, Optional, Union
 from google.cloud import firestore
-from datetime import datetime
+from datetime import datetime, timezone, timedelta
 import uuid
+import copy
+from app.services.cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
 # Initialize Firestore client with error handling for development
+# (the async client shares one gRPC channel across the process)
 try:
     # If FIRESTORE_EMULATOR_HOST is set, it will connect to the emulator
-    db = firestore.Client()
+    db = firestore.AsyncClient()
     logger.info("Connected to Firestore successfully")
 except Exception as e:
     logger.warning(f"Failed to connect to Firestore: {e}")
@@ -22,7 +25,22 @@ COLLECTION_USERS = os.getenv("FIRESTORE_COLLECTION_USERS", "users")
 COLLECTION_CERTIFICATIONS = os.getenv("FIRESTORE_COLLECTION_CERTIFICATIONS", "certifications")
 COLLECTION_EVALUATIONS = os.getenv("FIRESTORE_COLLECTION_EVALUATIONS", "evaluations")
 COLLECTION_DOCUMENTS = os.getenv("FIRESTORE_COLLECTION_DOCUMENTS", "documents")
+COLLECTION_EVIDENCE = os.getenv("FIRESTORE_COLLECTION_EVIDENCE", "evidence")
 COLLECTION_CHAT_SESSIONS = "chat_sessions"
+COLLECTION_ORGANIZATION_CONTEXT = os.getenv("FIRESTORE_COLLECTION_ORGANIZATION_CONTEXT", "organization_context")
+
+# Organization profiles change rarely; unknown IDs are remembered for less time
+ORGANIZATION_CACHE_TTL = float(os.getenv("ORGANIZATION_CACHE_TTL", "300"))
+ORGANIZATION_CACHE_NEGATIVE_TTL = float(os.getenv("ORGANIZATION_CACHE_NEGATIVE_TTL", "30"))
+ORGANIZATION_CACHE_MAX_ENTRIES = int(os.getenv("ORGANIZATION_CACHE_MAX_ENTRIES", "1000"))
+
+_organization_cache = TTLCache(ORGANIZATION_CACHE_MAX_ENTRIES, default_ttl=ORGANIZATION_CACHE_TTL)
+# Bumped by every invalidation, so a read that raced a save is not cached
+_organization_cache_generation = 0
+CHAT_MESSAGES_SUBCOLLECTION = "messages"
+
+# Chat messages returned per history page
+CHAT_HISTORY_PAGE_SIZE = int(os.getenv("CHAT_HISTORY_PAGE_SIZE", "50"))
 
 async def save_organization_data(organization_data: Dict[str, Any]) -> str:
     """
@@ -49,7 +67,8 @@ async def save_organization_data(organization_data: Dict[str, Any]) -> str:
         
         # Save to Firestore
         doc_ref = db.collection(COLLECTION_USERS).document(org_id)
-        doc_ref.set(organization_data)
+        await doc_ref.set(organization_data)
+        invalidate_organization_cache(org_id)
         
         logger.info(f"Saved organization data with ID: {org_id}")
         return org_id
@@ -81,17 +100,27 @@ async def get_organization_data(organization_id: str) -> Optional[Dict[str, Any]
             }
             logger.info(f"[MOCK] Retrieved organization data for ID: {organization_id}")
             return mock_data
-            
+        
+        found, cached = _organization_cache.lookup(organization_id)
+        if found:
+            # Callers may modify what they get back
+            return copy.deepcopy(cached)
+        
+        generation = _organization_cache_generation
         doc_ref = db.collection(COLLECTION_USERS).document(organization_id)
-        doc = doc_ref.get()
+        doc = await doc_ref.get()
         
         if not doc.exists:
             logger.warning(f"Organization not found: {organization_id}")
+            if generation == _organization_cache_generation:
+                _organization_cache.set(organization_id, None, ttl=ORGANIZATION_CACHE_NEGATIVE_TTL)
             return None
         
         # Get data and add ID
         data = doc.to_dict()
         data["id"] = organization_id
+        if generation == _organization_cache_generation:
+            _organization_cache.set(organization_id, copy.deepcopy(data))
         
         logger.info(f"Retrieved organization data for ID: {organization_id}")
         return data
@@ -99,6 +128,73 @@ async def get_organization_data(organization_id: str) -> Optional[Dict[str, Any]
         logger.error(f"Error getting organization data: {str(e)}", exc_info=True)
         raise
 
+async def save_organization_context(context: Dict[str, Any]):
+    """
+    Save a materialised organization context to Firestore
+    
+    Args:
+        context: Organization context dictionary (see app.services.org_context)
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Saved organization context for ID: {context['organization_id']}")
+            return
+        
+        doc_ref = db.collection(COLLECTION_ORGANIZATION_CONTEXT).document(context["organization_id"])
+        await doc_ref.set(context)
+        
+        logger.info(f"Saved organization context version {context['version']} for ID: {context['organization_id']}")
+    except Exception as e:
+        logger.error(f"Error saving organization context: {str(e)}", exc_info=True)
+        raise
+
+async def get_organization_context(organization_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a materialised organization context from Firestore
+    
+    Args:
+        organization_id: Organization ID
+        
+    Returns:
+        Organization context dictionary or None if it has not been built
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] No organization context for ID: {organization_id}")
+            return None
+        
+        doc = await db.collection(COLLECTION_ORGANIZATION_CONTEXT).document(organization_id).get()
+        
+        if not doc.exists:
+            return None
+        
+        return doc.to_dict()
+    except Exception as e:
+        logger.error(f"Error getting organization context: {str(e)}", exc_info=True)
+        raise
+
+def invalidate_organization_cache(organization_id: str):
+    """
+    Drop an organization from the read-through cache after it changes
+    
+    Args:
+        organization_id: Organization ID
+    """
+    global _organization_cache_generation
+    _organization_cache_generation += 1
+    _organization_cache.delete(organization_id)
+
+def organization_cache_stats() -> Dict[str, Any]:
+    """
+    Get organization cache statistics
+    
+    Returns:
+        Size, limits and hit/miss counters
+    """
+    return _organization_cache.stats()
+
 async def save_evaluation_result(evaluation_data: Dict[str, Any]) -> str:
     """
     Save evaluation result to Firestore
@@ -119,7 +215,7 @@ async def save_evaluation_result(evaluation_data: Dict[str, Any]) -> str:
         
         # Save to Firestore
         doc_ref = db.collection(COLLECTION_EVALUATIONS).document(evaluation_id)
-        doc_ref.set(evaluation_data)
+        await doc_ref.set(evaluation_data)
         
         logger.info(f"Saved evaluation result with ID: {evaluation_id}")
         return evaluation_id
@@ -140,7 +236,7 @@ async def get_evaluation_results(organization_id: str, evaluation_id: str) -> Op
     """
     try:
         doc_ref = db.collection(COLLECTION_EVALUATIONS).document(evaluation_id)
-        doc = doc_ref.get()
+        doc = await doc_ref.get()
         
         if not doc.exists:
             logger.warning(f"Evaluation not found: {evaluation_id}")
@@ -162,6 +258,108 @@ async def get_evaluation_results(organization_id: str, evaluation_id: str) -> Op
         logger.error(f"Error getting evaluation results: {str(e)}", exc_info=True)
         raise
 
+async def get_latest_evaluation(organization_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get the most recent completed evaluation of an organization
+    
+    Args:
+        organization_id: Organization ID
+        
+    Returns:
+        Evaluation data dictionary or None if there is none
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] No previous evaluation for organization: {organization_id}")
+            return None
+        
+        # Equality filters only, so no composite index is needed
+        query = (
+            db.collection(COLLECTION_EVALUATIONS)
+            .where("organization_id", "==", organization_id)
+            .where("status", "==", "completed")
+        )
+        
+        evaluations = []
+        async for doc in query.stream():
+            data = doc.to_dict()
+            data["id"] = doc.id
+            evaluations.append(data)
+        
+        # Firestore timestamps are timezone-aware
+        epoch = datetime.min.replace(tzinfo=timezone.utc)
+        latest = max(evaluations, key=lambda e: e.get("updated_at") or epoch, default=None)
+        
+        logger.info(f"Retrieved latest evaluation for organization: {organization_id}")
+        return latest
+    except Exception as e:
+        logger.error(f"Error getting latest evaluation: {str(e)}", exc_info=True)
+        raise
+
+async def save_evidence_document(evidence_data: Dict[str, Any]) -> str:
+    """
+    Save uploaded evidence metadata to Firestore
+    
+    Args:
+        evidence_data: Evidence metadata dictionary, including its content hash
+        
+    Returns:
+        Evidence document ID
+    """
+    try:
+        # Generate ID if not provided
+        evidence_id = evidence_data.get("id", str(uuid.uuid4()))
+        
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Saved evidence document with ID: {evidence_id}")
+            return evidence_id
+        
+        # Add timestamps
+        evidence_data["upload_timestamp"] = firestore.SERVER_TIMESTAMP
+        evidence_data["updated_at"] = firestore.SERVER_TIMESTAMP
+        
+        # Save to Firestore
+        doc_ref = db.collection(COLLECTION_EVIDENCE).document(evidence_id)
+        await doc_ref.set({k: v for k, v in evidence_data.items() if k != "id"})
+        
+        logger.info(f"Saved evidence document with ID: {evidence_id}")
+        return evidence_id
+    except Exception as e:
+        logger.error(f"Error saving evidence document: {str(e)}", exc_info=True)
+        raise
+
+async def list_evidence_documents(organization_id: str) -> List[Dict[str, Any]]:
+    """
+    List the evidence uploaded by an organization
+    
+    Args:
+        organization_id: Organization ID
+        
+    Returns:
+        List of evidence metadata dictionaries
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Retrieved evidence documents for organization: {organization_id}")
+            return []
+        
+        query = db.collection(COLLECTION_EVIDENCE).where("organization_id", "==", organization_id)
+        
+        documents = []
+        async for doc in query.stream():
+            data = doc.to_dict()
+            data["id"] = doc.id
+            documents.append(data)
+        
+        logger.info(f"Retrieved {len(documents)} evidence documents for organization: {organization_id}")
+        return documents
+    except Exception as e:
+        logger.error(f"Error listing evidence documents: {str(e)}", exc_info=True)
+        raise
+
 async def save_document_generation(document_data: Dict[str, Any]) -> str:
     """
     Save document generation data to Firestore
@@ -182,7 +380,7 @@ async def save_document_generation(document_data: Dict[str, Any]) -> str:
         
         # Save to Firestore
         doc_ref = db.collection(COLLECTION_DOCUMENTS).document(document_id)
-        doc_ref.set(document_data)
+        await doc_ref.set(document_data)
         
         logger.info(f"Saved document generation with ID: {document_id}")
         return document_id
@@ -190,100 +388,369 @@ async def save_document_generation(document_data: Dict[str, Any]) -> str:
         logger.error(f"Error saving document generation: {str(e)}", exc_info=True)
         raise
 
-async def save_chat_message(organization_id: str, session_id: str, user_message: str, ai_response: str) -> str:
+async def get_document_generation(organization_id: str, document_id: str) -> Optional[Dict[str, Any]]:
     """
-    Save chat messages to Firestore
+    Get a document generation record from Firestore
+    
+    Args:
+        organization_id: Organization ID
+        document_id: Document generation ID
+        
+    Returns:
+        Document generation data dictionary or None if not found
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Document generation not found: {document_id}")
+            return None
+        
+        doc_ref = db.collection(COLLECTION_DOCUMENTS).document(document_id)
+        doc = await doc_ref.get()
+        
+        if not doc.exists:
+            logger.warning(f"Document generation not found: {document_id}")
+            return None
+        
+        data = doc.to_dict()
+        
+        # Verify organization ID
+        if data.get("organization_id") != organization_id:
+            logger.warning(f"Document generation {document_id} does not belong to organization {organization_id}")
+            return None
+        
+        data["id"] = document_id
+        
+        logger.info(f"Retrieved document generation for ID: {document_id}")
+        return data
+    except Exception as e:
+        logger.error(f"Error getting document generation: {str(e)}", exc_info=True)
+        raise
+
+async def update_record(
+    collection: str,
+    record_id: str,
+    fields: Dict[str, Any],
+    appends: Optional[Dict[str, List[Any]]] = None
+):
+    """
+    Merge changed fields into an evaluation or document generation record
+    
+    Nested dictionaries are merged rather than replaced, and appended values
+    are added with ArrayUnion, so only the changes are sent.
+    
+    Args:
+        collection: Collection name (COLLECTION_EVALUATIONS or COLLECTION_DOCUMENTS)
+        record_id: Record ID
+        fields: Fields to set (firestore.DELETE_FIELD removes a field)
+        appends: Values to add to array fields
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Updated {collection} record {record_id}: {sorted(fields)} {sorted(appends or {})}")
+            return
+        
+        data = dict(fields)
+        for field, values in (appends or {}).items():
+            data[field] = firestore.ArrayUnion(values)
+        data["updated_at"] = firestore.SERVER_TIMESTAMP
+        
+        await db.collection(collection).document(record_id).set(data, merge=True)
+    except Exception as e:
+        logger.error(f"Error updating record: {str(e)}", exc_info=True)
+        raise
+
+async def list_in_progress_records(collection: str) -> List[Dict[str, Any]]:
+    """
+    List evaluation or document generation records that are in progress
+    
+    Args:
+        collection: Collection name (COLLECTION_EVALUATIONS or COLLECTION_DOCUMENTS)
+        
+    Returns:
+        List of record dictionaries
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            return []
+        
+        query = db.collection(collection).where("status", "==", "in_progress")
+        
+        records = []
+        async for doc in query.stream():
+            data = doc.to_dict()
+            data["id"] = doc.id
+            records.append(data)
+        
+        return records
+    except Exception as e:
+        logger.error(f"Error listing in-progress records: {str(e)}", exc_info=True)
+        raise
+
+async def save_chat_message(
+    organization_id: str,
+    session_id: str,
+    user_message: str,
+    ai_response: str,
+    new_session: bool = False
+) -> str:
+    """
+    Save a chat turn to Firestore
     
     Args:
         organization_id: Organization ID
         session_id: Chat session ID
         user_message: User message
         ai_response: AI response
+        new_session: The turn is the first of its session
         
     Returns:
         Session ID
     """
+    await save_chat_turns([{
+        "organization_id": organization_id,
+        "session_id": session_id,
+        "user_message": user_message,
+        "ai_response": ai_response,
+        "new_session": new_session,
+        "id": uuid.uuid4().hex
+    }])
+    return session_id
+
+async def save_chat_turns(turns: List[Dict[str, Any]]):
+    """
+    Save chat turns to Firestore in one batch
+    
+    Messages are appended as documents in each session's messages
+    subcollection and the session headers are merged in the same batch, so
+    a turn costs the same however long the session is and needs no read.
+    Message IDs derive from the turn ID, so retrying a batch whose commit
+    succeeded finds its messages already there and writes nothing twice.
+    
+    Args:
+        turns: Turns with organization_id, session_id, user_message,
+            ai_response and optionally id (stable across retries), timestamp
+            (when the turn happened) and new_session (the turn starts its session)
+    """
     try:
-        # Get or create session
-        session_ref = db.collection(COLLECTION_CHAT_SESSIONS).document(session_id)
-        session = session_ref.get()
-        
-        # Current timestamp
-        now = firestore.SERVER_TIMESTAMP
-        
-        if not session.exists:
-            # Create new session
-            session_data = {
-                "organization_id": organization_id,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": user_message,
-                        "timestamp": now
-                    },
-                    {
-                        "role": "assistant",
-                        "content": ai_response,
-                        "timestamp": now
-                    }
-                ],
-                "created_at": now,
-                "updated_at": now
-            }
-            session_ref.set(session_data)
-        else:
-            # Update existing session
-            session_data = session.to_dict()
-            session_data["messages"].append({
-                "role": "user",
-                "content": user_message,
-                "timestamp": now
-            })
-            session_data["messages"].append({
-                "role": "assistant",
-                "content": ai_response,
-                "timestamp": now
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Saved {len(turns)} chat turns")
+            return
+        
+        batch = db.batch()
+        headers: Dict[str, Dict[str, Any]] = {}
+        for turn in turns:
+            session_ref = db.collection(COLLECTION_CHAT_SESSIONS).document(turn["session_id"])
+            messages_ref = session_ref.collection(CHAT_MESSAGES_SUBCOLLECTION)
+            
+            # Client-side timestamps keep the reply ordered after its question
+            now = turn.get("timestamp") or datetime.now(timezone.utc)
+            turn_id = turn.get("id") or uuid.uuid4().hex
+            messages = [
+                {"role": "user", "content": turn["user_message"], "timestamp": now},
+                {"role": "assistant", "content": turn["ai_response"], "timestamp": now + timedelta(microseconds=1)}
+            ]
+            for message in messages:
+                message["organization_id"] = turn["organization_id"]
+                batch.create(messages_ref.document(f"{turn_id}-{message['role']}"), message)
+            
+            header = headers.setdefault(turn["session_id"], {
+                "ref": session_ref,
+                "organization_id": turn["organization_id"],
+                "count": 0
             })
-            session_data["updated_at"] = now
-            session_ref.update(session_data)
-        
-        logger.info(f"Saved chat messages for session: {session_id}")
-        return session_id
+            header["count"] += len(messages)
+            if turn.get("new_session"):
+                # Only the first turn sets it, so later merges leave it alone
+                header["created_at"] = now
+        
+        # One header write per session, however many of its turns are in the batch
+        for header in headers.values():
+            update = {
+                "organization_id": header["organization_id"],
+                "message_count": firestore.Increment(header["count"]),
+                "updated_at": firestore.SERVER_TIMESTAMP
+            }
+            if "created_at" in header:
+                update["created_at"] = header["created_at"]
+            batch.set(header["ref"], update, merge=True)
+        try:
+            await batch.commit()
+        except Exception as e:
+            # Batches are atomic: an existing message means an earlier attempt
+            # committed this batch, header increments included
+            if type(e).__name__ != "AlreadyExists":
+                raise
+            logger.info(f"Chat turns already saved: {len(turns)} turns for {len(headers)} sessions")
+            return
+        
+        logger.info(f"Saved {len(turns)} chat turns for {len(headers)} sessions")
     except Exception as e:
         logger.error(f"Error saving chat messages: {str(e)}", exc_info=True)
         raise
 
-async def get_chat_history(organization_id: str, session_id: str) -> Optional[Dict[str, Any]]:
+def _chat_cursor(message: Dict[str, Any]) -> Optional[str]:
+    timestamp = message.get("timestamp")
+    return timestamp.isoformat() if isinstance(timestamp, datetime) else None
+
+async def _get_chat_session_header(organization_id: str, session_id: str, field_paths: List[str]):
+    doc_ref = db.collection(COLLECTION_CHAT_SESSIONS).document(session_id)
+    doc = await doc_ref.get(field_paths=["organization_id"] + field_paths)
+    
+    if not doc.exists:
+        logger.warning(f"Chat session not found: {session_id}")
+        return doc_ref, None
+    
+    data = doc.to_dict()
+    
+    # Verify organization ID
+    if data.get("organization_id") != organization_id:
+        logger.warning(f"Chat session {session_id} does not belong to organization {organization_id}")
+        return doc_ref, None
+    
+    return doc_ref, data
+
+async def get_chat_history(
+    organization_id: str,
+    session_id: str,
+    limit: int = CHAT_HISTORY_PAGE_SIZE,
+    before: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Optional[Dict[str, Any]]:
     """
-    Get chat history from Firestore
+    Get a page of chat history from Firestore, newest messages first
     
     Args:
         organization_id: Organization ID
         session_id: Chat session ID
+        limit: Maximum number of messages to return
+        before: Cursor from a previous page; only older messages are returned
+        fields: Message fields to return (timestamp is always included)
         
     Returns:
-        Chat session data dictionary or None if not found
+        Dictionary with the session ID, the messages and the cursor of the
+        next (older) page, which is None on the last page; None if the
+        session is not found
+        
+    Raises:
+        ValueError: If the cursor is invalid
     """
     try:
-        doc_ref = db.collection(COLLECTION_CHAT_SESSIONS).document(session_id)
-        doc = doc_ref.get()
+        before_timestamp = datetime.fromisoformat(before) if before else None
+        field_paths = None
+        if fields:
+            field_paths = list(dict.fromkeys(list(fields) + ["timestamp"]))
         
-        if not doc.exists:
-            logger.warning(f"Chat session not found: {session_id}")
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Chat session not found: {session_id}")
             return None
         
-        # Get data and add ID
-        data = doc.to_dict()
+        doc_ref, header = await _get_chat_session_header(organization_id, session_id, [])
+        if header is None:
+            return None
         
-        # Verify organization ID
-        if data.get("organization_id") != organization_id:
-            logger.warning(f"Chat session {session_id} does not belong to organization {organization_id}")
+        query = doc_ref.collection(CHAT_MESSAGES_SUBCOLLECTION).order_by(
+            "timestamp", direction=firestore.Query.DESCENDING
+        )
+        if field_paths:
+            query = query.select(field_paths)
+        if before_timestamp:
+            query = query.start_after({"timestamp": before_timestamp})
+        
+        # Fetch one extra message to know whether there is another page
+        messages = []
+        async for message in query.limit(limit + 1).stream():
+            messages.append({"id": message.id, **message.to_dict()})
+        
+        if len(messages) <= limit:
+            # Sessions written before messages moved to the subcollection keep
+            # the oldest ones embedded in the header
+            legacy = await doc_ref.get(field_paths=["messages"])
+            older = [
+                message for message in reversed((legacy.to_dict() or {}).get("messages", []))
+                if before_timestamp is None or message["timestamp"] < before_timestamp
+            ]
+            if field_paths:
+                older = [{k: v for k, v in message.items() if k in field_paths} for message in older]
+            messages.extend(older[:limit + 1 - len(messages)])
+        
+        has_more = len(messages) > limit
+        messages = messages[:limit]
+        
+        logger.info(f"Retrieved {len(messages)} chat messages for session: {session_id}")
+        return {
+            "id": session_id,
+            "organization_id": organization_id,
+            "messages": messages,
+            "next_cursor": _chat_cursor(messages[-1]) if has_more else None
+        }
+    except ValueError:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting chat history: {str(e)}", exc_info=True)
+        raise
+
+async def get_chat_session_summary(organization_id: str, session_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a chat session's header and latest message without its history
+    
+    Args:
+        organization_id: Organization ID
+        session_id: Chat session ID
+        
+    Returns:
+        Session summary dictionary or None if not found
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            logger.info(f"[MOCK] Chat session not found: {session_id}")
             return None
         
-        data["id"] = session_id
+        doc_ref, header = await _get_chat_session_header(
+            organization_id, session_id, ["message_count", "created_at", "updated_at"]
+        )
+        if header is None:
+            return None
         
-        logger.info(f"Retrieved chat history for session: {session_id}")
-        return data
+        query = doc_ref.collection(CHAT_MESSAGES_SUBCOLLECTION).order_by(
+            "timestamp", direction=firestore.Query.DESCENDING
+        ).limit(1)
+        last_message = None
+        async for message in query.stream():
+            last_message = {"id": message.id, **message.to_dict()}
+        
+        header["id"] = session_id
+        header["last_message"] = last_message
+        
+        logger.info(f"Retrieved chat session summary for session: {session_id}")
+        return header
     except Exception as e:
-        logger.error(f"Error getting chat history: {str(e)}", exc_info=True)
-        raise 
\ No newline at end of file
+        logger.error(f"Error getting chat session summary: {str(e)}", exc_info=True)
+        raise
+
+async def get_chat_message_count(organization_id: str, session_id: str) -> Optional[int]:
+    """
+    Get the number of messages saved in a chat session, reading only its header
+    
+    Args:
+        organization_id: Organization ID
+        session_id: Chat session ID
+        
+    Returns:
+        Message count or None if the session or its count is not found
+    """
+    try:
+        if db is None:
+            # Mock implementation for development
+            return None
+        
+        _, header = await _get_chat_session_header(organization_id, session_id, ["message_count"])
+        return (header or {}).get("message_count")
+    except Exception as e:
+        logger.error(f"Error getting chat message count: {str(e)}", exc_info=True)
+        raise
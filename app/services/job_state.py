@@ -0,0 +1,149 @@
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+from app.services.cache import TTLCache
+from app.services.firestore import db
+
+logger = logging.getLogger(__name__)
+
+# State backend: "firestore" (shared across instances, falls back to memory without Firestore) or "memory"
+JOB_STATE_BACKEND = os.getenv("JOB_STATE_BACKEND", "firestore").lower()
+COLLECTION_JOB_STATE = os.getenv("FIRESTORE_COLLECTION_JOB_STATE", "job_state")
+
+# Entries kept in memory, and seconds a job's state lives after its last update
+JOB_STATE_MAX_ENTRIES = int(os.getenv("JOB_STATE_MAX_ENTRIES", "1000"))
+JOB_STATE_TTL = float(os.getenv("JOB_STATE_TTL", "3600"))
+
+# Job kinds
+EVALUATION_STATE = "evaluation"
+DOCUMENT_GENERATION_STATE = "document_generation"
+
+class JobStateStore:
+    """
+    Short-lived progress state of running evaluations and document generations
+    """
+
+    async def get(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's state
+
+        Args:
+            kind: Job kind (EVALUATION_STATE or DOCUMENT_GENERATION_STATE)
+            job_id: Evaluation or document generation ID
+
+        Returns:
+            State dictionary or None if unknown or expired
+        """
+        raise NotImplementedError("Subclasses must implement get")
+
+    async def set(self, kind: str, job_id: str, state: Dict[str, Any]):
+        """
+        Replace a job's state, restarting its time to live
+
+        Args:
+            kind: Job kind
+            job_id: Evaluation or document generation ID
+            state: State dictionary (organization_id, status, progress)
+        """
+        raise NotImplementedError("Subclasses must implement set")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Store statistics
+
+        Returns:
+            Backend name and counters
+        """
+        return {}
+
+class MemoryJobStateStore(JobStateStore):
+    """
+    Per-process job state in a bounded TTL cache
+    """
+
+    def __init__(self, max_entries: int = JOB_STATE_MAX_ENTRIES, ttl: float = JOB_STATE_TTL):
+        """
+        Initialize memory store
+
+        Args:
+            max_entries: Jobs kept before the least recently used are evicted
+            ttl: Seconds a job's state lives after its last update
+        """
+        self.cache = TTLCache(max_entries, default_ttl=ttl)
+
+    async def get(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        state = self.cache.get((kind, job_id))
+        return dict(state) if state is not None else None
+
+    async def set(self, kind: str, job_id: str, state: Dict[str, Any]):
+        self.cache.set((kind, job_id), dict(state))
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.cache.stats(), backend="memory")
+
+class FirestoreJobStateStore(JobStateStore):
+    """
+    Job state shared by every instance through a Firestore collection
+
+    Documents carry an expires_at timestamp; configure a Firestore TTL policy
+    on that field so expired state is deleted. Reads ignore expired documents
+    either way.
+    """
+
+    def __init__(self, client, collection: str = COLLECTION_JOB_STATE, ttl: float = JOB_STATE_TTL):
+        """
+        Initialize Firestore store
+
+        Args:
+            client: Async Firestore client
+            collection: Collection name
+            ttl: Seconds a job's state lives after its last update
+        """
+        self.collection = client.collection(collection)
+        self.ttl = ttl
+        self.reads = 0
+        self.writes = 0
+
+    def _document(self, kind: str, job_id: str):
+        return self.collection.document(f"{kind}-{job_id}")
+
+    async def get(self, kind: str, job_id: str) -> Optional[Dict[str, Any]]:
+        self.reads += 1
+        doc = await self._document(kind, job_id).get()
+        if not doc.exists:
+            return None
+
+        data = doc.to_dict()
+        expires_at = data.pop("expires_at", None)
+        if expires_at is not None and expires_at <= datetime.now(timezone.utc):
+            return None
+        return data
+
+    async def set(self, kind: str, job_id: str, state: Dict[str, Any]):
+        self.writes += 1
+        expires_at = datetime.fromtimestamp(time.time() + self.ttl, tz=timezone.utc)
+        await self._document(kind, job_id).set(dict(state, expires_at=expires_at))
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "firestore", "reads": self.reads, "writes": self.writes}
+
+_store: Optional[JobStateStore] = None
+
+def get_job_state_store() -> JobStateStore:
+    """
+    Get the shared job state store
+
+    Returns:
+        Job state store for the configured backend
+    """
+    global _store
+    if _store is None:
+        if JOB_STATE_BACKEND == "firestore" and db is not None:
+            _store = FirestoreJobStateStore(db)
+        else:
+            if JOB_STATE_BACKEND == "firestore":
+                logger.info("Firestore unavailable, using in-memory job state")
+            _store = MemoryJobStateStore()
+    return _store
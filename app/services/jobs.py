@@ -0,0 +1,778 @@
+import logging
+import os
+import json
+import time
+import uuid
+import random
+import socket
+import asyncio
+import sqlite3
+import threading
+from typing import Dict, Any, Optional, List, Callable, Awaitable
+from google.cloud import firestore
+from app.models.job import Job, JobStatus
+from app.services.firestore import db
+
+logger = logging.getLogger(__name__)
+
+# Queue backend: "firestore" (falls back to SQLite without Firestore) or "sqlite"
+JOB_QUEUE_BACKEND = os.getenv("JOB_QUEUE_BACKEND", "firestore").lower()
+JOB_QUEUE_SQLITE_PATH = os.getenv("JOB_QUEUE_SQLITE_PATH", "data/jobs.db")
+COLLECTION_JOBS = os.getenv("FIRESTORE_COLLECTION_JOBS", "jobs")
+
+# Seconds a worker holds a job before another worker may take it over
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))
+
+# Attempts before a job is marked dead, and the retry backoff bounds in seconds
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "5"))
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "300"))
+
+# Seconds an idle worker waits before polling the queue again
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+
+# Seconds between heartbeats of a running job, and heartbeat age after which it counts as stalled
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "30"))
+JOB_STALL_SECONDS = float(os.getenv("JOB_STALL_SECONDS", "300"))
+
+# Seconds between sweeps for stalled jobs
+JOB_SWEEP_INTERVAL = float(os.getenv("JOB_SWEEP_INTERVAL", "60"))
+
+# Workers started inside the API process (0 leaves all work to app.worker)
+JOB_IN_PROCESS_WORKERS = int(os.getenv("JOB_IN_PROCESS_WORKERS", "1"))
+
+# Job types
+EVALUATION_JOB = "evaluation"
+DOCUMENT_GENERATION_JOB = "document_generation"
+
+# Statuses a job can be leased from; a leased job is claimable once its lease expires
+CLAIMABLE_STATUSES = [JobStatus.QUEUED.value, JobStatus.LEASED.value]
+
+def retry_delay(attempts: int) -> float:
+    """
+    Backoff before the next attempt of a failed job
+
+    Args:
+        attempts: Attempts made so far
+
+    Returns:
+        Delay in seconds, exponential with jitter
+    """
+    delay = min(JOB_RETRY_MAX_DELAY, JOB_RETRY_BASE_DELAY * (2 ** max(0, attempts - 1)))
+    return delay * (0.5 + random.random() / 2)
+
+async def send_heartbeats(beat: Callable[[], Awaitable[Any]], interval: float = JOB_HEARTBEAT_SECONDS):
+    """
+    Record a running job's heartbeat periodically until cancelled
+
+    Args:
+        beat: Coroutine function that records the heartbeat
+        interval: Seconds between heartbeats
+    """
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await beat()
+        except Exception as e:
+            logger.warning(f"Error recording job heartbeat: {str(e)}")
+
+class JobQueue:
+    """
+    Persistent job queue with at-least-once delivery
+
+    A worker leases a job for JOB_LEASE_SECONDS. A job whose lease expires
+    before it is completed or failed, for example because its worker died,
+    is handed to another worker. Handlers must therefore be safe to re-run.
+    """
+
+    backend = "base"
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> str:
+        """
+        Add a job to the queue
+
+        Args:
+            job_type: Job type
+            payload: Handler arguments (JSON-serializable)
+            job_id: Job ID (enqueueing an existing ID again is a no-op)
+            max_attempts: Attempts before the job is given up on
+
+        Returns:
+            Job ID
+        """
+        raise NotImplementedError("Subclasses must implement enqueue")
+
+    async def lease(self, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Job]:
+        """
+        Take the next available job
+
+        Args:
+            worker_id: ID of the leasing worker
+            lease_seconds: Lease duration
+
+        Returns:
+            Leased job or None if the queue is empty
+        """
+        raise NotImplementedError("Subclasses must implement lease")
+
+    async def extend_lease(self, job: Job, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        """
+        Extend the lease of a running job
+
+        Args:
+            job: Leased job
+            lease_seconds: New lease duration from now
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        raise NotImplementedError("Subclasses must implement extend_lease")
+
+    async def complete(self, job: Job) -> bool:
+        """
+        Mark a leased job as succeeded
+
+        Args:
+            job: Leased job
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        raise NotImplementedError("Subclasses must implement complete")
+
+    async def fail(self, job: Job, error: str) -> bool:
+        """
+        Record a failed attempt, re-queueing the job with backoff or marking it dead
+
+        Args:
+            job: Leased job
+            error: Error description
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        raise NotImplementedError("Subclasses must implement fail")
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        """
+        Get a job
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            Job or None if not found
+        """
+        raise NotImplementedError("Subclasses must implement get")
+
+    async def requeue(
+        self,
+        job_id: str,
+        job_type: str,
+        payload: Dict[str, Any],
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> str:
+        """
+        Put a job back in the queue with fresh attempts, whatever its state
+
+        Any current lease is revoked, so a stuck worker can no longer
+        complete the job.
+
+        Args:
+            job_id: Job ID
+            job_type: Job type
+            payload: Handler arguments
+            max_attempts: Attempts before the job is given up on
+
+        Returns:
+            Job ID
+        """
+        raise NotImplementedError("Subclasses must implement requeue")
+
+    def _new_job(self, job_id: Optional[str], job_type: str, payload: Dict[str, Any], max_attempts: int) -> Job:
+        now = time.time()
+        return Job(
+            id=job_id or str(uuid.uuid4()),
+            type=job_type,
+            payload=payload,
+            max_attempts=max_attempts,
+            available_at=now,
+            created_at=now,
+            updated_at=now
+        )
+
+    def _failure_update(self, job: Job, error: str, now: float) -> Dict[str, Any]:
+        if job.attempts >= job.max_attempts:
+            logger.error(f"Job {job.id} ({job.type}) failed {job.attempts} times, giving up: {error}")
+            return {"status": JobStatus.DEAD.value, "lease_id": None, "last_error": error, "updated_at": now}
+
+        delay = retry_delay(job.attempts)
+        logger.warning(f"Job {job.id} ({job.type}) failed attempt {job.attempts}, retrying in {delay:.1f}s: {error}")
+        return {
+            "status": JobStatus.QUEUED.value,
+            "available_at": now + delay,
+            "lease_id": None,
+            "lease_owner": None,
+            "last_error": error,
+            "updated_at": now
+        }
+
+    def close(self):
+        """
+        Release backend resources
+        """
+        return None
+
+class SQLiteJobQueue(JobQueue):
+    """
+    Job queue in a local SQLite database, for single-machine runs
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path: str = JOB_QUEUE_SQLITE_PATH):
+        """
+        Initialize the queue
+
+        Args:
+            path: SQLite database path
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, type TEXT, payload TEXT, status TEXT, attempts INTEGER, max_attempts INTEGER, "
+            "available_at REAL, lease_id TEXT, lease_owner TEXT, last_error TEXT, created_at REAL, updated_at REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_claimable ON jobs (status, available_at)")
+
+    def _fetch(self, job_id: str) -> Optional[Job]:
+        cursor = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        data = dict(zip([c[0] for c in cursor.description], row))
+        data["payload"] = json.loads(data["payload"])
+        return Job.from_dict(data.pop("id"), data)
+
+    def _enqueue(self, job: Job, replace: bool = False) -> str:
+        data = job.to_dict()
+        data["payload"] = json.dumps(data["payload"])
+        columns = ["id"] + list(data)
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+                [job.id] + list(data.values())
+            )
+        return job.id
+
+    def _lease(self, worker_id: str, lease_seconds: float) -> Optional[Job]:
+        now = time.time()
+        with self._lock:
+            # IMMEDIATE takes the write lock up front so two processes cannot claim the same job
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status IN (?, ?) AND available_at <= ? ORDER BY available_at LIMIT 1",
+                    (*CLAIMABLE_STATUSES, now)
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+
+                job = self._fetch(row[0])
+                if job.status == JobStatus.LEASED and job.attempts >= job.max_attempts:
+                    # The last attempt's worker never reported back
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, lease_id = NULL, last_error = ?, updated_at = ? WHERE id = ?",
+                        (JobStatus.DEAD.value, "Lease expired on final attempt", now, job.id)
+                    )
+                    self._conn.execute("COMMIT")
+                    logger.error(f"Job {job.id} ({job.type}) lease expired on final attempt, giving up")
+                    return None
+
+                lease_id = str(uuid.uuid4())
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, available_at = ?, lease_id = ?, "
+                    "lease_owner = ?, updated_at = ? WHERE id = ?",
+                    (JobStatus.LEASED.value, now + lease_seconds, lease_id, worker_id, now, job.id)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        job.status = JobStatus.LEASED
+        job.attempts += 1
+        job.available_at = now + lease_seconds
+        job.lease_id = lease_id
+        job.lease_owner = worker_id
+        return job
+
+    def _update_leased(self, job: Job, update: Dict[str, Any]) -> bool:
+        assignments = ", ".join(f"{column} = ?" for column in update)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE id = ? AND lease_id = ?",
+                list(update.values()) + [job.id, job.lease_id]
+            )
+        return cursor.rowcount == 1
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> str:
+        job = self._new_job(job_id, job_type, payload, max_attempts)
+        return await asyncio.to_thread(self._enqueue, job)
+
+    async def requeue(
+        self,
+        job_id: str,
+        job_type: str,
+        payload: Dict[str, Any],
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> str:
+        job = self._new_job(job_id, job_type, payload, max_attempts)
+        return await asyncio.to_thread(self._enqueue, job, True)
+
+    async def lease(self, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Job]:
+        return await asyncio.to_thread(self._lease, worker_id, lease_seconds)
+
+    async def extend_lease(self, job: Job, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        now = time.time()
+        return await asyncio.to_thread(self._update_leased, job, {"available_at": now + lease_seconds, "updated_at": now})
+
+    async def complete(self, job: Job) -> bool:
+        update = {"status": JobStatus.SUCCEEDED.value, "lease_id": None, "last_error": None, "updated_at": time.time()}
+        return await asyncio.to_thread(self._update_leased, job, update)
+
+    async def fail(self, job: Job, error: str) -> bool:
+        return await asyncio.to_thread(self._update_leased, job, self._failure_update(job, error, time.time()))
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        def fetch():
+            with self._lock:
+                return self._fetch(job_id)
+        return await asyncio.to_thread(fetch)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class FirestoreJobQueue(JobQueue):
+    """
+    Job queue in a Firestore collection, shared by every instance and worker
+
+    Leasing queries status and available_at together, which needs a
+    composite index on (status, available_at) in the jobs collection.
+    """
+
+    backend = "firestore"
+
+    def __init__(self, client: Any, collection: str = COLLECTION_JOBS):
+        """
+        Initialize the queue
+
+        Args:
+            client: Async Firestore client
+            collection: Jobs collection name
+        """
+        self.client = client
+        self.collection = client.collection(collection)
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        job_id: Optional[str] = None,
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> str:
+        job = self._new_job(job_id, job_type, payload, max_attempts)
+        try:
+            await self.collection.document(job.id).create(job.to_dict())
+        except Exception as e:
+            # Enqueueing an existing job ID again is a no-op
+            if type(e).__name__ != "AlreadyExists":
+                raise
+        return job.id
+
+    async def requeue(
+        self,
+        job_id: str,
+        job_type: str,
+        payload: Dict[str, Any],
+        max_attempts: int = JOB_MAX_ATTEMPTS
+    ) -> str:
+        job = self._new_job(job_id, job_type, payload, max_attempts)
+        await self.collection.document(job.id).set(job.to_dict())
+        return job.id
+
+    async def lease(self, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS) -> Optional[Job]:
+        now = time.time()
+        candidates = (
+            self.collection
+            .where("status", "in", CLAIMABLE_STATUSES)
+            .where("available_at", "<=", now)
+            .order_by("available_at")
+            .limit(5)
+            .stream()
+        )
+
+        async for snapshot in candidates:
+            lease_id = str(uuid.uuid4())
+
+            @firestore.async_transactional
+            async def claim(transaction, ref):
+                current = await ref.get(transaction=transaction)
+                data = current.to_dict() if current.exists else None
+                # Another worker may have claimed it since the query
+                if not data or data["status"] not in CLAIMABLE_STATUSES or data["available_at"] > now:
+                    return None
+                if data["status"] == JobStatus.LEASED.value and data["attempts"] >= data["max_attempts"]:
+                    transaction.update(ref, {
+                        "status": JobStatus.DEAD.value,
+                        "lease_id": None,
+                        "last_error": "Lease expired on final attempt",
+                        "updated_at": now
+                    })
+                    logger.error(f"Job {ref.id} ({data['type']}) lease expired on final attempt, giving up")
+                    return None
+                update = {
+                    "status": JobStatus.LEASED.value,
+                    "attempts": data["attempts"] + 1,
+                    "available_at": now + lease_seconds,
+                    "lease_id": lease_id,
+                    "lease_owner": worker_id,
+                    "updated_at": now
+                }
+                transaction.update(ref, update)
+                data.update(update)
+                return Job.from_dict(ref.id, data)
+
+            job = await claim(self.client.transaction(), snapshot.reference)
+            if job is not None:
+                return job
+
+        return None
+
+    async def _update_leased(self, job: Job, update: Dict[str, Any]) -> bool:
+        ref = self.collection.document(job.id)
+
+        @firestore.async_transactional
+        async def apply(transaction):
+            current = await ref.get(transaction=transaction)
+            if not current.exists or current.to_dict().get("lease_id") != job.lease_id:
+                return False
+            transaction.update(ref, update)
+            return True
+
+        return await apply(self.client.transaction())
+
+    async def extend_lease(self, job: Job, lease_seconds: float = JOB_LEASE_SECONDS) -> bool:
+        now = time.time()
+        return await self._update_leased(job, {"available_at": now + lease_seconds, "updated_at": now})
+
+    async def complete(self, job: Job) -> bool:
+        update = {"status": JobStatus.SUCCEEDED.value, "lease_id": None, "last_error": None, "updated_at": time.time()}
+        return await self._update_leased(job, update)
+
+    async def fail(self, job: Job, error: str) -> bool:
+        return await self._update_leased(job, self._failure_update(job, error, time.time()))
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        snapshot = await self.collection.document(job_id).get()
+        return Job.from_dict(job_id, snapshot.to_dict()) if snapshot.exists else None
+
+_queue: Optional[JobQueue] = None
+_queue_lock = threading.Lock()
+
+def get_job_queue() -> JobQueue:
+    """
+    Get the process-wide job queue
+
+    Returns:
+        Job queue for the configured backend
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                if JOB_QUEUE_BACKEND == "firestore" and db is not None:
+                    _queue = FirestoreJobQueue(db)
+                else:
+                    if JOB_QUEUE_BACKEND == "firestore":
+                        logger.warning("Firestore unavailable, using SQLite job queue")
+                    _queue = SQLiteJobQueue()
+                logger.info(f"Using {_queue.backend} job queue")
+    return _queue
+
+class JobWorker:
+    """
+    Worker that leases jobs and runs their handlers
+
+    The lease is renewed while the handler runs; if it is lost to another
+    worker the handler is cancelled. A failed handler is retried with
+    backoff up to the job's max attempts; handlers are told whether they
+    run the final attempt, so they only report failure once it is final.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        handlers: Dict[str, Callable[[Dict[str, Any], bool], Awaitable[Any]]],
+        worker_id: Optional[str] = None,
+        poll_interval: float = JOB_POLL_INTERVAL,
+        lease_seconds: float = JOB_LEASE_SECONDS
+    ):
+        """
+        Initialize worker
+
+        Args:
+            queue: Job queue
+            handlers: Coroutine function per job type, called with the job
+                payload and whether this is the job's final attempt
+            worker_id: Worker ID used as lease owner
+            poll_interval: Seconds between polls of an empty queue
+            lease_seconds: Lease duration
+        """
+        self.queue = queue
+        self.handlers = handlers
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._stopping = False
+        self.processed = 0
+        self.failed = 0
+        self.lost_leases = 0
+
+    async def _renew(self, job: Job, handler_task: asyncio.Future) -> bool:
+        # Renew well before expiry so a slow renewal does not lose the lease
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            if not await self.queue.extend_lease(job, self.lease_seconds):
+                # Another worker may own the job now; stop running it here
+                logger.warning(f"Worker {self.worker_id} lost lease on job {job.id}, cancelling it")
+                self.lost_leases += 1
+                handler_task.cancel()
+                return True
+
+    async def run_job(self, job: Job):
+        """
+        Run one leased job and report its outcome
+
+        Args:
+            job: Leased job
+        """
+        handler = self.handlers.get(job.type)
+        if handler is None:
+            await self.queue.fail(job, f"No handler for job type: {job.type}")
+            return
+
+        logger.info(f"Worker {self.worker_id} running job {job.id} ({job.type}), attempt {job.attempts}")
+        task = asyncio.ensure_future(handler(job.payload, job.attempts >= job.max_attempts))
+        renewal = asyncio.ensure_future(self._renew(job, task))
+        try:
+            await task
+        except asyncio.CancelledError:
+            if renewal.done() and not renewal.cancelled() and renewal.result():
+                return
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Job {job.id} ({job.type}) failed: {str(e)}", exc_info=True)
+            await self.queue.fail(job, str(e))
+            return
+        finally:
+            renewal.cancel()
+
+        if not await self.queue.complete(job):
+            self.lost_leases += 1
+            logger.warning(f"Worker {self.worker_id} finished job {job.id} after losing its lease; not marking it succeeded")
+            return
+        self.processed += 1
+
+    async def run(self):
+        """
+        Lease and run jobs until stopped
+        """
+        logger.info(f"Worker {self.worker_id} started on {self.queue.backend} queue")
+        while not self._stopping:
+            try:
+                job = await self.queue.lease(self.worker_id, self.lease_seconds)
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} failed to lease a job: {str(e)}", exc_info=True)
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            await self.run_job(job)
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    def stop(self):
+        """
+        Stop after the current job
+        """
+        self._stopping = True
+
+class JobSweeper:
+    """
+    Re-queues jobs whose records have stopped sending heartbeats
+
+    Each source reports the jobs behind its in-progress records whose
+    heartbeat is older than JOB_STALL_SECONDS, through
+    find_stalled_jobs(stall_seconds) returning dictionaries with job_id,
+    job_type and payload, and marks records failed through
+    fail_stalled_job(payload, error) when their job has been given up on.
+    """
+
+    def __init__(self, queue: JobQueue, sources: List[Any], interval: float = JOB_SWEEP_INTERVAL, stall_seconds: float = JOB_STALL_SECONDS):
+        """
+        Initialize sweeper
+
+        Args:
+            queue: Job queue
+            sources: Services owning job records
+            interval: Seconds between sweeps
+            stall_seconds: Heartbeat age after which a job counts as stalled
+        """
+        self.queue = queue
+        self.sources = sources
+        self.interval = interval
+        self.stall_seconds = stall_seconds
+        self.requeued = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def sweep(self) -> int:
+        """
+        Re-queue stalled jobs once
+
+        Returns:
+            Number of jobs re-queued
+        """
+        requeued = 0
+        for source in self.sources:
+            for stalled in await source.find_stalled_jobs(self.stall_seconds):
+                job = await self.queue.get(stalled["job_id"])
+                if job is not None and job.status == JobStatus.QUEUED:
+                    # Already waiting for a worker (possibly in retry backoff)
+                    continue
+                if job is not None and job.status == JobStatus.DEAD:
+                    await source.fail_stalled_job(stalled["payload"], job.last_error or "Job gave up")
+                    continue
+
+                logger.warning(f"Re-queueing stalled job {stalled['job_id']} ({stalled['job_type']})")
+                await self.queue.requeue(stalled["job_id"], stalled["job_type"], stalled["payload"])
+                requeued += 1
+
+        self.requeued += requeued
+        return requeued
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                logger.error(f"Error sweeping for stalled jobs: {str(e)}", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get sweeper counters
+
+        Returns:
+            Jobs re-queued since start
+        """
+        return {"requeued": self.requeued}
+
+    def start(self):
+        """
+        Start sweeping periodically on the running loop
+        """
+        self._task = asyncio.ensure_future(self._loop())
+
+    async def stop(self):
+        """
+        Stop sweeping
+        """
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+class WorkerPool:
+    """
+    Runs several workers on one event loop
+    """
+
+    def __init__(self, queue: JobQueue, handlers: Dict[str, Callable[[Dict[str, Any], bool], Awaitable[Any]]], size: int):
+        """
+        Initialize worker pool
+
+        Args:
+            queue: Job queue
+            handlers: Coroutine function per job type
+            size: Number of workers
+        """
+        self.workers = [JobWorker(queue, handlers) for _ in range(size)]
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """
+        Start the workers as tasks on the running loop
+        """
+        self._tasks = [asyncio.ensure_future(worker.run()) for worker in self.workers]
+
+    async def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the workers, letting running jobs finish within the timeout
+
+        Jobs cut off by the timeout are picked up again once their lease expires.
+
+        Args:
+            timeout: Seconds to wait for running jobs (None waits indefinitely)
+        """
+        for worker in self.workers:
+            worker.stop()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(self._tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    async def wait(self):
+        """
+        Wait until every worker has stopped
+        """
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Worker statistics
+
+        Returns:
+            Per-worker processed, failed and lost-lease job counts
+        """
+        return {
+            worker.worker_id: {"processed": worker.processed, "failed": worker.failed, "lost_leases": worker.lost_leases}
+            for worker in self.workers
+        }
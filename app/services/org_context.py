@@ -0,0 +1,206 @@
+import logging
+import os
+import time
+import asyncio
+from typing import Dict, Any, List, Optional, Set
+from app.services.cache import TTLCache
+from app.services.firestore import (
+    get_organization_data,
+    get_latest_evaluation,
+    get_organization_context,
+    save_organization_context
+)
+
+logger = logging.getLogger(__name__)
+
+# Seconds an instance serves its in-memory copy before re-reading the materialised one
+ORG_CONTEXT_TTL = float(os.getenv("ORG_CONTEXT_TTL", "60"))
+ORG_CONTEXT_MAX_ENTRIES = int(os.getenv("ORG_CONTEXT_MAX_ENTRIES", "1000"))
+
+# Profile fields described in the context, in order
+PROFILE_FIELDS = [
+    ("name", "Name"),
+    ("industry", "Industry"),
+    ("size", "Size"),
+    ("annual_revenue", "Annual revenue"),
+    ("certification_scope", "Certification scope")
+]
+
+# Weaknesses and recommendations listed per certification
+MAX_CONTEXT_ITEMS = 5
+
+def build_org_context(organization: Dict[str, Any], evaluation: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Build the prompt context of an organization
+
+    Args:
+        organization: Organization data
+        evaluation: Latest completed evaluation, if any
+
+    Returns:
+        Organization context with its organization ID, version, name,
+        evaluation ID and prompt text
+    """
+    lines = ["Organization profile:"]
+    for field, label in PROFILE_FIELDS:
+        if organization.get(field):
+            lines.append(f"- {label}: {organization[field]}")
+
+    certifications: List[Dict[str, Any]] = (evaluation or {}).get("certification_evaluations", [])
+    if certifications:
+        lines.append("")
+        lines.append("Latest readiness evaluation:")
+        for certification in certifications:
+            lines.append(f"- {certification['certification_type']}: {certification.get('overall_score', 0)}% ({certification.get('summary', '')})")
+            weaknesses = certification.get("weaknesses", [])[:MAX_CONTEXT_ITEMS]
+            if weaknesses:
+                lines.append(f"  Weaknesses: {'; '.join(weaknesses)}")
+            recommendations = certification.get("recommendations", [])[:MAX_CONTEXT_ITEMS]
+            if recommendations:
+                lines.append(f"  Recommendations: {'; '.join(recommendations)}")
+
+    return {
+        "organization_id": organization["id"],
+        # Milliseconds since the epoch, so later builds have higher versions
+        "version": int(time.time() * 1000),
+        "name": organization.get("name", ""),
+        "evaluation_id": (evaluation or {}).get("id"),
+        "text": "\n".join(lines)
+    }
+
+class OrgContextStore:
+    """
+    Serves each organization's profile and latest evaluation as prompt context
+
+    The context is built once, when the organization is saved or one of its
+    evaluations completes, and materialised in Firestore, so building a
+    prompt costs at most one read instead of reading the profile and every
+    completed evaluation. Instances keep a copy in memory for ORG_CONTEXT_TTL
+    seconds and never replace a copy with an older version.
+    """
+
+    def __init__(self, ttl: float = ORG_CONTEXT_TTL, max_entries: int = ORG_CONTEXT_MAX_ENTRIES):
+        """
+        Initialize organization context store
+
+        Args:
+            ttl: Seconds a copy is served from memory
+            max_entries: Organizations kept in memory
+        """
+        self.cache = TTLCache(max_entries, default_ttl=ttl)
+        self.builds = 0
+        self.loads = 0
+        # Background rebuilds, referenced until they finish
+        self._tasks: Set[asyncio.Task] = set()
+
+    def _remember(self, context: Dict[str, Any]):
+        current = self.cache.get(context["organization_id"])
+        if current is not None and current["version"] > context["version"]:
+            return
+        self.cache.set(context["organization_id"], context)
+
+    async def get(self, organization_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get an organization's context, building it if it has never been built
+
+        Args:
+            organization_id: Organization ID
+
+        Returns:
+            Organization context or None if the organization does not exist
+        """
+        context = self.cache.get(organization_id)
+        if context is not None:
+            return context
+
+        try:
+            context = await get_organization_context(organization_id)
+            self.loads += 1
+        except Exception as e:
+            logger.warning(f"Error loading organization context for {organization_id}: {str(e)}")
+
+        if context is None:
+            return await self.rebuild(organization_id)
+
+        self._remember(context)
+        return context
+
+    async def rebuild(self, organization_id: str, evaluation: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Build and materialise an organization's context
+
+        Args:
+            organization_id: Organization ID
+            evaluation: Evaluation that just completed (read from Firestore if omitted)
+
+        Returns:
+            Organization context or None if the organization does not exist
+        """
+        if evaluation is None:
+            organization, evaluation = await asyncio.gather(
+                get_organization_data(organization_id),
+                get_latest_evaluation(organization_id)
+            )
+        else:
+            organization = await get_organization_data(organization_id)
+
+        if organization is None:
+            return None
+
+        context = build_org_context(organization, evaluation)
+        try:
+            await save_organization_context(context)
+        except Exception as e:
+            # Still usable by this instance; others rebuild on their next miss
+            logger.warning(f"Error saving organization context for {organization_id}: {str(e)}")
+
+        self._remember(context)
+        self.builds += 1
+        logger.info(f"Built organization context version {context['version']} for {organization_id}")
+        return context
+
+    def schedule_rebuild(self, organization_id: str):
+        """
+        Rebuild an organization's context in the background
+
+        Args:
+            organization_id: Organization ID
+        """
+        self.cache.delete(organization_id)
+
+        async def rebuild():
+            try:
+                await self.rebuild(organization_id)
+            except Exception as e:
+                logger.warning(f"Error rebuilding organization context for {organization_id}: {str(e)}")
+
+        task = asyncio.ensure_future(rebuild())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get organization context statistics
+
+        Returns:
+            Memory cache counters, builds and Firestore loads
+        """
+        return {
+            "cache": self.cache.stats(),
+            "builds": self.builds,
+            "loads": self.loads
+        }
+
+_store: Optional[OrgContextStore] = None
+
+def get_org_context_store() -> OrgContextStore:
+    """
+    Get the process-wide organization context store
+
+    Returns:
+        Organization context store
+    """
+    global _store
+    if _store is None:
+        _store = OrgContextStore()
+    return _store
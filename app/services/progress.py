@@ -0,0 +1,124 @@
+import logging
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, Set, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before the oldest are dropped
+PROGRESS_QUEUE_SIZE = int(os.getenv("PROGRESS_QUEUE_SIZE", "100"))
+
+# Events after which a job publishes nothing more
+TERMINAL_EVENTS = {"completed", "failed"}
+
+def progress_topic(kind: str, job_id: str) -> str:
+    """
+    Topic a job publishes its progress on
+
+    Args:
+        kind: Job kind (EVALUATION_STATE or DOCUMENT_GENERATION_STATE)
+        job_id: Evaluation or document generation ID
+
+    Returns:
+        Topic name
+    """
+    return f"{kind}:{job_id}"
+
+def progress_event_type(status: str) -> str:
+    """
+    Event type announcing a job status
+
+    Args:
+        status: Evaluation or document generation status
+
+    Returns:
+        "completed", "failed" or "progress"
+    """
+    return status if status in TERMINAL_EVENTS else "progress"
+
+class ProgressBroker:
+    """
+    In-process publish/subscribe for job progress events
+
+    Jobs publish whether or not anyone listens; each subscriber gets its own
+    bounded queue so a slow client cannot hold up the job.
+    """
+
+    def __init__(self, queue_size: int = PROGRESS_QUEUE_SIZE):
+        """
+        Initialize broker
+
+        Args:
+            queue_size: Events buffered per subscriber
+        """
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.published = 0
+        self.dropped = 0
+
+    def publish(self, topic: str, event: Dict[str, Any]):
+        """
+        Deliver an event to every subscriber of a topic
+
+        Args:
+            topic: Topic name
+            event: Event dictionary with a "type" key
+        """
+        self.published += 1
+        for queue in self._subscribers.get(topic, ()):
+            if queue.full():
+                # Progress supersedes itself, so the oldest event is the one to lose
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, topic: str) -> AsyncIterator[asyncio.Queue]:
+        """
+        Subscribe to a topic for the duration of the context
+
+        Args:
+            topic: Topic name
+
+        Yields:
+            Queue receiving the topic's events
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        self._subscribers.setdefault(topic, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[topic]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Broker statistics
+
+        Returns:
+            Topic and subscriber counts and event counters
+        """
+        return {
+            "topics": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "published": self.published,
+            "dropped": self.dropped
+        }
+
+_broker: Optional[ProgressBroker] = None
+
+def get_progress_broker() -> ProgressBroker:
+    """
+    Get the process-wide progress broker
+
+    Returns:
+        Progress broker
+    """
+    global _broker
+    if _broker is None:
+        _broker = ProgressBroker()
+    return _broker
@@ -0,0 +1,157 @@
+import logging
+import os
+import time
+import asyncio
+from typing import Dict, Any, List, Optional
+from app.services.firestore import update_record
+
+logger = logging.getLogger(__name__)
+
+# Minimum seconds between progress writes to one record
+PROGRESS_WRITE_INTERVAL = float(os.getenv("PROGRESS_WRITE_INTERVAL", "2"))
+
+def _merge(target: Dict[str, Any], updates: Dict[str, Any]):
+    for key, value in updates.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value)
+        else:
+            target[key] = value
+
+class ProgressWriter:
+    """
+    Coalesces progress updates of a running job into field-level writes
+
+    Changed fields are merged into the record and appended items are sent
+    with ArrayUnion, instead of rewriting the whole record every step.
+    Updates are debounced to at most one write per interval; finish()
+    writes immediately. Every write also records the job's heartbeat.
+    """
+
+    def __init__(self, collection: str, record_id: str, interval: float = PROGRESS_WRITE_INTERVAL):
+        """
+        Initialize progress writer
+
+        Args:
+            collection: Collection of the record
+            record_id: Evaluation or document generation ID
+            interval: Minimum seconds between writes
+        """
+        self.collection = collection
+        self.record_id = record_id
+        self.interval = interval
+        self.writes = 0
+        self._fields: Dict[str, Any] = {}
+        self._appends: Dict[str, List[Any]] = {}
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+        self._timer_flushing = False
+        self._last_write = float("-inf")
+
+    def set(self, **fields: Any):
+        """
+        Stage field changes; nested dictionaries merge into the stored ones
+
+        Args:
+            **fields: Fields to change
+        """
+        self._stage(fields)
+        self._schedule()
+
+    def append(self, field: str, *values: Any):
+        """
+        Stage values to add to an array field
+
+        Args:
+            field: Array field name
+            *values: Values to add
+        """
+        if isinstance(self._fields.get(field), list):
+            # The array is being replaced in this write anyway
+            self._fields[field] = self._fields[field] + list(values)
+        else:
+            self._appends.setdefault(field, []).extend(values)
+        self._schedule()
+
+    def _stage(self, fields: Dict[str, Any]):
+        for field in fields:
+            # A new value supersedes items still waiting to be appended
+            self._appends.pop(field, None)
+        _merge(self._fields, fields)
+
+    def _schedule(self):
+        if self._timer is None or self._timer.done():
+            self._timer = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        # Wait out the interval since the last write, whenever that happened
+        while True:
+            delay = self._last_write + self.interval - time.monotonic()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        # From here on close() lets the write finish instead of cancelling it
+        self._timer_flushing = True
+        try:
+            await self.flush()
+        except Exception as e:
+            # The staged changes are kept and go out with the next write
+            logger.warning(f"Error writing progress of {self.record_id}: {str(e)}")
+        finally:
+            self._timer_flushing = False
+
+    async def flush(self, force: bool = False):
+        """
+        Write staged changes now
+
+        Args:
+            force: Write the heartbeat even if nothing else changed
+        """
+        async with self._lock:
+            if not (self._fields or self._appends or force):
+                return
+
+            fields, appends = self._fields, self._appends
+            self._fields, self._appends = {}, {}
+            fields["heartbeat_at"] = time.time()
+            try:
+                await update_record(self.collection, self.record_id, fields, appends)
+            except BaseException:
+                # Put the changes back underneath anything staged meanwhile,
+                # also when the write is cancelled
+                _merge(fields, self._fields)
+                for field, values in self._appends.items():
+                    appends.setdefault(field, []).extend(values)
+                self._fields, self._appends = fields, appends
+                raise
+
+            self._last_write = time.monotonic()
+            self.writes += 1
+
+    async def heartbeat(self):
+        """
+        Record the job's heartbeat along with any staged changes
+        """
+        await self.flush(force=True)
+
+    async def finish(self, **fields: Any):
+        """
+        Write a terminal state immediately, together with anything staged
+
+        Args:
+            **fields: Final field changes (status and so on)
+        """
+        self.close()
+        self._stage(fields)
+        await self.flush(force=True)
+
+    def close(self):
+        """
+        Cancel a pending debounced write
+
+        A debounced write already in progress is left to finish; the next
+        flush waits for it on the lock.
+        """
+        if self._timer is not None:
+            if not self._timer_flushing:
+                self._timer.cancel()
+            self._timer = None
@@ -5,6 +5,7 @@ document.addEventListener('DOMContentLoaded', function() {
     const orgNameInput = document.getElementById('org-name');
     const orgIndustrySelect = document.getElementById('org-industry');
     const orgSizeSelect = document.getElementById('org-size');
+    let organizationId = null;
     
     // Certification Selection
     const certificationSelect = document.getElementById('certification-select');
@@ -355,6 +356,7 @@ document.addEventListener('DOMContentLoaded', function() {
             
             if (response.ok) {
                 const result = await response.json();
+                organizationId = result.organization_id;
                 showAlert('Organization information saved successfully!', 'success');
                 // Enable the next section
                 document.getElementById('certification-section').classList.remove('disabled');
@@ -656,47 +658,60 @@ document.addEventListener('DOMContentLoaded', function() {
             // Show progress
             evaluationProgress.classList.remove('d-none');
             
-            // Poll for status
-            const statusInterval = setInterval(async () => {
-                try {
-                    const statusResponse = await fetch(`/api/evaluations/${evaluation_id}/status`);
-                    
-                    if (statusResponse.ok) {
-                        const status = await statusResponse.json();
-                        
-                        // Update progress bar
-                        evaluationProgressBar.style.width = `${status.progress}%`;
-                        evaluationProgressBar.setAttribute('aria-valuenow', status.progress);
-                        evaluationProgressBar.textContent = `${status.progress}%`;
-                        
-                        if (status.status === 'completed') {
-                            clearInterval(statusInterval);
-                            showAlert('Evaluation completed successfully!', 'success');
-                            
-                            // Get results
-                            const resultsResponse = await fetch(`/api/evaluations/${evaluation_id}/results`);
-                            
-                            if (resultsResponse.ok) {
-                                const results = await resultsResponse.json();
-                                displayResults(results);
-                                // Enable the results section
-                                document.getElementById('results-section').classList.remove('disabled');
-                            }
-                        } else if (status.status === 'failed') {
-                            clearInterval(statusInterval);
-                            showAlert('Evaluation failed. Please try again.', 'danger');
-                        }
-                    }
-                } catch (error) {
-                    clearInterval(statusInterval);
-                    showAlert(`Error: ${error.message}`, 'danger');
-                }
-            }, 2000);
+            // Stream progress as it happens
+            watchProgress(`/api/evaluation/events/${organizationId}/${evaluation_id}`, {
+                progress: event => updateEvaluationProgress(event.progress),
+                certification: event => updateEvaluationProgress(event.progress),
+                completed: event => {
+                    updateEvaluationProgress(100);
+                    showAlert('Evaluation completed successfully!', 'success');
+                    displayResults({ certifications: event.result.certification_evaluations || [] });
+                    // Enable the results section
+                    document.getElementById('results-section').classList.remove('disabled');
+                },
+                failed: () => showAlert('Evaluation failed. Please try again.', 'danger'),
+                error: event => showAlert(`Error: ${event.detail}`, 'danger')
+            });
         } catch (error) {
             showAlert(`Error: ${error.message}`, 'danger');
         }
     }
     
+    // Update the evaluation progress bar
+    function updateEvaluationProgress(progress) {
+        const percent = Math.round(progress);
+        evaluationProgressBar.style.width = `${percent}%`;
+        evaluationProgressBar.setAttribute('aria-valuenow', percent);
+        evaluationProgressBar.textContent = `${percent}%`;
+    }
+    
+    // Follow a job's progress events (Server-Sent Events) until it completes or fails
+    function watchProgress(url, handlers) {
+        const source = new EventSource(url);
+        
+        ['progress', 'certification', 'document', 'completed', 'failed'].forEach(type => {
+            source.addEventListener(type, e => {
+                const event = JSON.parse(e.data);
+                if (type === 'completed' || type === 'failed') {
+                    source.close();
+                }
+                if (handlers[type]) {
+                    handlers[type](event);
+                }
+            });
+        });
+        
+        // Server-side errors carry data; connection errors reconnect automatically
+        source.addEventListener('error', e => {
+            if (e.data) {
+                source.close();
+                handlers.error(JSON.parse(e.data));
+            }
+        });
+        
+        return source;
+    }
+    
     // Display Results
     function displayResults(results) {
         resultsContainer.innerHTML = '';
@@ -779,35 +794,19 @@ document.addEventListener('DOMContentLoaded', function() {
             
             showAlert('Document generation started. You will be notified when documents are ready.', 'info');
             
-            // Poll for status
-            const statusInterval = setInterval(async () => {
-                try {
-                    const statusResponse = await fetch(`/api/documents/generate/${document_generation_id}/status`);
-                    
-                    if (statusResponse.ok) {
-                        const status = await statusResponse.json();
-                        
-                        if (status.status === 'completed') {
-                            clearInterval(statusInterval);
-                            showAlert('Documents generated successfully!', 'success');
-                            
-                            // Get document list
-                            const documentsResponse = await fetch('/api/documents');
-                            
-                            if (documentsResponse.ok) {
-                                const documents = await documentsResponse.json();
-                                displayGeneratedDocuments(documents);
-                            }
-                        } else if (status.status === 'failed') {
-                            clearInterval(statusInterval);
-                            showAlert('Document generation failed. Please try again.', 'danger');
-                        }
-                    }
-                } catch (error) {
-                    clearInterval(statusInterval);
-                    showAlert(`Error: ${error.message}`, 'danger');
-                }
-            }, 2000);
+            // Stream progress as it happens
+            watchProgress(`/api/documents/events/${organizationId}/${document_generation_id}`, {
+                completed: event => {
+                    showAlert('Documents generated successfully!', 'success');
+                    displayGeneratedDocuments(event.result.generated_documents.map(doc => ({
+                        document_type: doc.document_type,
+                        filename: doc.file_name,
+                        download_url: doc.file_url
+                    })));
+                },
+                failed: () => showAlert('Document generation failed. Please try again.', 'danger'),
+                error: event => showAlert(`Error: ${event.detail}`, 'danger')
+            });
         } catch (error) {
             showAlert(`Error: ${error.message}`, 'danger');
         }
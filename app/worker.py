@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+from typing import Dict, Any, Callable, Awaitable
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+def get_job_handlers() -> Dict[str, Callable[[Dict[str, Any], bool], Awaitable[Any]]]:
+    """
+    Build the handler for each job type
+
+    Handlers use the same service instances as the API so that in-process
+    workers update the progress the API reports.
+
+    Returns:
+        Coroutine function per job type, called with the job payload and
+        whether this is the job's final attempt
+    """
+    from app.api.evaluation import evaluation_service
+    from app.api.documents import document_service
+    from app.services.jobs import EVALUATION_JOB, DOCUMENT_GENERATION_JOB
+
+    async def run_evaluation(payload: Dict[str, Any], final_attempt: bool):
+        await evaluation_service.run_evaluation(**payload, final_attempt=final_attempt)
+
+    async def generate_documents(payload: Dict[str, Any], final_attempt: bool):
+        await document_service.generate_documents(**payload, final_attempt=final_attempt)
+
+    return {
+        EVALUATION_JOB: run_evaluation,
+        DOCUMENT_GENERATION_JOB: generate_documents
+    }
+
+def get_job_sweeper():
+    """
+    Build the sweeper that re-queues stalled evaluation and document jobs
+
+    Returns:
+        Job sweeper over the shared job queue
+    """
+    from app.api.evaluation import evaluation_service
+    from app.api.documents import document_service
+    from app.services.jobs import get_job_queue, JobSweeper
+
+    return JobSweeper(get_job_queue(), [evaluation_service, document_service])
+
+async def run_workers(size: int, shutdown_timeout: float):
+    """
+    Run a worker pool until SIGINT or SIGTERM
+
+    Args:
+        size: Number of workers
+        shutdown_timeout: Seconds running jobs get to finish on shutdown
+    """
+    from app.services.jobs import get_job_queue, WorkerPool
+    from app.services.ai.client_registry import get_registry
+
+    await get_registry().warm_up()
+
+    pool = WorkerPool(get_job_queue(), get_job_handlers(), size)
+    pool.start()
+    sweeper = get_job_sweeper()
+    sweeper.start()
+    logger.info(f"Started {size} workers")
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    await stopping.wait()
+    logger.info("Stopping workers")
+    await sweeper.stop()
+    await pool.stop(timeout=shutdown_timeout)
+    await get_registry().aclose()
+    get_job_queue().close()
+
+def main():
+    """
+    Worker entry point: python -m app.worker --workers N
+    """
+    parser = argparse.ArgumentParser(description="Run GenCertify background job workers")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("JOB_WORKERS", "4")), help="Number of workers")
+    parser.add_argument(
+        "--shutdown-timeout",
+        type=float,
+        default=float(os.getenv("JOB_SHUTDOWN_TIMEOUT", "30")),
+        help="Seconds running jobs get to finish on shutdown"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+
+    asyncio.run(run_workers(args.workers, args.shutdown_timeout))
+
+if __name__ == "__main__":
+    main()
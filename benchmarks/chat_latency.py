@@ -0,0 +1,147 @@
+"""
+Chat latency benchmark
+
+Measures /api/chat/message and /health latency on a running GenCertify
+instance, first on its own and then while a batch of evaluations is running
+concurrently. With non-blocking provider calls the chat p99 should stay
+roughly flat between the two phases.
+
+Usage:
+    python benchmarks/chat_latency.py --base-url http://localhost:8000 \\
+        --organization-id <org-id> --evaluations 20 --chat-requests 50
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Return the given percentile of a list of samples (nearest-rank)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(name: str, samples: List[float]) -> Dict[str, float]:
+    """
+    Print and return latency statistics in milliseconds
+    """
+    stats = {
+        "count": len(samples),
+        "p50": percentile(samples, 50) * 1000,
+        "p95": percentile(samples, 95) * 1000,
+        "p99": percentile(samples, 99) * 1000,
+        "mean": (statistics.mean(samples) * 1000) if samples else 0.0,
+    }
+    print(
+        f"{name:<28} n={stats['count']:<4} p50={stats['p50']:8.1f}ms "
+        f"p95={stats['p95']:8.1f}ms p99={stats['p99']:8.1f}ms"
+    )
+    return stats
+
+
+async def timed(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> float:
+    """
+    Issue a request and return its wall-clock latency in seconds
+    """
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    response.raise_for_status()
+    return time.perf_counter() - start
+
+
+async def run_chat(client: httpx.AsyncClient, organization_id: str, count: int, concurrency: int) -> List[float]:
+    """
+    Send chat messages with bounded concurrency and collect latencies
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> float:
+        async with semaphore:
+            return await timed(
+                client,
+                "POST",
+                "/api/chat/message",
+                json={"organization_id": organization_id, "message": f"Benchmark question {i}"},
+            )
+
+    return await asyncio.gather(*(one(i) for i in range(count)))
+
+
+async def run_health(client: httpx.AsyncClient, stop: asyncio.Event, interval: float) -> List[float]:
+    """
+    Probe /health until stopped and collect latencies
+    """
+    samples = []
+    while not stop.is_set():
+        samples.append(await timed(client, "GET", "/health"))
+        await asyncio.sleep(interval)
+    return samples
+
+
+async def run_evaluations(client: httpx.AsyncClient, organization_id: str, count: int) -> None:
+    """
+    Start evaluations concurrently
+    """
+    await asyncio.gather(*(
+        timed(
+            client,
+            "POST",
+            "/api/evaluation/start",
+            json={
+                "organization_id": organization_id,
+                "certification_types": ["iso_27001", "soc_2", "gdpr", "hipaa", "pci_dss"],
+            },
+        )
+        for _ in range(count)
+    ))
+
+
+async def phase(client: httpx.AsyncClient, args: argparse.Namespace, with_evaluations: bool) -> None:
+    """
+    Run one measurement phase
+    """
+    label = "under load" if with_evaluations else "baseline"
+    stop = asyncio.Event()
+    health_task = asyncio.create_task(run_health(client, stop, args.health_interval))
+
+    chat_task = asyncio.create_task(
+        run_chat(client, args.organization_id, args.chat_requests, args.chat_concurrency)
+    )
+    if with_evaluations:
+        await run_evaluations(client, args.organization_id, args.evaluations)
+
+    chat_samples = await chat_task
+    stop.set()
+    health_samples = await health_task
+
+    summarize(f"chat ({label})", chat_samples)
+    summarize(f"health ({label})", health_samples)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--organization-id", required=True)
+    parser.add_argument("--evaluations", type=int, default=20)
+    parser.add_argument("--chat-requests", type=int, default=50)
+    parser.add_argument("--chat-concurrency", type=int, default=5)
+    parser.add_argument("--health-interval", type=float, default=0.1)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        await phase(client, args, with_evaluations=False)
+        await phase(client, args, with_evaluations=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
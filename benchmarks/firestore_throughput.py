@@ -0,0 +1,89 @@
+"""
+Firestore-backed request throughput benchmark
+
+Drives the endpoints that read from Firestore on a running GenCertify
+instance at increasing concurrency and reports requests per second and
+latency. Run it against a build before and after a data layer change with
+the same arguments to compare: with blocking Firestore calls throughput stays
+flat as concurrency grows, with the async client it scales until Firestore or
+the CPU saturates.
+
+Usage:
+    python benchmarks/firestore_throughput.py --base-url http://localhost:8000 \\
+        --organization-id <org-id> --evaluation-id <evaluation-id> \\
+        --concurrency 1 10 50 --requests 500
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import httpx
+
+from chat_latency import summarize, timed
+
+
+def request_mix(args: argparse.Namespace) -> List[Dict]:
+    """
+    Requests cycled through by the benchmark
+    """
+    requests = [
+        {"method": "GET", "url": f"/api/evaluation/status/{args.organization_id}/{args.evaluation_id}"},
+        {"method": "GET", "url": f"/api/evaluation/results/{args.organization_id}/{args.evaluation_id}"},
+    ]
+    if args.include_generate:
+        # Reads the organization and evaluation concurrently, then enqueues a job
+        requests.append({
+            "method": "POST",
+            "url": "/api/documents/generate",
+            "json": {
+                "organization_id": args.organization_id,
+                "evaluation_id": args.evaluation_id,
+                "document_types": ["information_security_policy"],
+            },
+        })
+    return requests
+
+
+async def run_level(client: httpx.AsyncClient, args: argparse.Namespace, concurrency: int) -> Dict[str, float]:
+    """
+    Send the request mix at one concurrency level
+    """
+    mix = request_mix(args)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> float:
+        request = mix[i % len(mix)]
+        async with semaphore:
+            return await timed(client, request["method"], request["url"], json=request.get("json"))
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*(one(i) for i in range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    stats = summarize(f"concurrency {concurrency}", samples)
+    stats["throughput"] = len(samples) / elapsed
+    print(f"{'':<28} throughput={stats['throughput']:8.1f} req/s")
+    return stats
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--organization-id", required=True)
+    parser.add_argument("--evaluation-id", required=True, help="A completed evaluation of the organization")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--requests", type=int, default=500, help="Requests per concurrency level")
+    parser.add_argument("--include-generate", action="store_true", help="Also POST /api/documents/generate (enqueues jobs)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    args = parser.parse_args()
+
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+        # Warm up connections and caches
+        await run_level(client, argparse.Namespace(**dict(vars(args), requests=min(20, args.requests))), 1)
+        for concurrency in args.concurrency:
+            await run_level(client, args, concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())